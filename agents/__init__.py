@@ -1,3 +1,20 @@
-from agents.workflow import main_workflow
+"""
+Agents 패키지 초기화 모듈
 
-__all__ = ["main_workflow"]
+main_workflow와 get_graph는 처음 접근할 때 해당 모듈을 불러옵니다(PEP 562).
+따라서 하나의 도메인 Workflow만 사용하는 프로세스는 다른 도메인 패키지와 그 의존성을 로드하지 않습니다.
+"""
+
+__all__ = ["get_graph", "main_workflow"]
+
+
+def __getattr__(name):
+    if name == "main_workflow":
+        from agents.workflow import main_workflow
+
+        return main_workflow
+    if name == "get_graph":
+        from agents.registry import get_graph
+
+        return get_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,33 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
 
+import httpx
+import openai
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import run_in_executor
 
-class BaseNode(ABC):
+from agents.deadline import DeadlineExceeded, deadline_scope, get_deadline
+from agents.metrics import record_node_cache, track_node
+from agents.node_cache import NodeCache, node_cache_enabled
+
+# 마감 시각이 지난 뒤 발생하면 대체 응답으로 처리하는 LLM 요청 타임아웃 예외
+# (DeadlineExceeded와 asyncio.TimeoutError는 TimeoutError의 하위/별칭 클래스)
+TIMEOUT_ERRORS = (openai.APITimeoutError, httpx.TimeoutException, TimeoutError)
+
+
+class BaseNode(Runnable, ABC):
     """
     모든 노드의 기본 클래스입니다. LangGraph Workflow에서 사용되는 노드의 기본 구조를 정의합니다.
 
     이 추상 클래스는 모든 노드가 구현해야 하는 기본 메서드와 속성을 정의합니다.
     노드는 LangGraph의 상태 그래프에서 작업을 수행하는 개별 단위입니다.
 
+    BaseNode는 Runnable이기 때문에 LangGraph가 동기 실행(invoke/stream)에서는 execute를,
+    비동기 실행(ainvoke/astream)에서는 aexecute를 코루틴 노드로 직접 호출합니다.
+    LLM 체인을 사용하는 노드는 aexecute에서 chain.ainvoke를 사용하도록 재정의하면
+    스레드 풀을 점유하지 않고 이벤트 루프 위에서 실행됩니다.
+
     예시:
     ```python
     class MyCustomNode(BaseNode):
@@ -19,9 +39,43 @@ class BaseNode(ABC):
             # 상태를 처리하는 로직
             result = process_state(state)
             return {"output_key": result}
+
+        async def aexecute(self, state) -> dict:
+            # 비동기 처리 로직 (재정의하지 않으면 execute를 스레드에서 실행)
+            result = await aprocess_state(state)
+            return {"output_key": result}
     ```
+
+    노드 안의 체인은 LangGraph가 전달한 실행 설정(콜백)을 그대로 상속하므로, 그래프를
+    stream_mode="messages"로 실행하면 체인의 LLM 토큰이 노드가 끝나기 전에 바로 스트리밍됩니다.
+    (LLM 응답 캐시도 invoke/ainvoke 경로에서만 적용되므로 노드에서는 chain.stream 대신
+    chain.invoke/ainvoke를 사용합니다.)
+
+    LLM 체인을 사용하는 노드는 self.chain에 체인을 설정하고 get_chain_input/build_update를
+    재정의하면, execute_many/aexecute_many로 여러 상태를 체인의 batch/abatch로 한 번에 처리할 수 있습니다.
+
+    노드 실행은 agents.metrics.track_node로 감싸져 있어, 노드 실행 지표를 켜면 (Workflow, 노드)별
+    실행 시간, TTFT, 토큰 수, 예외가 별도 코드 없이 기록됩니다.
+
+    실행 설정에 마감 시각(agents.deadline)이 있으면 노드는 남은 예산 안에서만 실행됩니다.
+    남은 시간이 min_budget보다 적거나 실행 중 마감 시각이 지나면 fallback의 대체 응답을 사용하고,
+    대체 응답이 없는 optional 노드는 건너뜁니다. 이렇게 성능이 저하된 노드는 degraded_nodes에 기록됩니다.
+
+    노드의 결과가 상태의 일부 키에만 의존하면 cache_keys와 cache_policy(agents.node_cache.CachePolicy)를
+    선언하여, 같은 키 값으로 실행할 때 execute/aexecute 전체를 건너뛰고 이전 상태 업데이트를 재사용할 수 있습니다.
     """
 
+    chain = None  # 노드가 사용하는 LangChain 체인 (execute_many에서 batch 실행에 사용)
+    workflow_name = (
+        None  # 노드가 속한 Workflow 이름 (BaseWorkflow가 그래프 빌드 후 설정)
+    )
+    enforce_deadline = True  # 마감 시각을 적용할지 여부 (LLM 호출이 없는 노드는 False)
+    optional = False  # 마감 시각에 쫓길 때 결과 없이 건너뛸 수 있는 노드인지 여부
+    min_budget = 0.0  # 노드 실행을 시작하는 데 필요한 최소 남은 시간(초)
+    deadline_grace = 0.0  # 마감 시각 이후 실행을 취소하기 전까지 더 기다릴 시간(초)
+    cache_keys = None  # 노드 결과가 의존하는 상태 키 (cache_policy와 함께 선언하면 결과를 메모이제이션)
+    cache_policy = None  # 노드 결과 캐시 정책 (agents.node_cache.CachePolicy)
+
     def __init__(self, **kwargs):
         """
         노드 초기화 메서드
@@ -32,6 +86,11 @@ class BaseNode(ABC):
         """
         self.name = self.__class__.__name__  # 노드 이름은 클래스 이름으로 자동 설정
         self.verbose = kwargs.get("verbose", False)  # 상세 로깅 활성화 여부
+        self.node_cache = (
+            NodeCache(self.cache_keys, self.cache_policy)
+            if self.cache_keys is not None and self.cache_policy is not None
+            else None
+        )  # 노드 결과 캐시
 
     @abstractmethod
     def execute(self, state) -> dict:
@@ -48,6 +107,183 @@ class BaseNode(ABC):
         """
         pass
 
+    async def aexecute(self, state) -> dict:
+        """
+        노드의 비동기 실행 로직을 구현하는 메서드
+
+        기본 구현은 execute를 executor 스레드에서 실행합니다.
+        LLM 호출처럼 I/O 대기가 긴 노드는 이 메서드를 재정의하여 chain.ainvoke 등
+        비동기 API를 사용해야 이벤트 루프를 막지 않고 많은 실행을 동시에 처리할 수 있습니다.
+
+        Args:
+            state: 현재 그래프 상태 객체
+
+        Returns:
+            dict: 업데이트된 상태 값을 포함하는 딕셔너리
+        """
+        return await run_in_executor(None, self.execute, state)
+
+    def fallback(self, state) -> dict | None:
+        """
+        마감 시각 때문에 노드를 실행할 수 없을 때 사용할 대체 상태 업데이트를 반환합니다.
+
+        기본 구현은 대체 응답이 없음(None)을 뜻하며, 캐시된 결과나 LLM 없이 만들 수 있는
+        짧은 응답이 있는 노드에서 재정의합니다.
+
+        Args:
+            state: 현재 그래프 상태 객체
+
+        Returns:
+            dict | None: 대체 상태 업데이트 (없으면 None)
+        """
+        return None
+
+    def degrade(self, state, reason: str) -> dict:
+        """
+        대체 응답으로 상태 업데이트를 구성하고 degraded_nodes에 노드를 기록합니다.
+
+        노드 결과 캐시에 같은 입력의 결과가 있으면 대체 응답 대신 그 결과를 그대로 반환합니다.
+
+        Args:
+            state: 현재 그래프 상태 객체
+            reason (str): 성능 저하 사유 ("skipped": 예산 부족으로 실행하지 않음, "timeout": 실행 중 마감)
+
+        Returns:
+            dict: 대체 상태 업데이트
+
+        Raises:
+            DeadlineExceeded: 대체 응답이 없는 필수 노드인 경우
+        """
+        # 저장된 결과는 정상 실행 결과이므로 성능 저하로 기록하지 않음
+        # 적중 여부는 실행 경로의 조회에서만 기록하므로 같은 요청의 미스를 두 번 세지 않음
+        if self.node_cache is not None and node_cache_enabled():
+            update = self.node_cache.lookup(self.node_cache.make_key(state))
+            if update is not None:
+                return update
+        update = self.fallback(state)
+        if update is None:
+            if not self.optional:
+                raise DeadlineExceeded(f"{self.name} exceeded the deadline ({reason})")
+            update = {}
+        self.logging("degrade", reason=reason)
+        record = {"node": self.name, "workflow": self.workflow_name, "reason": reason}
+        return {**update, "degraded_nodes": [record]}
+
+    def get_chain_input(self, state) -> dict:
+        """
+        상태(state)에서 체인에 전달할 입력을 구성합니다.
+
+        기본 구현은 상태를 그대로 전달하며, 체인을 사용하는 노드에서 재정의합니다.
+
+        Args:
+            state: 현재 그래프 상태 객체
+
+        Returns:
+            dict: 체인 입력
+        """
+        return dict(state)
+
+    def build_update(self, state, output) -> dict:
+        """
+        체인 실행 결과로 상태 업데이트를 구성합니다.
+
+        기본 구현은 결과를 response에 담으며, 체인을 사용하는 노드에서 재정의합니다.
+
+        Args:
+            state: 현재 그래프 상태 객체
+            output: 체인 실행 결과
+
+        Returns:
+            dict: 업데이트된 상태 값을 포함하는 딕셔너리
+        """
+        return {"response": output}
+
+    def execute_many(self, states, max_concurrency=None) -> list:
+        """
+        여러 상태를 한 번에 처리하는 배치 실행 메서드
+
+        체인이 있으면 chain.batch로 모든 입력을 동시에 실행하고, 없으면 노드 자체를 batch로 실행합니다.
+        한 항목의 실패가 다른 항목에 영향을 주지 않도록 예외는 항목별로 결과에 담깁니다.
+
+        Args:
+            states (list): 처리할 상태 목록
+            max_concurrency (int | None): 동시에 실행할 최대 호출 수 (None이면 제한 없음)
+
+        Returns:
+            list[dict | Exception]: 입력과 같은 순서의 상태 업데이트 (실패한 항목은 예외 객체)
+        """
+        config = {"max_concurrency": max_concurrency}
+        if self.chain is None:
+            return self.batch(states, config, return_exceptions=True)
+
+        results, pending = self._prepare_batch(states)
+        with track_node(self.name, self.workflow_name):  # 사용량/지표를 이 노드로 집계
+            outputs = self.chain.batch(
+                [chain_input for _, chain_input in pending],
+                config,
+                return_exceptions=True,
+            )
+        return self._finish_batch(states, results, pending, outputs)
+
+    async def aexecute_many(self, states, max_concurrency=None) -> list:
+        """
+        execute_many의 비동기 버전으로, chain.abatch를 사용합니다.
+
+        Args:
+            states (list): 처리할 상태 목록
+            max_concurrency (int | None): 동시에 실행할 최대 호출 수 (None이면 제한 없음)
+
+        Returns:
+            list[dict | Exception]: 입력과 같은 순서의 상태 업데이트 (실패한 항목은 예외 객체)
+        """
+        config = {"max_concurrency": max_concurrency}
+        if self.chain is None:
+            return await self.abatch(states, config, return_exceptions=True)
+
+        results, pending = self._prepare_batch(states)
+        with track_node(self.name, self.workflow_name):  # 사용량/지표를 이 노드로 집계
+            outputs = await self.chain.abatch(
+                [chain_input for _, chain_input in pending],
+                config,
+                return_exceptions=True,
+            )
+        return self._finish_batch(states, results, pending, outputs)
+
+    def _prepare_batch(self, states):
+        """
+        배치 실행을 위해 상태별 체인 입력을 구성합니다.
+
+        입력 구성에 실패한 항목은 결과 목록에 예외를 미리 기록하고 배치에서 제외합니다.
+
+        Returns:
+            tuple[list, list]: (결과 목록, 실행할 (인덱스, 체인 입력) 목록)
+        """
+        results = [None] * len(states)
+        pending = []
+        for index, state in enumerate(states):
+            # 하위 클래스가 재정의한 get_chain_input의 실패는 종류와 관계없이
+            # chain.batch(return_exceptions=True)처럼 해당 항목의 결과로 반환
+            try:
+                pending.append((index, self.get_chain_input(state)))
+            except Exception as e:  # noqa: BLE001
+                results[index] = e
+        return results, pending
+
+    def _finish_batch(self, states, results, pending, outputs) -> list:
+        """
+        배치 실행 결과를 입력 순서대로 상태 업데이트로 변환합니다.
+        """
+        for (index, _), output in zip(pending, outputs):
+            if isinstance(output, Exception):
+                results[index] = output
+                continue
+            # build_update의 실패도 다른 항목에 영향을 주지 않도록 해당 항목의 결과로 반환
+            try:
+                results[index] = self.build_update(states[index], output)
+            except Exception as e:  # noqa: BLE001
+                results[index] = e
+        return results
+
     def logging(self, method_name, **kwargs):
         """
         노드 실행 과정의 로깅을 처리하는 메서드 (로깅이 필요할 때만 사용하시면 됩니다.)
@@ -71,7 +307,110 @@ class BaseNode(ABC):
         Args:
             state: 현재 그래프 상태 객체
 
+        Returns:
+            dict: execute 메서드의 결과 (메모이제이션 적중 시 저장된 결과)
+        """
+        with track_node(self.name, self.workflow_name):  # 사용량/지표를 이 노드로 집계
+            key, update = self._lookup_cache(state)
+            if update is None:
+                update = self.execute(state)
+                if key is not None:
+                    self.node_cache.update(key, update)
+            return update
+
+    async def _acall(self, state) -> dict:
+        """
+        __call__의 비동기 버전으로, 저장된 결과가 없을 때만 aexecute를 실행합니다.
+        """
+        key, update = self._lookup_cache(state)
+        if update is None:
+            update = await self.aexecute(state)
+            if key is not None:
+                self.node_cache.update(key, update)
+        return update
+
+    def _lookup_cache(self, state) -> tuple:
+        """
+        노드 결과 캐시를 조회하고, 적중 여부를 노드별로 기록합니다.
+
+        Returns:
+            tuple[str | None, dict | None]: (캐시 키, 저장된 상태 업데이트),
+                메모이제이션을 사용하지 않으면 (None, None)
+        """
+        if self.node_cache is None or not node_cache_enabled():
+            return None, None
+        key = self.node_cache.make_key(state)
+        update = self.node_cache.lookup(key)
+        record_node_cache(self.name, update is not None)
+        return key, update
+
+    def invoke(self, input, config: RunnableConfig | None = None, **kwargs) -> dict:
+        """
+        Runnable 동기 실행 진입점
+
+        LangGraph가 invoke/stream으로 그래프를 실행할 때 호출되며, execute로 위임합니다.
+        마감 시각이 있으면 체인의 LLM 요청 타임아웃이 남은 시간으로 제한됩니다.
+
+        Args:
+            input: 현재 그래프 상태 객체
+            config (RunnableConfig | None): LangGraph가 전달하는 실행 설정
+
         Returns:
             dict: execute 메서드의 결과
         """
-        return self.execute(state)
+        deadline = get_deadline(config) if self.enforce_deadline else None
+        if deadline is None:
+            return self(input)
+        if self._out_of_budget(deadline):
+            return self.degrade(input, "skipped")
+
+        with deadline_scope(deadline):
+            try:
+                return self(input)
+            except DeadlineExceeded:
+                pass  # 하위 노드(서브그래프)가 예산 안에 끝나지 못함
+            except TIMEOUT_ERRORS:
+                if time.time() < deadline:
+                    raise
+        return self.degrade(input, "timeout")
+
+    async def ainvoke(
+        self, input, config: RunnableConfig | None = None, **kwargs
+    ) -> dict:
+        """
+        Runnable 비동기 실행 진입점
+
+        LangGraph가 ainvoke/astream으로 그래프를 실행할 때 코루틴으로 호출되며,
+        aexecute로 위임합니다. 마감 시각이 있으면 남은 시간이 지날 때 aexecute를 취소합니다.
+
+        Args:
+            input: 현재 그래프 상태 객체
+            config (RunnableConfig | None): LangGraph가 전달하는 실행 설정
+
+        Returns:
+            dict: aexecute 메서드의 결과
+        """
+        deadline = get_deadline(config) if self.enforce_deadline else None
+        if deadline is not None and self._out_of_budget(deadline):
+            return self.degrade(input, "skipped")
+
+        with track_node(self.name, self.workflow_name):  # 사용량/지표를 이 노드로 집계
+            if deadline is None:
+                return await self._acall(input)
+            with deadline_scope(deadline):
+                try:
+                    return await asyncio.wait_for(
+                        self._acall(input),
+                        deadline - time.time() + self.deadline_grace,
+                    )
+                except TimeoutError:
+                    pass  # 마감 시각 도달 (하위 노드의 DeadlineExceeded 포함)
+                except TIMEOUT_ERRORS:
+                    if time.time() < deadline:
+                        raise
+        return self.degrade(input, "timeout")
+
+    def _out_of_budget(self, deadline: float) -> bool:
+        """남은 시간이 노드 실행에 필요한 최소 예산보다 적은지 확인합니다."""
+        left = deadline - time.time()
+        return left <= 0 or left < self.min_budget
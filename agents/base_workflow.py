@@ -1,7 +1,10 @@
+import threading
 from abc import ABC, abstractmethod
 
 from langgraph.graph.state import CompiledStateGraph
 
+from agents.base_node import BaseNode
+
 
 class BaseWorkflow(ABC):
     """
@@ -10,10 +13,19 @@ class BaseWorkflow(ABC):
     이 추상 클래스는 모든 Workflow가 구현해야 하는 기본 메서드와 속성을 정의합니다.
     Workflow는 여러 노드를 연결하여 작업을 수행하는 전체 그래프를 관리합니다.
 
+    컴파일된 그래프는 Workflow 인스턴스와 build 설정별로 캐시됩니다.
+    요청마다 `name_workflow()`를 호출해도 StateGraph 생성, 노드(및 모델 클라이언트) 생성,
+    컴파일은 처음 한 번만 수행되며, 노드나 프롬프트를 교체한 뒤에는 invalidate()로
+    캐시를 비워 다시 빌드하도록 할 수 있습니다.
+
     예시:
     ```python
     # 이 클래스를 상속받은 클래스로 인스턴스 생성하는 방법
     name_workflow = NameWorkflow(StateName)
+
+    graph = name_workflow()  # 첫 호출에서만 build 실행
+    assert graph is name_workflow()  # 이후에는 캐시된 그래프 반환
+    name_workflow.invalidate()  # 캐시 무효화
     ```
     """
 
@@ -24,27 +36,85 @@ class BaseWorkflow(ABC):
         Workflow 이름을 클래스 이름으로 자동 설정합니다.
         """
         self.name = self.__class__.__name__  # Workflow 이름은 클래스 이름으로 자동 설정
+        self._compiled = {}  # build 설정별로 컴파일된 그래프 캐시
+        self._lock = threading.Lock()  # 동시 요청에서 중복 빌드 방지
 
     @abstractmethod
-    def build(self) -> CompiledStateGraph:
+    def build(self, checkpointer=None) -> CompiledStateGraph:
         """
         Workflow 그래프를 구축하는 추상 메서드
 
         모든 하위 클래스는 이 메서드를 반드시 구현해야 합니다.
         이 메서드에서는 노드를 추가하고, 에지를 연결하여 Workflow 그래프를 구축합니다.
+        체크포인터를 받으면 그래프를 체크포인터와 함께 컴파일하여, 실패한 실행을 같은 thread_id로
+        마지막으로 완료된 노드 이후부터 다시 실행할 수 있도록 합니다.
+
+        Args:
+            checkpointer (BaseCheckpointSaver | None): 실행 상태를 저장할 체크포인터
+                (예: agents.checkpointer.SqliteCheckpointer, 기본값: 저장하지 않음)
 
         Returns:
             CompiledStateGraph: 컴파일된 상태 그래프 객체
         """
         pass
 
-    def __call__(self):
+    def __call__(self, **build_kwargs):
         """
         Workflow를 함수처럼 호출 가능하게 만드는 메서드
 
         Workflow 객체를 직접 호출할 때 사용됩니다.
+        같은 build 설정으로 호출하면 캐시된 컴파일 그래프를 그대로 반환합니다.
+
+        Args:
+            **build_kwargs: build 메서드에 전달할 설정 (설정별로 캐시가 분리됩니다)
 
         Returns:
             CompiledStateGraph: build 메서드의 결과
         """
-        return self.build()
+        key = self._cache_key(build_kwargs)
+        workflow = self._compiled.get(key)
+        if workflow is not None:
+            return workflow
+
+        with self._lock:
+            # 락을 기다리는 동안 다른 스레드가 빌드를 마쳤을 수 있으므로 다시 확인
+            workflow = self._compiled.get(key)
+            if workflow is None:
+                workflow = self.build(**build_kwargs)
+                self._tag_nodes(workflow)
+                self._compiled[key] = workflow
+        return workflow
+
+    def invalidate(self):
+        """
+        캐시된 컴파일 그래프를 모두 제거합니다.
+
+        노드 구성, 프롬프트, 모델 설정 등을 변경한 뒤 다음 호출에서 그래프를
+        다시 빌드해야 할 때 사용합니다.
+        """
+        with self._lock:
+            self._compiled.clear()
+
+    def _tag_nodes(self, workflow):
+        """
+        그래프의 BaseNode 노드에 Workflow 이름을 설정하여 노드 지표가 Workflow별로 기록되도록 합니다.
+        """
+        for spec in workflow.builder.nodes.values():
+            if isinstance(spec.runnable, BaseNode):
+                spec.runnable.workflow_name = self.name
+
+    @staticmethod
+    def _cache_key(build_kwargs):
+        """
+        build 설정으로부터 캐시 키를 생성합니다.
+
+        해시할 수 없는 값(예: 체크포인터 객체, 리스트)은 객체 식별자로 구분합니다.
+        """
+        items = []
+        for key, value in sorted(build_kwargs.items()):
+            try:
+                hash(value)
+            except TypeError:
+                value = ("id", id(value))
+            items.append((key, value))
+        return tuple(items)
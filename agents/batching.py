@@ -0,0 +1,325 @@
+"""
+체인 호출 마이크로 배칭(micro-batching) 모듈
+
+부하가 높을 때는 서로 독립적인 여러 그래프 실행이 거의 같은 순간에 같은 체인을 호출합니다.
+MicroBatchRunnable은 체인 앞에서 짧은 시간 창(window) 동안 또는 최대 배치 크기까지 호출을 모아
+한 번의 배치로 실행하고, 결과를 각 호출에 나누어 돌려줍니다.
+
+시간 창과 배치 크기는 최근 호출 간격(EWMA)에 맞춰 조절됩니다.
+- 호출 간격이 max_wait보다 길면(저부하) 기다리지 않고 바로 실행하여 지연을 늘리지 않습니다.
+- 호출이 몰리면(고부하) max_wait 동안 들어올 것으로 예상되는 호출 수만큼 모아 한 번에 실행합니다.
+
+모은 호출은 배치 실행 함수(batch_fn)로 한 번에 보냅니다. 체인의 abatch는 항목마다 요청을 따로 보내므로
+시간 창만큼 지연만 늘어나고 처리량은 늘지 않습니다. 따라서 요청을 실제로 합쳐 보낼 수 있을 때만 사용합니다.
+endpoint_batch_fn()은 프롬프트를 만든 뒤 모든 요청을 OpenAI 호환 서버의 배치 엔드포인트
+(POST {base_url}{endpoint}, 본문 {"requests": [채팅 요청, ...]}, 응답 {"data": [채팅 응답 또는 {"error": ...}, ...]})로
+한 번에 보냅니다. 이 엔드포인트는 OpenAI API에 없는 확장 형식이므로, 이 형식을 구현한 프록시나
+벤치마크/테스트용 benchmarks.fake_provider(/v1/batch/chat/completions)를 사용할 때만 설정합니다.
+요청 본문과 응답 메시지는 LangChain의 공개 API(convert_to_openai_messages, AIMessage)로 변환하며,
+모델 설정 중 model, temperature, max_tokens, top_p, seed, model_kwargs만 요청 본문에 포함합니다.
+배치로 실행된 호출은 모델 콜백을 거치지 않으므로 토큰이 스트리밍되지 않고 LLM 응답 캐시도 사용하지 않으며,
+토큰 사용량은 agents.metrics.record_usage()로 직접 기록합니다.
+
+마이크로 배칭은 비동기 실행(ainvoke)에만 적용되며 기본으로 꺼져 있습니다.
+CHAIN_MICRO_BATCH_ENABLED=true이고 CHAIN_MICRO_BATCH_ENDPOINT가 설정되어 있을 때만
+각 도메인의 체인 생성 함수가 체인을 micro_batch()로 감쌉니다.
+- CHAIN_MICRO_BATCH_ENDPOINT: 배치 엔드포인트 경로 (예: /batch/chat/completions)
+- CHAIN_MICRO_BATCH_MAX_SIZE: 최대 배치 크기 (기본값: 16)
+- CHAIN_MICRO_BATCH_MAX_WAIT_MS: 호출을 모으는 최대 시간(밀리초) (기본값: 20)
+"""
+
+import asyncio
+import functools
+import os
+import time
+
+from langchain_core.messages import AIMessage, convert_to_openai_messages
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+from agents.metrics import current_node, record_usage
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    예외를 호출마다 따로 발생시킬 수 있도록 복사합니다.
+
+    같은 예외 객체를 여러 호출에서 발생시키면 트레이스백이 서로 이어 붙으므로,
+    __init__을 다시 호출하지 않고 속성만 복사한 새 예외를 만들고 원래 예외를 원인(__cause__)으로 연결합니다.
+    """
+    copied = error.__class__.__new__(error.__class__)
+    copied.__dict__.update(error.__dict__)
+    copied.args = error.args
+    copied.__cause__ = error
+    return copied
+
+
+class MicroBatchRunnable(Runnable):
+    """
+    동시에 들어온 ainvoke 호출을 모아 배치로 실행하는 Runnable
+
+    예시:
+    ```python
+    async def batch_fn(inputs, configs):
+        return await provider_batch_endpoint(inputs)  # 입력과 같은 순서의 결과 (또는 예외)
+
+    chain = MicroBatchRunnable(prompt | model | parser, batch_fn=batch_fn)
+    ```
+    """
+
+    def __init__(self, bound: Runnable, batch_fn, max_batch_size=16, max_wait=0.02):
+        """
+        Args:
+            bound (Runnable): 감쌀 체인 (저부하일 때와 동기 호출에 사용)
+            batch_fn (Callable): (입력 목록, 실행 설정 목록)을 받아 요청을 합쳐 보내고
+                같은 순서의 결과 목록을 반환하는 비동기 함수 (실패한 항목은 예외 객체)
+            max_batch_size (int): 최대 배치 크기
+            max_wait (float): 호출을 모으는 최대 시간(초)
+        """
+        self.bound = bound
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = f"MicroBatch[{bound.get_name()}]"
+        self._interval = None  # 호출 간격 EWMA(초)
+        self._last_arrival = None
+        self._pending = {}  # 이벤트 루프 -> [(입력, 실행 설정, Future)]
+        self._timers = {}  # 이벤트 루프 -> 배치 실행 타이머
+        self._stats = {"calls": 0, "batches": 0, "batched_calls": 0}
+
+    def _observe_arrival(self):
+        now = time.monotonic()
+        if self._last_arrival is not None:
+            interval = now - self._last_arrival
+            self._interval = (
+                interval
+                if self._interval is None
+                else 0.8 * self._interval + 0.2 * interval
+            )
+        self._last_arrival = now
+
+    def target(self) -> tuple[int, float]:
+        """
+        현재 호출 간격에 맞는 (배치 크기, 시간 창)을 반환합니다.
+
+        Returns:
+            tuple[int, float]: 배치 크기와 호출을 모을 시간(초), 저부하이면 (1, 0.0)
+        """
+        interval = self._interval
+        if interval is None or interval >= self.max_wait:
+            return 1, 0.0
+        size = min(self.max_batch_size, max(1, int(self.max_wait / interval)))
+        return size, min(self.max_wait, size * interval)
+
+    def stats(self) -> dict:
+        """호출 수, 배치 수, 배치로 실행된 호출 수, 평균 배치 크기를 반환합니다."""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "mean_batch_size": self._stats["batched_calls"] / batches
+            if batches
+            else 0.0,
+        }
+
+    def invoke(self, input, config: RunnableConfig | None = None, **kwargs):
+        """동기 호출은 배치 없이 바로 실행합니다."""
+        return self.bound.invoke(input, config, **kwargs)
+
+    def batch(self, inputs, config=None, **kwargs):
+        return self.bound.batch(inputs, config, **kwargs)
+
+    async def abatch(self, inputs, config=None, **kwargs):
+        return await self.bound.abatch(inputs, config, **kwargs)
+
+    async def ainvoke(self, input, config: RunnableConfig | None = None, **kwargs):
+        """
+        호출을 현재 배치에 추가하고 배치 실행 결과를 기다립니다.
+
+        Args:
+            input: 체인 입력
+            config (RunnableConfig | None): 호출별 실행 설정
+
+        Returns:
+            체인 실행 결과
+        """
+        self._stats["calls"] += 1
+        self._observe_arrival()
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(loop, [])
+        size, window = self.target()
+        if size <= 1 and not pending:  # 저부하: 기다리지 않고 바로 실행
+            return await self.bound.ainvoke(input, config, **kwargs)
+
+        future = loop.create_future()
+        # 컨텍스트로 전달된 콜백 등 호출별 실행 설정을 배치 실행에도 유지
+        pending.append((input, ensure_config(config), future))
+        if len(pending) >= size:
+            self._dispatch(loop)
+        elif loop not in self._timers:
+            self._timers[loop] = loop.call_later(window, self._dispatch, loop)
+        return await future
+
+    def _dispatch(self, loop):
+        """모인 호출을 배치 하나로 실행합니다."""
+        timer = self._timers.pop(loop, None)
+        if timer is not None:
+            timer.cancel()
+        items = [item for item in self._pending.pop(loop, []) if not item[2].done()]
+        if items:
+            self._stats["batches"] += 1
+            self._stats["batched_calls"] += len(items)
+            task = loop.create_task(
+                self.batch_fn([item[0] for item in items], [item[1] for item in items])
+            )
+            task.add_done_callback(functools.partial(self._deliver, items))
+
+    @staticmethod
+    def _deliver(items: list, task: asyncio.Task):
+        """배치 실행 결과를 각 호출에 나누어 전달합니다. (배치 전체가 실패하면 모든 호출에 예외 전달)"""
+        if task.cancelled():
+            outputs = [asyncio.CancelledError() for _ in items]
+        elif task.exception() is not None:
+            outputs = [_copy_error(task.exception()) for _ in items]
+        else:
+            outputs = task.result()
+
+        for (_, _, future), output in zip(items, outputs):
+            if future.done():  # 결과를 기다리던 호출이 취소됨
+                continue
+            if isinstance(output, BaseException):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+
+class BatchEndpointError(RuntimeError):
+    """배치 엔드포인트가 항목 하나에 대해 오류를 반환하거나 결과를 반환하지 않은 경우"""
+
+
+def _request_payload(model, prompt) -> dict:
+    """프롬프트와 모델 설정으로 채팅 요청 본문을 만듭니다."""
+    payload = {
+        "model": model.model_name,
+        "messages": convert_to_openai_messages(prompt.to_messages()),
+        "temperature": model.temperature,
+        "max_tokens": model.max_tokens,
+        "top_p": model.top_p,
+        "seed": model.seed,
+        **model.model_kwargs,
+    }
+    return {key: value for key, value in payload.items() if value is not None}
+
+
+def _response_message(result: dict) -> AIMessage:
+    """채팅 응답 하나를 AIMessage로 변환합니다. (usage가 있으면 usage_metadata 포함)"""
+    choice = result["choices"][0]
+    usage = result.get("usage")
+    usage_metadata = None
+    if usage:
+        details = usage.get("prompt_tokens_details") or {}
+        usage_metadata = {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "input_token_details": {"cache_read": details.get("cached_tokens") or 0},
+        }
+    return AIMessage(
+        content=choice["message"].get("content") or "",
+        usage_metadata=usage_metadata,
+        response_metadata={
+            "model_name": result.get("model"),
+            "finish_reason": choice.get("finish_reason"),
+        },
+    )
+
+
+def endpoint_batch_fn(head: Runnable, model, parser: Runnable, endpoint=None):
+    """
+    head | model | parser 형태의 체인 호출들을 배치 엔드포인트 요청 하나로 보내는 batch_fn을 만듭니다.
+
+    head(입력 구성과 프롬프트)와 parser는 호출마다 로컬에서 실행하고, 모델 호출만 합쳐서 보냅니다.
+
+    Args:
+        head (Runnable): 체인 입력을 프롬프트로 바꾸는 앞부분
+        model (ChatOpenAI): 요청 본문(모델 이름과 생성 설정)과 base_url, API 키에 사용할 모델
+        parser (Runnable): 모델 응답 메시지를 결과로 바꾸는 뒷부분
+        endpoint (str | None): base_url 뒤에 붙일 배치 엔드포인트 경로
+            (기본값: CHAIN_MICRO_BATCH_ENDPOINT 환경변수)
+
+    Returns:
+        Callable | None: batch_fn (엔드포인트가 설정되지 않았으면 None)
+    """
+    endpoint = endpoint or os.getenv("CHAIN_MICRO_BATCH_ENDPOINT")
+    if not endpoint:
+        return None
+
+    async def batch_fn(inputs, configs):
+        from agents.model_registry import get_http_clients
+
+        prompts = await head.abatch(inputs, configs, return_exceptions=True)
+        outputs = list(prompts)
+        pending = [
+            i for i, prompt in enumerate(prompts) if not isinstance(prompt, Exception)
+        ]
+        if not pending:
+            return outputs
+
+        base_url = (model.openai_api_base or "https://api.openai.com/v1").rstrip("/")
+        api_key = model.openai_api_key
+        headers = (
+            {"Authorization": f"Bearer {api_key.get_secret_value()}"} if api_key else {}
+        )
+        response = await get_http_clients()[1].post(
+            base_url + endpoint,
+            json={"requests": [_request_payload(model, prompts[i]) for i in pending]},
+            headers=headers,
+        )
+        response.raise_for_status()
+        results = response.json().get("data") or []
+
+        node = current_node()
+        for index, i in enumerate(pending):
+            if index >= len(results):  # 응답이 짧으면 빠진 항목만 실패로 전달
+                outputs[i] = BatchEndpointError(
+                    f"Batch endpoint returned {len(results)} results "
+                    f"for {len(pending)} requests"
+                )
+                continue
+            result = results[index]
+            if "error" in result:
+                outputs[i] = BatchEndpointError(result["error"].get("message", result))
+                continue
+            # 파서나 응답 형식의 오류는 해당 호출에만 전달하고 나머지 호출은 계속 처리
+            try:
+                message = _response_message(result)
+                if message.usage_metadata:
+                    record_usage(node, message.usage_metadata)
+                outputs[i] = await parser.ainvoke(message, configs[i])
+            except Exception as e:  # noqa: BLE001
+                outputs[i] = e
+        return outputs
+
+    return batch_fn
+
+
+def micro_batch(chain: Runnable, batch_fn=None) -> Runnable:
+    """
+    CHAIN_MICRO_BATCH_ENABLED가 켜져 있고 요청을 합쳐 보낼 batch_fn이 있으면
+    체인을 MicroBatchRunnable로 감싸 반환합니다.
+
+    Args:
+        chain (Runnable): 체인
+        batch_fn (Callable | None): 요청을 합쳐 보내는 배치 실행 함수 (예: endpoint_batch_fn())
+
+    Returns:
+        Runnable: 마이크로 배칭이 적용된 체인 (꺼져 있거나 batch_fn이 없으면 원래 체인)
+    """
+    enabled = os.getenv("CHAIN_MICRO_BATCH_ENABLED", "false")
+    if batch_fn is None or enabled.lower() not in ("1", "true", "yes"):
+        return chain
+    return MicroBatchRunnable(
+        chain,
+        batch_fn,
+        max_batch_size=int(os.getenv("CHAIN_MICRO_BATCH_MAX_SIZE", "16")),
+        max_wait=float(os.getenv("CHAIN_MICRO_BATCH_MAX_WAIT_MS", "20")) / 1000,
+    )
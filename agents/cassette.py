@@ -0,0 +1,301 @@
+"""
+LLM 호출 녹화/재생(cassette) 모듈
+
+모델 레지스트리의 공유 httpx 클라이언트에 끼워지는 transport로, 모든 체인의 LLM 요청과 응답을
+디스크의 카세트 파일에 녹화하거나 녹화된 응답을 네트워크 없이 그대로 재생합니다.
+같은 입력으로 text_workflow, management_workflow 등을 반복 실행할 때(프로파일링, 회귀 확인,
+노트북 작업) API 지연 없이 밀리초 단위로, 항상 같은 결과로 실행할 수 있습니다.
+
+요청은 정규화한 요청 본문(JSON 키 정렬, 메시지 앞뒤 공백 제거)의 해시로 매칭됩니다.
+카세트는 한 줄에 요청 하나인 gzip 압축 JSONL 파일이며, 녹화할 때마다 뒤에 이어서 기록됩니다.
+성공(2xx) 응답만 녹화합니다. 429나 5xx 같은 일시적인 오류를 녹화하면 auto/replay 모드에서 계속 재생되므로,
+오류 응답은 녹화하지 않고 그대로 반환하여 SDK가 재시도하도록 합니다.
+
+모드는 환경변수 또는 use_cassette()로 설정합니다.
+- LLM_CASSETTE_MODE: off(기본값), record, replay, auto(녹화된 요청은 재생, 없으면 녹화)
+- LLM_CASSETTE_PATH: 카세트 파일 경로 (기본값: .cache/llm_cassette.jsonl.gz)
+
+예시:
+```python
+from agents.cassette import use_cassette
+
+with use_cassette("tests/cassettes/text.jsonl.gz", mode="record"):
+    text_workflow().invoke(state)  # 실제 API 호출을 녹화
+
+with use_cassette("tests/cassettes/text.jsonl.gz", mode="replay"):
+    text_workflow().invoke(state)  # 네트워크 없이 녹화된 응답 재생
+```
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+MODES = ("off", "record", "replay", "auto")
+DEFAULT_CASSETTE_PATH = ".cache/llm_cassette.jsonl.gz"
+# 재생 모드에서 녹화되지 않은 요청의 응답 코드 (SDK가 재시도하지 않는 코드)
+MISS_STATUS = 404
+
+
+def normalize_request(request: httpx.Request) -> str:
+    """
+    요청을 매칭용 문자열로 정규화합니다.
+
+    JSON 본문은 키를 정렬하고 메시지 내용의 앞뒤 공백을 제거하여, 의미가 같은 요청이
+    같은 문자열이 되도록 합니다.
+
+    Args:
+        request (httpx.Request): HTTP 요청
+
+    Returns:
+        str: 정규화된 요청 문자열
+    """
+    body = request.content
+    try:
+        payload = json.loads(body) if body else None
+    except ValueError:
+        payload = body.decode("utf-8", errors="replace")
+    if isinstance(payload, dict):
+        for message in payload.get("messages") or []:
+            if isinstance(message, dict) and isinstance(message.get("content"), str):
+                message["content"] = message["content"].strip()
+    normalized = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return f"{request.method} {request.url.path}\n{normalized}"
+
+
+def request_key(request: httpx.Request) -> str:
+    """
+    요청의 카세트 키(정규화된 요청의 sha256 해시)를 반환합니다.
+    """
+    return hashlib.sha256(normalize_request(request).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    녹화된 요청/응답을 보관하는 카세트 파일
+
+    파일은 처음 조회할 때 한 번 읽어 메모리에 올리며, 녹화된 항목은 파일 끝에 추가됩니다.
+    """
+
+    def __init__(self, path, mode="replay"):
+        """
+        Args:
+            path (str | Path): 카세트 파일 경로
+            mode (str): record, replay, auto 중 하나
+        """
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Cassette mode must be one of {MODES[1:]}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self._entries = None  # 키 -> 녹화된 응답
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            entries = {}
+            if self.path.exists():
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries[entry["key"]] = entry
+            self._entries = entries
+        return self._entries
+
+    def lookup(self, key: str) -> dict | None:
+        """
+        키에 해당하는 녹화된 응답을 반환합니다. (record 모드에서는 항상 None)
+        """
+        if self.mode == "record":
+            return None
+        with self._lock:
+            return self._load().get(key)
+
+    def should_record(self) -> bool:
+        """녹화되지 않은 요청을 실제로 보내고 녹화해야 하는지 여부"""
+        return self.mode in ("record", "auto")
+
+    def record(self, key: str, response: httpx.Response, content: bytes):
+        """
+        응답을 카세트에 추가합니다.
+
+        Args:
+            key (str): 요청 키
+            response (httpx.Response): 실제 응답
+            content (bytes): 디코딩된 응답 본문
+        """
+        entry = {
+            "key": key,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": content.decode("utf-8"),
+        }
+        with self._lock:
+            self._load()[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # gzip은 여러 멤버를 이어 붙일 수 있으므로 기존 파일 뒤에 바로 추가합니다.
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+
+def _replay(request: httpx.Request, entry: dict) -> httpx.Response:
+    return httpx.Response(
+        entry["status"],
+        headers={"content-type": entry["content_type"]},
+        content=entry["body"].encode("utf-8"),
+        request=request,
+    )
+
+
+def _miss(request: httpx.Request, key: str) -> httpx.Response:
+    message = f"No cassette entry for request {key[:12]} (LLM_CASSETTE_MODE=replay)"
+    return httpx.Response(
+        MISS_STATUS,
+        json={"error": {"message": message, "type": "cassette_miss"}},
+        request=request,
+    )
+
+
+def _recorded(
+    request: httpx.Request, response: httpx.Response, content: bytes
+) -> httpx.Response:
+    # 본문은 이미 디코딩되어 있으므로 압축/길이 관련 헤더는 제외합니다.
+    return httpx.Response(
+        response.status_code,
+        headers={"content-type": response.headers.get("content-type", "")},
+        content=content,
+        request=request,
+    )
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """
+    활성화된 카세트로 요청을 녹화/재생하는 동기 httpx transport
+
+    카세트가 꺼져 있으면 내부 transport로 그대로 전달합니다.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        cassette = get_active_cassette()
+        if cassette is None:
+            return self.transport.handle_request(request)
+
+        key = request_key(request)
+        entry = cassette.lookup(key)
+        if entry is not None:
+            return _replay(request, entry)
+        if not cassette.should_record():
+            return _miss(request, key)
+
+        response = self.transport.handle_request(request)
+        if not response.is_success:  # 일시적인 오류 응답은 녹화하지 않음
+            return response
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        cassette.record(key, response, content)
+        return _recorded(request, response, content)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """
+    CassetteTransport의 비동기 버전
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        cassette = get_active_cassette()
+        if cassette is None:
+            return await self.transport.handle_async_request(request)
+
+        key = request_key(request)
+        entry = cassette.lookup(key)
+        if entry is not None:
+            return _replay(request, entry)
+        if not cassette.should_record():
+            return _miss(request, key)
+
+        response = await self.transport.handle_async_request(request)
+        if not response.is_success:  # 일시적인 오류 응답은 녹화하지 않음
+            return response
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        cassette.record(key, response, content)
+        return _recorded(request, response, content)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_active = None  # 현재 활성화된 Cassette
+_configured = False  # 환경변수 설정을 읽었는지 여부
+_active_lock = threading.Lock()
+
+
+def get_active_cassette() -> Cassette | None:
+    """
+    현재 활성화된 카세트를 반환합니다.
+
+    use_cassette()로 설정하지 않았다면 처음 호출될 때 LLM_CASSETTE_MODE/LLM_CASSETTE_PATH를 읽습니다.
+
+    Returns:
+        Cassette | None: 활성화된 카세트 (off 모드이면 None)
+    """
+    global _active, _configured
+    if not _configured:
+        with _active_lock:
+            if not _configured:
+                mode = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+                if mode != "off":
+                    path = os.getenv("LLM_CASSETTE_PATH", DEFAULT_CASSETTE_PATH)
+                    _active = Cassette(path, mode)
+                _configured = True
+    return _active
+
+
+@contextmanager
+def use_cassette(path=DEFAULT_CASSETTE_PATH, mode="auto"):
+    """
+    블록 안의 모든 LLM 호출에 카세트를 사용합니다.
+
+    Args:
+        path (str | Path): 카세트 파일 경로
+        mode (str): record, replay, auto 중 하나 (기본값: auto)
+
+    Yields:
+        Cassette: 활성화된 카세트
+    """
+    global _active, _configured
+    get_active_cassette()  # 환경변수 설정을 먼저 읽어 블록이 끝난 뒤 복원
+    cassette = Cassette(path, mode)
+    with _active_lock:
+        previous, _active = _active, cassette
+        _configured = True
+    try:
+        yield cassette
+    finally:
+        with _active_lock:
+            _active = previous
@@ -0,0 +1,535 @@
+"""SQLite 체크포인터 모듈
+
+Workflow 그래프의 상태를 superstep마다 로컬 SQLite 파일에 저장하는 LangGraph 체크포인터를 제공합니다.
+체크포인터를 지정해 빌드한 그래프는 실행이 중간에 실패해도 같은 thread_id로 다시 실행하면
+마지막으로 저장된 지점부터 이어서 실행되므로, 이미 끝난 노드(와 그 LLM 호출)를 반복하지 않습니다.
+
+저장 방식:
+1. 채널 값은 버전이 바뀐 채널만 저장합니다. (superstep마다 바뀐 채널의 값만 기록)
+2. 리스트 채널(response 등)의 새 값이 이전에 저장한 값 뒤에 항목을 덧붙인 것이면,
+   덧붙인 항목만 이전 버전에 대한 델타로 저장합니다. (MAX_DELTA_DEPTH마다 전체 값을 다시 저장)
+3. 값은 LangGraph 직렬화기(msgpack)로 인코딩하고, COMPRESS_MIN_BYTES 이상이면 zlib으로 압축합니다.
+4. SQLite는 WAL 모드로 열어 쓰기 중에도 읽기가 막히지 않습니다.
+
+예시:
+```python
+from agents.checkpointer import SqliteCheckpointer
+from agents.workflow import main_workflow
+
+graph = main_workflow(checkpointer=SqliteCheckpointer("/tmp/checkpoints.sqlite"))
+config = {"configurable": {"thread_id": "run-1"}}
+try:
+    graph.invoke(state, config)
+except Exception:
+    graph.invoke(None, config)  # 마지막으로 완료된 노드 이후부터 다시 실행
+```
+
+체크포인트 파일 경로는 CHECKPOINT_PATH 환경변수로 변경할 수 있습니다. (기본값: ".cache/checkpoints.sqlite")
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import run_in_executor
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(
+    ".cache", "checkpoints.sqlite"
+)  # 기본 SQLite 경로
+COMPRESS_MIN_BYTES = 256  # 이 크기 이상의 값만 zlib으로 압축
+MAX_DELTA_DEPTH = 16  # 델타가 이만큼 이어지면 전체 값을 다시 저장
+MAX_TRACKED_LISTS = 1024  # 델타 기준으로 기억할 리스트 채널 값의 최대 개수
+
+_EMPTY = "empty"  # 값이 없는 채널 버전의 타입
+_MISSING = object()  # 값이 없는 채널을 나타내는 센티널 값
+_ZLIB = "+zlib"  # 압축된 값의 타입 접미사
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS checkpoints ("
+        "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+        "parent_checkpoint_id TEXT, type TEXT NOT NULL, checkpoint BLOB NOT NULL, "
+        "metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, "
+        "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS blobs ("
+        "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, "
+        "version TEXT NOT NULL, type TEXT NOT NULL, blob BLOB, base_version TEXT, "
+        "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS writes ("
+        "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+        "task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, "
+        "type TEXT NOT NULL, value BLOB, task_path TEXT NOT NULL DEFAULT '', "
+        "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+    ),
+)
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    LangGraph BaseCheckpointSaver를 구현한 SQLite 체크포인터
+
+    하나의 SQLite 연결을 락으로 보호하여 여러 스레드와 이벤트 루프에서 함께 사용할 수 있습니다.
+    비동기 메서드는 SQLite 입출력이 이벤트 루프를 막지 않도록 실행기 스레드에서 동기 메서드를 실행합니다.
+    """
+
+    def __init__(self, path=None, *, serde=None):
+        """
+        Args:
+            path (str | None): SQLite 파일 경로 (기본값: CHECKPOINT_PATH 또는 DEFAULT_CHECKPOINT_PATH,
+                ":memory:"이면 메모리에만 저장)
+            serde (SerializerProtocol | None): 값 직렬화기 (기본값: LangGraph 기본 직렬화기)
+        """
+        super().__init__(serde=serde)
+        self.path = path or os.getenv("CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH)
+        self._conn = None
+        self._lock = threading.Lock()
+        # (thread_id, checkpoint_ns, channel) -> 마지막으로 저장한 리스트 값 (버전, 값, 델타 깊이)
+        self._last_lists = OrderedDict()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        SQLite 연결을 생성하고 테이블을 준비합니다. (락을 잡은 상태에서 호출)
+        """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ":memory:":
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "PRAGMA synchronous=NORMAL"
+            )  # WAL에서는 커밋마다 fsync하지 않아도 안전
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _dump(self, value) -> tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            return type_ + _ZLIB, zlib.compress(data)
+        return type_, data
+
+    def _load(self, type_: str, data: bytes):
+        if type_.endswith(_ZLIB):
+            type_, data = type_[: -len(_ZLIB)], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _dump_channel(self, key: tuple, version: str, value) -> tuple:
+        """
+        채널 값을 (타입, 데이터, 기준 버전, 리스트 상태)로 인코딩합니다.
+
+        이전에 저장한 리스트 뒤에 항목을 덧붙인 값이면 덧붙인 항목만 인코딩하고 기준 버전을 함께 반환합니다.
+        리스트 상태는 SQLite에 커밋한 뒤 _track_lists()로 기록합니다. (리스트가 아니면 None)
+        """
+        if not isinstance(value, list):
+            return *self._dump(value), None, None
+
+        base_version = None
+        depth = 0
+        payload = value
+        last = self._last_lists.get(key)
+        if last is not None:
+            last_version, last_value, last_depth = last
+            size = len(last_value)
+            if (
+                0 < size <= len(value)
+                and last_depth < MAX_DELTA_DEPTH
+                and value[:size] == last_value
+            ):
+                base_version, depth, payload = (
+                    last_version,
+                    last_depth + 1,
+                    value[size:],
+                )
+        # 호출한 쪽이 나중에 리스트를 변경해도 영향을 받지 않도록 복사본을 보관
+        return *self._dump(payload), base_version, (version, list(value), depth)
+
+    def _track_lists(self, tracked: dict):
+        """
+        커밋한 채널의 마지막 리스트 상태를 기록합니다. (락을 잡은 상태에서 호출)
+
+        Args:
+            tracked (dict): (thread_id, checkpoint_ns, channel) -> 리스트 상태 (리스트가 아니면 None)
+        """
+        for key, state in tracked.items():
+            self._last_lists.pop(key, None)
+            if state is not None:
+                self._last_lists[key] = state
+        while len(self._last_lists) > MAX_TRACKED_LISTS:
+            self._last_lists.popitem(
+                last=False
+            )  # 가장 오래전에 저장한 스레드의 값부터 제거
+
+    def _load_channel(self, conn, thread_id, checkpoint_ns, channel, version):
+        """
+        채널 값을 읽습니다. 델타로 저장된 값은 기준 버전의 값에 덧붙여 복원합니다.
+
+        Returns:
+            채널 값, 값이 없으면 _MISSING
+        """
+        parts = []
+        while version is not None:
+            row = conn.execute(
+                "SELECT type, blob, base_version FROM blobs WHERE thread_id = ? "
+                "AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None or row[0] == _EMPTY:
+                return _MISSING
+            type_, data, version = row
+            parts.append(self._load(type_, data))
+        if len(parts) == 1:
+            return parts[0]
+        return [item for part in reversed(parts) for item in part]
+
+    def _build_tuple(self, conn, thread_id, checkpoint_ns, row) -> CheckpointTuple:
+        """
+        checkpoints 테이블의 행으로 CheckpointTuple을 만듭니다. (락을 잡은 상태에서 호출)
+        """
+        checkpoint_id, parent_id, type_, data, metadata_type, metadata = row
+        checkpoint = self._load(type_, data)
+        channel_values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            value = self._load_channel(
+                conn, thread_id, checkpoint_ns, channel, str(version)
+            )
+            if value is not _MISSING:
+                channel_values[channel] = value
+
+        writes = conn.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? "
+            "AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        def make_config(checkpoint_id):
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=make_config(checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self._load(metadata_type, metadata),
+            parent_config=make_config(parent_id) if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self._load(type_, value))
+                for task_id, channel, type_, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """
+        체크포인트를 조회합니다. config에 checkpoint_id가 없으면 스레드의 최신 체크포인트를 반환합니다.
+
+        Args:
+            config (RunnableConfig): thread_id(와 checkpoint_ns, checkpoint_id)를 담은 실행 설정
+
+        Returns:
+            CheckpointTuple | None: 체크포인트, 없으면 None
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, "
+            "metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._build_tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        조건에 맞는 체크포인트를 최신순으로 반환합니다.
+
+        Args:
+            config (RunnableConfig | None): thread_id, checkpoint_ns, checkpoint_id 조건
+            filter (dict | None): 메타데이터 조건
+            before (RunnableConfig | None): 이 체크포인트보다 이전의 체크포인트만 반환
+            limit (int | None): 최대 개수
+
+        Yields:
+            CheckpointTuple: 체크포인트
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints WHERE 1 = 1"
+        )
+        params = []
+        if config:
+            configurable = config["configurable"]
+            query += " AND thread_id = ?"
+            params.append(configurable["thread_id"])
+            if (checkpoint_ns := configurable.get("checkpoint_ns")) is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self._load(row[4], row[5])
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._build_tuple(conn, thread_id, checkpoint_ns, row))
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        체크포인트를 저장합니다. 채널 값은 new_versions에 있는(이번 superstep에서 바뀐) 채널만 저장합니다.
+
+        Args:
+            config (RunnableConfig): 부모 체크포인트를 가리키는 실행 설정
+            checkpoint (Checkpoint): 저장할 체크포인트
+            metadata (CheckpointMetadata): 체크포인트 메타데이터
+            new_versions (ChannelVersions): 이번에 바뀐 채널 버전
+
+        Returns:
+            RunnableConfig: 저장한 체크포인트를 가리키는 실행 설정
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+
+        with self._lock:
+            blobs = []
+            tracked = {}
+            for channel, version in new_versions.items():
+                version = str(version)
+                if channel in values:
+                    key = (thread_id, checkpoint_ns, channel)
+                    type_, data, base, tracked[key] = self._dump_channel(
+                        key, version, values[channel]
+                    )
+                else:
+                    type_, data, base = _EMPTY, None, None
+                blobs.append(
+                    (thread_id, checkpoint_ns, channel, version, type_, data, base)
+                )
+            checkpoint_type, checkpoint_data = self._dump(checkpoint)
+            metadata_type, metadata_data = self._dump(
+                get_checkpoint_metadata(config, metadata)
+            )
+
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?)", blobs
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        configurable.get("checkpoint_id"),
+                        checkpoint_type,
+                        checkpoint_data,
+                        metadata_type,
+                        metadata_data,
+                    ),
+                )
+            self._track_lists(tracked)  # 커밋에 성공한 뒤에만 델타의 기준으로 사용
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        체크포인트에 연결된 노드의 중간 쓰기를 저장합니다.
+
+        같은 superstep의 다른 노드가 실패해도, 다시 실행할 때 이미 끝난 노드의 쓰기를 재사용합니다.
+
+        Args:
+            config (RunnableConfig): 체크포인트를 가리키는 실행 설정
+            writes (Sequence[tuple[str, Any]]): (채널, 값) 목록
+            task_id (str): 쓰기를 만든 태스크 ID
+            task_path (str): 쓰기를 만든 태스크 경로
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+        # 특수 채널(에러, 인터럽트 등)의 쓰기는 덮어쓰고, 일반 쓰기는 처음 저장한 값을 유지
+        verb = (
+            "INSERT OR REPLACE"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE"
+        )
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self._dump(value)
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    data,
+                    task_path,
+                )
+            )
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        스레드의 체크포인트, 채널 값, 중간 쓰기를 모두 삭제합니다.
+
+        Args:
+            thread_id (str): 스레드 ID
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for table in ("checkpoints", "blobs", "writes"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)
+                    )
+            for key in [key for key in self._last_lists if key[0] == thread_id]:
+                del self._last_lists[key]
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """get_tuple의 비동기 버전"""
+        return await run_in_executor(None, self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """list의 비동기 버전"""
+        results = await run_in_executor(
+            None,
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)],
+        )
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """put의 비동기 버전"""
+        return await run_in_executor(
+            None, self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """put_writes의 비동기 버전"""
+        await run_in_executor(None, self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """delete_thread의 비동기 버전"""
+        await run_in_executor(None, self.delete_thread, thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        """
+        채널의 다음 버전을 생성합니다. (정수 부분으로 정렬되는 문자열, InMemorySaver와 같은 형식)
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
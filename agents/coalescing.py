@@ -0,0 +1,462 @@
+"""
+동시 LLM 요청 합치기(single-flight coalescing) 모듈
+
+인기 주제가 몰리면 많은 사용자가 같은 순간에 같은 (content_topic, content_type)으로 text_workflow를
+호출하고, 각 호출이 똑같은 LLM 요청을 보냅니다. 이 모듈은 공유 httpx 클라이언트에 끼워지는 transport로,
+정규화한 요청(렌더링된 프롬프트와 모델 설정)이 같은 요청이 진행 중이면 새 요청을 보내지 않고
+진행 중인 요청 하나의 응답을 함께 받습니다.
+
+응답 본문은 도착하는 청크 단위로 모든 대기자에게 전달되므로, 각 호출의 SDK가 같은 SSE 스트림을
+각자 해석하여 stream_mode="messages"의 토큰 스트리밍, 사용량 콜백, 노드 지표가 호출마다 그대로 동작합니다.
+요청이 끝나면 합치기 대상에서 제외되므로 이후 요청은 새로 호출됩니다. (완료된 응답의 재사용은
+LLM 응답 캐시(agents.llm_cache)가 담당합니다.)
+
+합치기 transport는 마감 시각 transport(agents.deadline)보다 바깥에 있습니다. 공유 요청은 마감 시각 없이
+보내고, 각 대기자는 응답 헤더와 청크를 기다리는 동안 자신의 마감 시각만 적용받습니다.
+따라서 먼저 요청한 호출의 마감 시각이 짧아도, 더 늦은 마감 시각이나 마감 시각이 없는 호출은 계속 응답을 받습니다.
+마감 시각이 지난 대기자만 openai.APITimeoutError로 실패하고, 모든 대기자가 응답을 닫으면 진행 중인 요청도 취소됩니다.
+
+동기 요청은 대기자가 응답을 늦게 읽어도 다른 대기자에게 영향을 주지 않도록 요청마다 백그라운드 스레드에서 보내므로,
+합치기는 기본으로 꺼져 있습니다. LLM_COALESCE_ENABLED=true 또는 enable_coalescing()으로 켤 수 있습니다.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import os
+import threading
+
+import httpx
+
+from agents.cassette import normalize_request
+from agents.deadline import deadline_error, deadline_scope, get_deadline, remaining
+
+_enabled = os.getenv("LLM_COALESCE_ENABLED", "false").lower() in ("1", "true", "yes")
+_TIMED_OUT = object()  # 대기자의 마감 시각까지 응답이 오지 않았음을 나타내는 센티널 값
+_stats = {"upstream": 0, "coalesced": 0}  # 실제로 보낸 요청 수, 합쳐진 요청 수
+_stats_lock = threading.Lock()
+
+
+def enable_coalescing(enabled: bool = True):
+    """
+    동시 요청 합치기를 켜거나 끕니다.
+
+    Args:
+        enabled (bool): 합치기 사용 여부 (기본값: True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def coalescing_enabled() -> bool:
+    """동시 요청 합치기 사용 여부를 반환합니다."""
+    return _enabled
+
+
+def get_coalescing_stats() -> dict:
+    """
+    실제로 보낸 요청 수와 진행 중인 요청에 합쳐진 요청 수를 반환합니다.
+
+    Returns:
+        dict: {"upstream": int, "coalesced": int}
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_coalescing_stats():
+    """합치기 집계를 초기화합니다."""
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def flight_key(request: httpx.Request) -> str:
+    """
+    요청을 합칠 때 사용할 키를 반환합니다.
+
+    정규화한 요청에 인증 헤더를 더해, API 키가 다른 요청의 응답은 공유하지 않습니다.
+    """
+    digest = hashlib.sha256(normalize_request(request).encode("utf-8"))
+    digest.update(request.headers.get("authorization", "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _response_extensions(response: httpx.Response) -> dict:
+    return {
+        key: response.extensions[key]
+        for key in ("http_version", "reason_phrase")
+        if key in response.extensions
+    }
+
+
+def _timeout(deadline: float | None) -> float | None:
+    """대기자의 마감 시각까지 기다릴 시간(초)을 반환합니다. (마감 시각이 없으면 None)"""
+    left = remaining(deadline) if deadline is not None else None
+    return None if left is None else max(left, 0.0)
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    공유 요청의 예외를 대기자마다 따로 발생시킬 수 있도록 복사합니다.
+
+    같은 예외 객체를 여러 대기자가 발생시키면 트레이스백이 서로 이어 붙으므로,
+    __init__을 다시 호출하지 않고 속성만 복사한 새 예외를 만들고 원래 예외를 원인(__cause__)으로 연결합니다.
+    """
+    copied = error.__class__.__new__(error.__class__)
+    copied.__dict__.update(error.__dict__)
+    copied.args = error.args
+    copied.__cause__ = error
+    return copied
+
+
+def _failed(message: str) -> httpx.ReadError:
+    """공유 요청이 예상하지 못한 예외로 끝났을 때 대기자에게 전달할 예외"""
+    return httpx.ReadError(message)
+
+
+class _Flight:
+    """
+    진행 중인 요청 하나의 응답 상태와 지금까지 받은 본문 청크 (동기 요청용)
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.cond = threading.Condition()
+        self.response = None  # 응답 헤더를 받은 뒤의 (상태 코드, 헤더, extensions)
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+
+    def wait_response(self, timeout: float | None):
+        with self.cond:
+            ready = self.cond.wait_for(
+                lambda: self.response is not None or self.done, timeout
+            )
+            if not ready:
+                return _TIMED_OUT
+            if self.response is None:
+                raise _copy_error(self.error)
+            return self.response
+
+    def next_chunk(self, index: int, timeout: float | None):
+        with self.cond:
+            ready = self.cond.wait_for(
+                lambda: index < len(self.chunks) or self.done, timeout
+            )
+            if not ready:
+                return _TIMED_OUT
+            if index < len(self.chunks):
+                return self.chunks[index]
+            if self.error is not None:
+                raise _copy_error(self.error)
+            return None
+
+    def update(self, **changes):
+        with self.cond:
+            for key, value in changes.items():
+                setattr(self, key, value)
+            self.cond.notify_all()
+
+    def append(self, chunk: bytes):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+
+class _SubscriberStream(httpx.SyncByteStream):
+    def __init__(self, flight: _Flight, request, deadline, unsubscribe):
+        self._flight = flight
+        self._request = request
+        self._deadline = deadline
+        self._unsubscribe = unsubscribe
+        self._closed = False
+
+    def __iter__(self):
+        index = 0
+        while True:
+            chunk = self._flight.next_chunk(index, _timeout(self._deadline))
+            if chunk is _TIMED_OUT:
+                self.close()
+                raise deadline_error(self._request)
+            if chunk is None:
+                return
+            index += 1
+            yield chunk
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._unsubscribe()
+
+
+class CoalescingTransport(httpx.BaseTransport):
+    """
+    같은 요청이 진행 중이면 그 응답을 함께 받는 동기 httpx transport
+
+    실제 요청은 마감 시각 없이 백그라운드 스레드에서 실행되어, 먼저 요청한 호출이 응답을 닫거나
+    늦게 읽거나 마감 시각이 지나도 다른 대기자에게 영향을 주지 않습니다.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+        self._flights = {}  # 요청 키 -> _Flight
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not _enabled or request.method != "POST":
+            return self.transport.handle_request(request)
+
+        deadline = get_deadline()
+        if deadline is not None and remaining(deadline) <= 0:
+            raise deadline_error(request)
+
+        key = flight_key(request)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(key)
+            flight.subscribers += 1
+        if leader:
+            _count("upstream")
+            # 노드 이름 등 요청한 노드의 컨텍스트는 유지하되, 마감 시각은 대기자마다 따로 적용
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run, args=(self._pump, flight, request), daemon=True
+            ).start()
+        else:
+            _count("coalesced")
+
+        try:
+            response = flight.wait_response(_timeout(deadline))
+            if response is _TIMED_OUT:
+                raise deadline_error(request)
+        except BaseException:
+            self._unsubscribe(flight)
+            raise
+        status, headers, extensions = response
+        stream = _SubscriberStream(
+            flight, request, deadline, lambda: self._unsubscribe(flight)
+        )
+        return httpx.Response(
+            status, headers=headers, stream=stream, extensions=extensions
+        )
+
+    def _pump(self, flight: _Flight, request: httpx.Request):
+        """실제 요청을 마감 시각 없이 보내고 받은 청크를 모든 대기자에게 전달합니다."""
+        error = _failed("Coalesced request failed")  # 예상하지 못한 예외로 끝난 경우
+        try:
+            with deadline_scope(None):
+                response = self.transport.handle_request(request)
+            try:
+                flight.update(
+                    response=(
+                        response.status_code,
+                        response.headers,
+                        _response_extensions(response),
+                    )
+                )
+                for chunk in response.stream:
+                    if flight.subscribers == 0:  # 모든 대기자가 응답을 닫음
+                        break
+                    flight.append(chunk)
+            finally:
+                response.close()
+            error = None
+        except httpx.HTTPError as e:
+            error = e
+        finally:
+            self._finish(flight, error)
+
+    def _finish(self, flight: _Flight, error: Exception | None):
+        with self._lock:
+            self._forget(flight)
+        flight.update(done=True, error=error)
+
+    def _forget(self, flight: _Flight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def _unsubscribe(self, flight: _Flight):
+        with self._lock:
+            flight.subscribers -= 1
+            if flight.subscribers == 0:
+                self._forget(flight)  # 이후 같은 요청은 새로 보냄
+
+    def close(self):
+        self.transport.close()
+
+
+class _AsyncFlight:
+    """
+    _Flight의 비동기 버전 (하나의 이벤트 루프 안에서 사용)
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.cond = asyncio.Condition()
+        self.response = None
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.task = None  # 실제 요청을 보내는 태스크
+
+    async def wait_response(self, timeout: float | None):
+        async with self.cond:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.cond.wait_for(
+                        lambda: self.response is not None or self.done
+                    )
+            except TimeoutError:
+                return _TIMED_OUT
+            if self.response is None:
+                raise _copy_error(self.error)
+            return self.response
+
+    async def next_chunk(self, index: int, timeout: float | None):
+        async with self.cond:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.cond.wait_for(
+                        lambda: index < len(self.chunks) or self.done
+                    )
+            except TimeoutError:
+                return _TIMED_OUT
+            if index < len(self.chunks):
+                return self.chunks[index]
+            if self.error is not None:
+                raise _copy_error(self.error)
+            return None
+
+    async def update(self, **changes):
+        async with self.cond:
+            for key, value in changes.items():
+                setattr(self, key, value)
+            self.cond.notify_all()
+
+    async def append(self, chunk: bytes):
+        async with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+
+class _AsyncSubscriberStream(httpx.AsyncByteStream):
+    def __init__(self, flight: _AsyncFlight, request, deadline, unsubscribe):
+        self._flight = flight
+        self._request = request
+        self._deadline = deadline
+        self._unsubscribe = unsubscribe
+        self._closed = False
+
+    async def __aiter__(self):
+        index = 0
+        while True:
+            chunk = await self._flight.next_chunk(index, _timeout(self._deadline))
+            if chunk is _TIMED_OUT:
+                await self.aclose()
+                raise deadline_error(self._request)
+            if chunk is None:
+                return
+            index += 1
+            yield chunk
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self._unsubscribe()
+
+
+class AsyncCoalescingTransport(httpx.AsyncBaseTransport):
+    """
+    CoalescingTransport의 비동기 버전
+
+    실제 요청은 마감 시각 없이 별도 태스크에서 실행되며, 모든 대기자가 응답을 닫거나
+    취소되거나 마감 시각이 지나면 함께 취소됩니다.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self._flights = {}  # (이벤트 루프, 요청 키) -> _AsyncFlight
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not _enabled or request.method != "POST":
+            return await self.transport.handle_async_request(request)
+
+        deadline = get_deadline()
+        if deadline is not None and remaining(deadline) <= 0:
+            raise deadline_error(request)
+
+        key = (asyncio.get_running_loop(), flight_key(request))
+        flight = self._flights.get(key)
+        if flight is None:
+            _count("upstream")
+            flight = self._flights[key] = _AsyncFlight(key)
+            # 태스크는 노드 이름 등 요청한 노드의 컨텍스트를 복사하여 실행됩니다. (마감 시각은 제외)
+            flight.task = asyncio.ensure_future(self._pump(flight, request))
+        else:
+            _count("coalesced")
+        flight.subscribers += 1
+
+        try:
+            response = await flight.wait_response(_timeout(deadline))
+            if response is _TIMED_OUT:
+                raise deadline_error(request)
+        except BaseException:
+            self._unsubscribe(flight)
+            raise
+        status, headers, extensions = response
+        stream = _AsyncSubscriberStream(
+            flight, request, deadline, lambda: self._unsubscribe(flight)
+        )
+        return httpx.Response(
+            status, headers=headers, stream=stream, extensions=extensions
+        )
+
+    async def _pump(self, flight: _AsyncFlight, request: httpx.Request):
+        """실제 요청을 마감 시각 없이 보내고 받은 청크를 모든 대기자에게 전달합니다."""
+        error = _failed("Coalesced request failed")  # 예상하지 못한 예외로 끝난 경우
+        try:
+            with deadline_scope(None):
+                response = await self.transport.handle_async_request(request)
+            try:
+                await flight.update(
+                    response=(
+                        response.status_code,
+                        response.headers,
+                        _response_extensions(response),
+                    )
+                )
+                async for chunk in response.stream:
+                    await flight.append(chunk)
+            finally:
+                await response.aclose()
+            error = None
+        except asyncio.CancelledError:
+            error = _failed("Coalesced request was cancelled")
+        except httpx.HTTPError as e:
+            error = e
+        finally:
+            self._forget(flight)
+            await flight.update(done=True, error=error)
+
+    def _forget(self, flight: _AsyncFlight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def _unsubscribe(self, flight: _AsyncFlight):
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done:
+            self._forget(flight)  # 이후 같은 요청은 새로 보냄
+            flight.task.cancel()  # 응답을 기다리는 호출이 없으면 요청 취소
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,407 @@
+"""
+메인 Workflow 조건부 라우팅 함수 모듈
+
+이 모듈은 메인 Workflow에서 요청(MainState)을 처리할 도메인 서브그래프를 결정하는 함수들을 제공합니다.
+라우터가 여러 도메인을 반환하면 LangGraph는 해당 브랜치들을 같은 단계에서 병렬로 실행합니다.
+
+사용자 쿼리(query)로 도메인을 고를 때는 LLM 대신 로컬 라우터(LocalRouter)를 사용합니다.
+1. 키워드/정규식 규칙(ROUTE_RULES): 일치하는 모든 도메인을 선택
+2. 문자 n-gram 선형 분류기: 규칙이 없으면 예시 문장(ROUTE_EXAMPLES)으로 학습한 분류기의 확률이
+   임계값 이상인 도메인을 선택
+3. LLM 대체(선택): 분류기가 확신하지 못할 때만 LLM에 도메인을 묻습니다. (기본값: 사용 안 함)
+
+규칙과 분류기는 마이크로초 단위로 실행되므로 라우팅 때문에 모델 왕복이 추가되지 않습니다.
+결정 방식별 횟수는 agents.metrics.get_route_usage()로 확인하여 규칙과 임계값을 조정할 수 있습니다.
+
+로컬 라우터 설정은 환경변수로 변경할 수 있습니다.
+- ROUTER_ENABLED: "false"로 설정하면 쿼리로 도메인을 고르지 않음 (기본값: "true")
+- ROUTER_CONFIDENCE_THRESHOLD: 분류기 결정을 사용할 최소 확률 (기본값: 0.6)
+- ROUTER_LLM_FALLBACK: "true"로 설정하면 분류기가 확신하지 못할 때 LLM에 묻기 (기본값: "false")
+"""
+
+import math
+import os
+import re
+import threading
+
+import httpx
+import openai
+from langgraph.types import Send
+
+from agents.metrics import record_route
+
+# 메인 Workflow가 실행할 수 있는 도메인 (응답 병합 순서)
+DOMAINS = ("text", "image", "music", "management")
+JOIN_NODE = "join"  # 도메인 브랜치의 응답을 병합하는 노드 이름
+
+# 도메인별 필수 입력 키: state에 모두 값이 있으면 해당 도메인을 실행합니다.
+# (image, music은 아직 필수 입력이 없으므로 domains로 명시했을 때만 실행합니다.)
+DOMAIN_INPUT_KEYS = {
+    "text": ("content_topic", "content_type"),
+    "management": ("project_id", "request_type", "query"),
+}
+
+# 쿼리로 text 도메인을 고른 요청의 콘텐츠 유형 규칙 (앞에서부터 처음 일치하는 유형 사용)
+TEXT_CONTENT_TYPE_RULES = (
+    ("인스타그램 캡션", r"캡션|인스타|\b(?:caption|instagram)\b"),
+    ("블로그 글", r"블로그|\bblog\b"),
+    ("에세이", r"에세이|\bessay\b"),
+    ("기사", r"기사|칼럼|\b(?:article|column)\b"),
+    ("대본", r"대본|스크립트|\bscript\b"),
+    ("소셜 미디어 포스트", r"포스팅|게시글|\bpost\b"),
+)
+DEFAULT_TEXT_CONTENT_TYPE = "글"  # 쿼리에 콘텐츠 유형이 없을 때 사용할 유형
+
+# 도메인별 키워드/정규식 규칙: 쿼리에 일치하면 분류기 없이 해당 도메인을 선택합니다.
+ROUTE_RULES = {
+    "text": r"블로그|포스팅|게시글|캡션|에세이|칼럼|기사|대본|스크립트|"
+    r"\b(?:blog|post|caption|essay|article|script|copywriting)\b",
+    "image": r"이미지|사진|그림|일러스트|썸네일|포스터|앨범\s*커버|화보|"
+    r"\b(?:image|photo|picture|illustration|thumbnail|poster|artwork)\b",
+    "music": r"음악|노래|작곡|작사|가사|멜로디|음원|신곡|편곡|비트|드럼|"
+    r"\b(?:music|song|lyrics|melody|compose|beat|track)\b",
+    "management": r"일정|스케줄|예산|리소스|인력|배정|섭외|계약|매니지먼트|"
+    r"\b(?:schedule|budget|resource|staffing|allocation|contract|manage)\b",
+}
+
+# LLM 대체 호출에서 예상하는 실패 (API 오류, 네트워크 오류, 마감 시각 초과)
+LLM_ROUTE_ERRORS = (openai.OpenAIError, httpx.HTTPError, TimeoutError)
+
+# 분류기 학습용 예시 쿼리 (규칙에 없는 표현도 분류할 수 있도록 규칙 키워드를 피한 문장 위주)
+ROUTE_EXAMPLES = (
+    ("text", "여름 휴가 후기를 써 줘"),
+    ("text", "팬들에게 보낼 편지 문구 작성"),
+    ("text", "인스타 글귀 추천해 줘"),
+    ("text", "감성적인 문장으로 소개글 작성"),
+    ("text", "짧은 소설 한 편 써 줘"),
+    ("text", "공지문 초안 작성해 줘"),
+    ("text", "자기소개 문단을 다듬어 줘"),
+    ("text", "write a short story about summer"),
+    ("text", "draft a newsletter for fans"),
+    ("image", "무대 의상 콘셉트를 시각화해 줘"),
+    ("image", "프로필 컷 스타일 제안"),
+    ("image", "몽환적인 분위기의 비주얼 만들어 줘"),
+    ("image", "뮤직비디오 장면 콘티를 그려 줘"),
+    ("image", "굿즈 디자인 시안"),
+    ("image", "로고 디자인 해 줘"),
+    ("image", "배경 화면 만들어 줘"),
+    ("image", "generate a visual for the album"),
+    ("image", "design a logo for the tour"),
+    ("music", "잔잔한 발라드 한 곡 만들어 줘"),
+    ("music", "후렴구 훅 아이디어"),
+    ("music", "피아노 반주 코드 진행 추천"),
+    ("music", "데모 녹음용 보컬 가이드"),
+    ("music", "템포 빠른 댄스곡 구성"),
+    ("music", "랩 벌스 써 줘"),
+    ("music", "사운드 믹싱 방향 제안"),
+    ("music", "make a chill lofi tune"),
+    ("music", "suggest a chord progression for the chorus"),
+    ("management", "다음 달 촬영 준비"),
+    ("management", "팀원 역할 분담 계획"),
+    ("management", "콘서트 준비 인원 계획"),
+    ("management", "장비 대여 비용 정리"),
+    ("management", "촬영 장소 예약 현황"),
+    ("management", "프로젝트 진행 상황 점검"),
+    ("management", "스태프 근무표 짜 줘"),
+    ("management", "plan the crew for next week's shoot"),
+    ("management", "track project milestones and costs"),
+)
+
+
+def _ngrams(text: str) -> set[str]:
+    """소문자로 바꾸고 공백을 정규화한 문자열의 문자 2-gram, 3-gram 집합을 반환합니다."""
+    text = f" {' '.join(text.lower().split())} "
+    return {text[i : i + n] for n in (2, 3) for i in range(len(text) - n + 1)}
+
+
+class LocalRouter:
+    """
+    키워드 규칙과 문자 n-gram 선형 분류기로 쿼리를 처리할 도메인을 고르는 로컬 라우터
+
+    분류기는 다항 로지스틱 회귀로, 처음 사용할 때 예시 쿼리로 한 번 학습합니다.
+    """
+
+    def __init__(
+        self,
+        rules=None,
+        examples=ROUTE_EXAMPLES,
+        threshold: float = 0.6,
+        llm_fallback=None,
+        epochs: int = 20,
+        learning_rate: float = 0.1,
+    ):
+        """
+        Args:
+            rules (dict[str, str] | None): {도메인: 정규식} 규칙 (기본값: ROUTE_RULES)
+            examples (Sequence[tuple[str, str]]): (도메인, 쿼리) 학습 예시
+            threshold (float): 분류기 결정을 사용할 최소 확률 (기본값: 0.6)
+            llm_fallback (Callable[[str], list[str]] | None): 분류기가 확신하지 못할 때 사용할 함수
+            epochs (int): 학습 반복 횟수 (기본값: 20)
+            learning_rate (float): 학습률 (기본값: 0.1, 값이 크면 처음 보는 쿼리에도 과신함)
+        """
+        rules = ROUTE_RULES if rules is None else rules
+        self.rules = {
+            domain: re.compile(pattern, re.IGNORECASE)
+            for domain, pattern in rules.items()
+        }
+        self.examples = tuple(examples)
+        self.threshold = threshold
+        self.llm_fallback = llm_fallback
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.labels = tuple(
+            domain
+            for domain in DOMAINS
+            if any(label == domain for label, _ in self.examples)
+        )
+        self.weights = None  # n-gram -> 도메인별 가중치
+        self.bias = None
+        self._lock = threading.Lock()
+
+    def _train(self):
+        """예시 쿼리로 다항 로지스틱 회귀를 확률적 경사 하강법으로 학습합니다."""
+        weights = {}
+        bias = [0.0] * len(self.labels)
+        samples = [
+            (_ngrams(query), self.labels.index(label)) for label, query in self.examples
+        ]
+        for _ in range(self.epochs):
+            for features, target in samples:
+                probabilities = self._softmax(weights, bias, features)
+                for index, probability in enumerate(probabilities):
+                    gradient = probability - (index == target)
+                    bias[index] -= self.learning_rate * gradient
+                    for feature in features:
+                        row = weights.setdefault(feature, [0.0] * len(self.labels))
+                        row[index] -= self.learning_rate * gradient
+        self.weights, self.bias = weights, bias
+
+    @staticmethod
+    def _softmax(weights, bias, features) -> list[float]:
+        scores = list(bias)
+        for feature in features:
+            row = weights.get(feature)
+            if row is not None:
+                for index, weight in enumerate(row):
+                    scores[index] += weight
+        top = max(scores)
+        exps = [math.exp(score - top) for score in scores]
+        total = sum(exps)
+        return [value / total for value in exps]
+
+    def classify(self, query: str) -> tuple[str | None, float]:
+        """
+        분류기로 쿼리의 도메인과 확률을 예측합니다.
+
+        Returns:
+            tuple[str | None, float]: (가장 확률이 높은 도메인, 확률), 학습 예시가 없으면 (None, 0.0)
+        """
+        if not self.labels:
+            return None, 0.0
+        if self.weights is None:
+            with self._lock:
+                if self.weights is None:
+                    self._train()
+        probabilities = self._softmax(self.weights, self.bias, _ngrams(query))
+        best = max(range(len(self.labels)), key=probabilities.__getitem__)
+        return self.labels[best], probabilities[best]
+
+    def route(self, query: str, allow_fallback: bool = True) -> list[str]:
+        """
+        쿼리를 처리할 도메인 목록을 결정하고, 결정 방식을 agents.metrics에 기록합니다.
+
+        Args:
+            query (str): 사용자 쿼리
+            allow_fallback (bool): 분류기가 확신하지 못할 때 LLM 대체를 사용할지 여부 (기본값: True)
+
+        Returns:
+            list[str]: 선택한 도메인 목록 (확신하지 못하면 빈 목록)
+        """
+        domains = [domain for domain, rule in self.rules.items() if rule.search(query)]
+        if domains:
+            record_route("rule", domains)
+            return domains
+
+        domain, confidence = self.classify(query)
+        if domain is not None and confidence >= self.threshold:
+            record_route("classifier", [domain])
+            return [domain]
+
+        if allow_fallback and self.llm_fallback is not None:
+            try:
+                domains = [
+                    domain for domain in self.llm_fallback(query) if domain in DOMAINS
+                ]
+            except LLM_ROUTE_ERRORS:  # LLM 호출 실패 시 도메인을 추가하지 않음
+                record_route("llm_error", [])
+                return []
+            record_route("llm", domains)
+            return domains
+
+        record_route("unsure", [])
+        return []
+
+
+def llm_route(query: str) -> list[str]:
+    """
+    LLM에 쿼리를 처리할 도메인을 묻습니다. (로컬 라우터가 확신하지 못할 때만 사용)
+
+    Args:
+        query (str): 사용자 쿼리
+
+    Returns:
+        list[str]: LLM이 고른 도메인 목록
+    """
+    from agents.model_registry import DEFAULT_MODEL, get_chat_model
+
+    model = get_chat_model(model=DEFAULT_MODEL, temperature=0.0, top_p=1.0)
+    answer = model.invoke(
+        "Classify the request into one or more of these domains: "
+        f"{', '.join(DOMAINS)}. Reply with the domain names separated by commas, "
+        f"or 'none'.\n\nRequest: {query}"
+    ).content
+    return [domain for domain in DOMAINS if re.search(rf"\b{domain}\b", answer.lower())]
+
+
+_enabled = os.getenv("ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+_router = None
+_router_lock = threading.Lock()
+
+
+def enable_router(enabled: bool = True):
+    """
+    쿼리로 도메인을 고르는 로컬 라우터를 켜거나 끕니다.
+
+    Args:
+        enabled (bool): 로컬 라우터 사용 여부 (기본값: True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def router_enabled() -> bool:
+    """로컬 라우터 사용 여부를 반환합니다."""
+    return _enabled
+
+
+def get_router() -> LocalRouter:
+    """
+    프로세스 전역 로컬 라우터를 반환합니다. (처음 호출할 때 환경변수 설정으로 생성)
+
+    Returns:
+        LocalRouter: 공유 로컬 라우터
+    """
+    global _router
+    with _router_lock:
+        if _router is None:
+            fallback = os.getenv("ROUTER_LLM_FALLBACK", "false").lower()
+            _router = LocalRouter(
+                threshold=float(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.6")),
+                llm_fallback=llm_route if fallback in ("1", "true", "yes") else None,
+            )
+        return _router
+
+
+def configure_router(**kwargs) -> LocalRouter:
+    """
+    프로세스 전역 로컬 라우터를 주어진 설정으로 다시 생성합니다.
+
+    Args:
+        **kwargs: LocalRouter 생성 인자 (rules, examples, threshold, llm_fallback 등)
+
+    Returns:
+        LocalRouter: 새로 생성된 공유 로컬 라우터
+    """
+    global _router
+    with _router_lock:
+        _router = LocalRouter(**kwargs)
+        return _router
+
+
+def _has_inputs(domain: str, state) -> bool:
+    """도메인의 필수 입력이 state에 모두 있는지 확인합니다."""
+    return all(state.get(key) for key in DOMAIN_INPUT_KEYS.get(domain, ()))
+
+
+def missing_inputs(domain: str, state) -> list[str]:
+    """
+    도메인의 필수 입력 중 state에 값이 없는 키 목록을 반환합니다.
+
+    Args:
+        domain (str): 도메인 이름
+        state (MainState): 현재 Workflow 상태 객체
+
+    Returns:
+        list[str]: 값이 없는 필수 입력 키 목록
+    """
+    return [key for key in DOMAIN_INPUT_KEYS.get(domain, ()) if not state.get(key)]
+
+
+def infer_inputs(domain: str, query: str) -> dict:
+    """
+    쿼리만으로 고른 도메인의 필수 입력 중 쿼리에서 만들 수 있는 값을 반환합니다.
+
+    text 도메인은 쿼리 전체를 콘텐츠 주제로, TEXT_CONTENT_TYPE_RULES로 찾은 유형을 콘텐츠 유형으로 사용합니다.
+    management의 project_id처럼 쿼리로 알 수 없는 입력은 만들지 않습니다.
+
+    Args:
+        domain (str): 도메인 이름
+        query (str): 사용자 쿼리
+
+    Returns:
+        dict: 쿼리에서 만든 입력 값
+    """
+    if domain != "text":
+        return {}
+    content_type = next(
+        (
+            content_type
+            for content_type, pattern in TEXT_CONTENT_TYPE_RULES
+            if re.search(pattern, query, re.IGNORECASE)
+        ),
+        DEFAULT_TEXT_CONTENT_TYPE,
+    )
+    return {"content_topic": query, "content_type": content_type}
+
+
+def route_domains(state) -> list:
+    """
+    요청을 처리할 도메인 브랜치 목록을 결정하는 라우터 함수
+
+    state["domains"]가 주어지면 해당 도메인을, 없으면 DOMAIN_INPUT_KEYS를 기준으로
+    필요한 입력이 모두 있는 도메인을 선택합니다. 실행할 도메인이 없으면 바로 병합 노드로 이동합니다.
+
+    state["domains"]가 없고 입력값으로도 도메인이 정해지지 않았을 때만 로컬 라우터가 query로 도메인을 고릅니다.
+    입력값으로 도메인이 정해진 요청은 쿼리에 다른 도메인의 키워드(신곡, 포스터 등)가 있어도 도메인을 추가하지 않습니다.
+    쿼리로 고른 도메인은 다음과 같이 실행합니다.
+    - 쿼리로 필수 입력을 만들 수 있는 도메인(text): 만든 입력을 더한 상태로 실행 (Send)
+    - 그 외: 그대로 실행하며, 필수 입력이 없는 도메인은 필요한 입력을 안내하는 응답을 반환합니다.
+      (DomainWorkflowNode 참고)
+
+    Args:
+        state (MainState): 현재 Workflow 상태 객체
+
+    Returns:
+        list[str | Send]: 다음에 실행할 노드 이름 또는 입력을 더한 Send 목록 (도메인 순서)
+
+    Raises:
+        ValueError: 알 수 없는 도메인이 지정된 경우
+    """
+    domains = state.get("domains")
+    if domains:
+        unknown = set(domains) - set(DOMAINS)
+        if unknown:
+            raise ValueError(f"Unknown domains: {sorted(unknown)}")
+    else:
+        domains = [domain for domain in DOMAIN_INPUT_KEYS if _has_inputs(domain, state)]
+        if not domains and state.get("query") and router_enabled():
+            routed = get_router().route(state["query"])
+            return [
+                Send(domain, {**state, **inputs})
+                if (inputs := infer_inputs(domain, state["query"]))
+                else domain
+                for domain in DOMAINS
+                if domain in routed
+            ] or [JOIN_NODE]
+
+    return [domain for domain in DOMAINS if domain in domains] or [JOIN_NODE]
@@ -0,0 +1,188 @@
+"""
+그래프 실행 마감 시간(deadline) 모듈
+
+호출자는 RunnableConfig의 configurable["deadline"]에 절대 마감 시각(time.time() 기준 초)을 전달하여
+그래프 실행 전체의 지연 예산을 정할 수 있습니다. 값은 서브그래프까지 그대로 전달되며,
+BaseNode가 노드마다 다음과 같이 예산을 적용합니다.
+
+- 남은 시간이 노드의 min_budget보다 적으면 노드를 실행하지 않고 대체 응답(fallback)을 사용하거나,
+  선택(optional) 노드이면 건너뜁니다.
+- 실행 중 마감 시각이 지나면 진행 중인 LLM 호출을 취소하고 대체 응답을 사용합니다.
+  (비동기 실행은 태스크를 취소하고, 동기 실행은 공유 httpx 클라이언트의 요청 타임아웃을
+  남은 시간으로 줄여 호출을 끊습니다.)
+- 대체 응답을 사용했거나 건너뛴 노드는 상태의 degraded_nodes 채널에 기록됩니다.
+
+예시:
+```python
+from agents.deadline import with_deadline
+
+result = await main_workflow().ainvoke(state, with_deadline(2.5))  # 2.5초 안에 응답
+print(result["degraded_nodes"])  # [{"node": ..., "workflow": ..., "reason": "timeout"}]
+```
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+import httpx
+
+DEADLINE_KEY = "deadline"  # configurable에서 마감 시각을 읽을 키
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    마감 시각이 지났지만 노드에 대체 응답이 없어 결과를 만들 수 없을 때 발생하는 예외
+    """
+
+
+def with_deadline(seconds: float, config: dict | None = None) -> dict:
+    """
+    지금부터 seconds초 뒤를 마감 시각으로 설정한 실행 설정을 반환합니다.
+
+    Args:
+        seconds (float): 지연 예산(초)
+        config (dict | None): 기존 실행 설정
+
+    Returns:
+        dict: configurable["deadline"]이 설정된 실행 설정
+    """
+    config = dict(config or {})
+    config["configurable"] = {
+        **(config.get("configurable") or {}),
+        DEADLINE_KEY: time.time() + seconds,
+    }
+    return config
+
+
+def get_deadline(config: dict | None = None) -> float | None:
+    """
+    실행 설정 또는 현재 실행 중인 노드의 마감 시각을 반환합니다.
+
+    Args:
+        config (dict | None): 실행 설정
+
+    Returns:
+        float | None: 마감 시각 (time.time() 기준 초, 설정되지 않았으면 None)
+    """
+    configurable = (config or {}).get("configurable") or {}
+    deadline = configurable.get(DEADLINE_KEY)
+    if deadline is None:
+        return _deadline.get()
+    return float(deadline)
+
+
+def remaining(deadline: float | None = None) -> float | None:
+    """
+    마감 시각까지 남은 시간(초)을 반환합니다.
+
+    Args:
+        deadline (float | None): 마감 시각 (생략하면 현재 실행 중인 노드의 마감 시각)
+
+    Returns:
+        float | None: 남은 시간 (마감 시각이 없으면 None, 지났으면 0 이하)
+    """
+    if deadline is None:
+        deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+@contextmanager
+def deadline_scope(deadline: float | None):
+    """
+    블록 안의 LLM 요청에 마감 시각을 적용합니다.
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _clamp_timeout(request: httpx.Request, left: float):
+    """요청의 connect/read/write/pool 타임아웃을 남은 시간 이하로 줄입니다."""
+    timeout = dict(request.extensions.get("timeout") or {})
+    for key in ("connect", "read", "write", "pool"):
+        value = timeout.get(key)
+        timeout[key] = left if value is None else min(value, left)
+    request.extensions["timeout"] = timeout
+
+
+def deadline_error(request: httpx.Request) -> Exception:
+    """
+    마감 시각이 지난 요청에 대해 발생시킬 예외를 반환합니다.
+
+    OpenAI SDK는 OpenAIError를 재시도하지 않으므로, 마감 이후의 재시도 대기를 막기 위해
+    httpx 타임아웃 대신 openai.APITimeoutError를 사용합니다.
+    """
+    from openai import APITimeoutError
+
+    return APITimeoutError(request=request)
+
+
+def _expired(request: httpx.Request, cause: Exception | None = None):
+    error = deadline_error(request)
+    if cause is not None:
+        raise error from cause
+    raise error
+
+
+class DeadlineTransport(httpx.BaseTransport):
+    """
+    현재 노드의 마감 시각에 맞춰 요청 타임아웃을 줄이는 동기 httpx transport
+
+    마감 시각이 이미 지났으면 요청을 보내지 않고, 마감 시각 때문에 타임아웃된 요청은
+    SDK가 재시도하지 않도록 openai.APITimeoutError로 바로 실패시킵니다.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        left = remaining()
+        if left is None:
+            return self.transport.handle_request(request)
+        if left <= 0:
+            _expired(request)
+
+        _clamp_timeout(request, left)
+        try:
+            return self.transport.handle_request(request)
+        except httpx.TimeoutException as e:
+            if remaining() <= 0:
+                _expired(request, e)
+            raise
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncDeadlineTransport(httpx.AsyncBaseTransport):
+    """
+    DeadlineTransport의 비동기 버전
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        left = remaining()
+        if left is None:
+            return await self.transport.handle_async_request(request)
+        if left <= 0:
+            _expired(request)
+
+        _clamp_timeout(request, left)
+        try:
+            return await self.transport.handle_async_request(request)
+        except httpx.TimeoutException as e:
+            if remaining() <= 0:
+                _expired(request, e)
+            raise
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,395 @@
+"""
+LLM 요청 헤징(hedged request) 모듈
+
+노드의 꼬리 지연은 대부분 평균적인 호출이 아니라 가끔 발생하는 제공자 지연(수 초간 멈춤)에서 생깁니다.
+헤징을 켜면 공유 httpx 클라이언트의 transport가 요청이 최근 첫 응답 지연의 백분위수(기본값: p95)
+안에 첫 바이트(스트리밍이면 첫 토큰 청크)를 받지 못했을 때 같은 요청을 한 번 더 보내고,
+먼저 응답한 쪽을 사용하며 늦은 쪽은 취소합니다.
+
+첫 응답 지연은 노드별로 최근 요청을 기준으로 계산하며, 충분한 표본이 모이기 전이나 중복 요청 비율이
+max_hedge_rate를 넘으면 헤징하지 않습니다. 노드별 헤징 비율, 중복 요청 승률, 중복 요청의 추가
+프롬프트 토큰 수는 agents.metrics.get_hedge_usage()로 확인할 수 있습니다.
+
+헤징은 기본적으로 꺼져 있으며 환경변수 또는 configure_hedging()으로 켭니다.
+- LLM_HEDGE_ENABLED: true이면 헤징 사용 (기본값: false)
+- LLM_HEDGE_PERCENTILE: 중복 요청을 보낼 첫 응답 지연 백분위수 (기본값: 95)
+- LLM_HEDGE_MAX_RATE: 전체 요청 중 중복 요청을 보낼 최대 비율 (기본값: 0.1)
+- LLM_HEDGE_NODES: 헤징할 노드 이름 목록 (쉼표로 구분, 생략하면 모든 노드)
+
+예시:
+```python
+from agents.hedging import configure_hedging
+from agents.metrics import get_hedge_usage
+
+configure_hedging(percentile=95, nodes=["PersonaExtractionNode"])
+text_workflow().invoke(state)
+print(get_hedge_usage("PersonaExtractionNode"))
+# {"requests": 120, "hedged": 6, "hedge_wins": 5, "extra_tokens": 5400, ...}
+```
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import httpx
+
+from agents.metrics import current_node, record_hedge
+from agents.rate_limiter import estimate_prompt_tokens
+
+
+class HedgePolicy:
+    """
+    노드별 최근 첫 응답 지연으로 중복 요청을 보낼 시점을 정하는 헤징 정책
+    """
+
+    def __init__(
+        self,
+        percentile=95.0,
+        min_samples=20,
+        window=200,
+        max_hedge_rate=0.1,
+        min_delay=0.05,
+        nodes=None,
+    ):
+        """
+        Args:
+            percentile (float): 중복 요청을 보낼 첫 응답 지연 백분위수
+            min_samples (int): 헤징을 시작하기 전에 필요한 노드별 최소 관측 수
+            window (int): 노드별로 유지할 최근 관측 수
+            max_hedge_rate (float): 전체 요청 중 중복 요청을 보낼 최대 비율
+            min_delay (float): 중복 요청을 보내기 전 최소 대기 시간(초)
+            nodes (list[str] | None): 헤징할 노드 이름 목록 (None이면 모든 노드)
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.nodes = set(nodes) if nodes else None
+        self._latencies = {}  # 노드 이름 -> 최근 첫 응답 지연(초)
+        self._requests = 0
+        self._hedged = 0
+        self._lock = threading.Lock()
+
+    def applies(self, node: str) -> bool:
+        """노드의 요청이 헤징 대상인지 확인합니다."""
+        return self.nodes is None or node in self.nodes
+
+    def delay(self, node: str) -> float | None:
+        """
+        노드의 요청에 중복 요청을 보내기 전까지 기다릴 시간을 반환합니다.
+
+        Returns:
+            float | None: 대기 시간(초), 아직 표본이 부족하면 None
+        """
+        with self._lock:
+            self._requests += 1
+            latencies = self._latencies.get(node)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+    def try_hedge(self) -> bool:
+        """중복 요청 비율 한도 안에서 중복 요청을 하나 보낼 수 있으면 True를 반환합니다."""
+        with self._lock:
+            if self._hedged + 1 > self.max_hedge_rate * self._requests:
+                return False
+            self._hedged += 1
+            return True
+
+    def observe(self, node: str, latency: float):
+        """노드 요청의 첫 응답 지연(초)을 기록합니다."""
+        with self._lock:
+            latencies = self._latencies.get(node)
+            if latencies is None:
+                latencies = self._latencies[node] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+
+def _copy_request(request: httpx.Request) -> httpx.Request:
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        content=request.content,
+        extensions=dict(request.extensions),
+    )
+
+
+class _PrefetchedStream(httpx.SyncByteStream):
+    """첫 청크를 미리 읽은 응답 본문 스트림"""
+
+    def __init__(self, first: bytes, iterator, stream):
+        self._first = first
+        self._iterator = iterator
+        self._stream = stream
+
+    def __iter__(self):
+        if self._first:
+            yield self._first
+        yield from self._iterator
+
+    def close(self):
+        self._stream.close()
+
+
+class _AsyncPrefetchedStream(httpx.AsyncByteStream):
+    """_PrefetchedStream의 비동기 버전"""
+
+    def __init__(self, first: bytes, iterator, stream):
+        self._first = first
+        self._iterator = iterator
+        self._stream = stream
+
+    async def __aiter__(self):
+        if self._first:
+            yield self._first
+        async for chunk in self._iterator:
+            yield chunk
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+class HedgedTransport(httpx.BaseTransport):
+    """
+    첫 응답이 늦은 요청을 중복으로 보내는 동기 httpx transport
+
+    요청은 스레드 풀에서 실행되며, 먼저 첫 바이트를 받은 응답을 반환합니다.
+    동기 요청은 실행 중에 취소할 수 없으므로 늦은 쪽의 응답은 도착하는 즉시 닫습니다.
+    헤징이 꺼져 있으면 내부 transport로 그대로 전달합니다.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, max_workers=32):
+        self.transport = transport
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _submit(self, request: httpx.Request) -> concurrent.futures.Future:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        self._max_workers, thread_name_prefix="llm-hedge"
+                    )
+        context = contextvars.copy_context()  # 마감 시각 등 호출한 노드의 컨텍스트 유지
+        return self._executor.submit(context.run, self._first_byte, request)
+
+    def _first_byte(self, request: httpx.Request) -> httpx.Response:
+        response = self.transport.handle_request(request)
+        iterator = iter(response.stream)
+        try:
+            first = next(iterator, b"")
+        except BaseException:
+            response.close()
+            raise
+        response.stream = _PrefetchedStream(first, iterator, response.stream)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        policy = get_hedge_policy()
+        node = current_node()
+        if policy is None or not policy.applies(node):
+            return self.transport.handle_request(request)
+        delay = policy.delay(node)
+        start = time.perf_counter()
+        if delay is None:
+            response = self._first_byte(request)
+            policy.observe(node, time.perf_counter() - start)
+            record_hedge(node, hedged=False)
+            return response
+
+        primary = self._submit(request)
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        if done or not policy.try_hedge():
+            response = primary.result()
+            policy.observe(node, time.perf_counter() - start)
+            record_hedge(node, hedged=False)
+            return response
+
+        hedge = self._submit(_copy_request(request))
+        winner, loser = _first_success([primary, hedge])
+        loser.add_done_callback(_close_response)  # 늦은 쪽 응답은 도착하는 즉시 닫음
+        policy.observe(node, time.perf_counter() - start)
+        record_hedge(
+            node,
+            hedged=True,
+            won=winner is hedge,
+            extra_tokens=estimate_prompt_tokens(request),
+        )
+        return winner.result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.transport.close()
+
+
+def _first_success(futures: list) -> tuple:
+    """
+    먼저 성공한 Future와 나머지 Future를 반환합니다. (모두 실패하면 먼저 보낸 요청의 예외 발생)
+    """
+    pending = set(futures)
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            if future.exception() is None:
+                (loser,) = [other for other in futures if other is not future]
+                return future, loser
+    futures[0].result()  # 원래 요청의 예외를 그대로 발생
+
+
+def _close_response(future: concurrent.futures.Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class AsyncHedgedTransport(httpx.AsyncBaseTransport):
+    """
+    HedgedTransport의 비동기 버전
+
+    늦은 쪽의 요청 태스크는 취소되어 커넥션이 바로 정리됩니다.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def _first_byte(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        iterator = response.stream.__aiter__()
+        try:
+            first = await anext(iterator, b"")
+        except BaseException:
+            await response.aclose()
+            raise
+        response.stream = _AsyncPrefetchedStream(first, iterator, response.stream)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = get_hedge_policy()
+        node = current_node()
+        if policy is None or not policy.applies(node):
+            return await self.transport.handle_async_request(request)
+        delay = policy.delay(node)
+        start = time.perf_counter()
+        if delay is None:
+            response = await self._first_byte(request)
+            policy.observe(node, time.perf_counter() - start)
+            record_hedge(node, hedged=False)
+            return response
+
+        tasks = [asyncio.ensure_future(self._first_byte(request))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not policy.try_hedge():
+                response = await tasks[0]
+                policy.observe(node, time.perf_counter() - start)
+                record_hedge(node, hedged=False)
+                return response
+
+            tasks.append(
+                asyncio.ensure_future(self._first_byte(_copy_request(request)))
+            )
+            winner = await _afirst_success(tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for task in tasks:
+            if task is not winner:
+                task.cancel()  # 늦은 쪽 요청 취소
+                task.add_done_callback(_aclose_response)
+        policy.observe(node, time.perf_counter() - start)
+        record_hedge(
+            node,
+            hedged=True,
+            won=winner is tasks[1],
+            extra_tokens=estimate_prompt_tokens(request),
+        )
+        return winner.result()
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+async def _afirst_success(tasks: list) -> asyncio.Future:
+    """먼저 성공한 태스크를 반환합니다. (모두 실패하면 먼저 보낸 요청의 예외 발생)"""
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task
+    return await tasks[0]
+
+
+def _aclose_response(task: asyncio.Future):
+    # 취소되기 전에 이미 응답을 받았다면 응답을 닫아 커넥션을 반납합니다.
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().aclose())
+
+
+_policy = None  # 현재 HedgePolicy
+_configured = False  # 환경변수 설정을 읽었는지 여부
+_policy_lock = threading.Lock()
+
+
+def configure_hedging(enabled=True, **kwargs) -> HedgePolicy | None:
+    """
+    프로세스 전체 LLM 요청 헤징을 설정합니다.
+
+    Args:
+        enabled (bool): 헤징 사용 여부
+        **kwargs: HedgePolicy에 전달할 설정 (percentile, max_hedge_rate, nodes 등)
+
+    Returns:
+        HedgePolicy | None: 설정된 헤징 정책 (헤징을 끄면 None)
+    """
+    global _policy, _configured
+    policy = HedgePolicy(**kwargs) if enabled else None
+    with _policy_lock:
+        _policy = policy
+        _configured = True
+    return policy
+
+
+def get_hedge_policy() -> HedgePolicy | None:
+    """
+    현재 헤징 정책을 반환합니다.
+
+    configure_hedging()으로 설정하지 않았다면 처음 호출될 때 환경변수를 읽습니다.
+
+    Returns:
+        HedgePolicy | None: 헤징 정책 (헤징이 꺼져 있으면 None)
+    """
+    if not _configured:
+        flag = os.getenv("LLM_HEDGE_ENABLED", "false")
+        enabled = flag.lower() in ("1", "true", "yes")
+        nodes = os.getenv("LLM_HEDGE_NODES")
+        configure_hedging(
+            enabled,
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+            max_hedge_rate=float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1")),
+            nodes=[node.strip() for node in nodes.split(",")] if nodes else None,
+        )
+    return _policy
+
+
+def reset_hedging():
+    """헤징 설정을 지워 다음 호출에서 환경변수를 다시 읽도록 합니다."""
+    global _policy, _configured
+    with _policy_lock:
+        _policy = None
+        _configured = False
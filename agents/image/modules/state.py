@@ -7,10 +7,11 @@ LangGraph의 상태 관리를 위한 클래스를 포함합니다.
 
 from __future__ import annotations
 
+import operator
 from dataclasses import dataclass
 from typing import Annotated, TypedDict
 
-from langgraph.graph.message import add_messages
+from agents.reducers import add_indexed_messages
 
 
 @dataclass
@@ -24,5 +25,8 @@ class ImageState(TypedDict):
 
     query: str  # 사용자 쿼리 또는 요청사항
     response: Annotated[
-        list, add_messages
-    ]  # 응답 메시지 목록 (add_messages로 주석되어 메시지 추가 기능 제공)
+        list, add_indexed_messages
+    ]  # 응답 메시지 목록 (add_indexed_messages로 주석되어 메시지 추가 기능 제공)
+    degraded_nodes: Annotated[
+        list, operator.add
+    ]  # 마감 시각 때문에 대체 응답을 사용하거나 건너뛴 노드 기록
@@ -23,7 +23,7 @@ class ImageWorkflow(BaseWorkflow):
         super().__init__()
         self.state = state
 
-    def build(self):
+    def build(self, checkpointer=None):
         """
         이미지 Workflow 그래프 구축 메서드
 
@@ -31,6 +31,10 @@ class ImageWorkflow(BaseWorkflow):
         현재는 간단한 구조로 시작 노드에서 종료 노드로 직접 연결되어 있으며,
         추후 이미지 생성 노드 등을 추가하여 확장할 수 있습니다.
 
+        Args:
+            checkpointer (BaseCheckpointSaver | None): 실행 상태를 저장할 체크포인터
+                (예: agents.checkpointer.SqliteCheckpointer, 기본값: 저장하지 않음)
+
         Returns:
             CompiledStateGraph: 컴파일된 상태 그래프 객체
         """
@@ -44,7 +48,7 @@ class ImageWorkflow(BaseWorkflow):
         # builder.add_edge("__start__", "image_generation")
         # builder.add_edge("image_generation", "__end__")
 
-        workflow = builder.compile()  # 그래프 컴파일
+        workflow = builder.compile(checkpointer=checkpointer)  # 그래프 컴파일
         workflow.name = self.name  # Workflow 이름 설정
 
         return workflow
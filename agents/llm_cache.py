@@ -0,0 +1,385 @@
+"""LLM 응답 캐시 모듈
+
+모든 체인이 공유하는 LLM 응답 캐시를 제공합니다.
+캐시는 LangChain의 BaseCache 인터페이스를 구현하므로, 체인 코드를 바꾸지 않고 모델 호출 바로 아래에서
+동작합니다. 캐시 키는 렌더링된 프롬프트와 모델 파라미터(모델 이름, temperature, top_p 등)로 만들어집니다.
+
+기본 캐시는 LLM_CACHE_ENABLED=true일 때만 사용하며, LangChain 전역 캐시로 설치하지 않고
+모델 레지스트리(agents.model_registry)가 만드는 모델에만 연결합니다.
+따라서 같은 프로세스의 다른 LangChain 모델에는 영향을 주지 않습니다.
+
+구성:
+1. 인메모리 LRU(TTL 적용): 같은 프로세스에서 반복되는 요청을 밀리초 단위로 반환
+2. 로컬 SQLite 저장소: 프로세스를 재시작해도 캐시가 유지됨
+
+캐시 설정은 환경변수로 변경할 수 있습니다.
+- LLM_CACHE_ENABLED: "true"로 설정하면 기본 캐시를 사용 (기본값: "false", 이미 생성된 모델에는 적용되지 않음)
+- LLM_CACHE_PATH: SQLite 파일 경로 (기본값: ".cache/llm_cache.sqlite")
+- LLM_CACHE_MAX_ENTRIES: 인메모리 LRU 최대 항목 수 (기본값: 1024)
+- LLM_CACHE_TTL: 캐시 유효 시간(초), 0이면 만료 없음 (기본값: 86400)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite")  # 기본 SQLite 경로
+
+_MISSING = object()  # 캐시 미스를 나타내는 센티널 값
+
+
+@dataclass
+class CacheStats:
+    """
+    캐시 적중/미스/제거 횟수를 집계하는 데이터 클래스
+    """
+
+    memory_hits: int = 0  # 인메모리 LRU 적중 횟수
+    disk_hits: int = 0  # SQLite 저장소 적중 횟수
+    misses: int = 0  # 캐시 미스 횟수
+    evictions: int = 0  # 용량 초과로 LRU에서 제거된 항목 수
+    expirations: int = 0  # TTL 만료로 제거된 항목 수
+
+    @property
+    def hits(self) -> int:
+        """전체 적중 횟수"""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """전체 조회 대비 적중 비율"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {**asdict(self), "hits": self.hits, "hit_ratio": self.hit_ratio}
+
+
+class TTLLRUCache:
+    """
+    TTL이 적용된 스레드 안전 LRU 인메모리 저장소
+
+    최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    TTL이 지난 항목은 조회 시점에 제거합니다.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None, stats=None, stats_lock=None):
+        """
+        Args:
+            max_entries (int): 최대 항목 수
+            ttl (float | None): 항목 유효 시간(초), None이면 만료 없음
+            stats (CacheStats | None): 제거/만료 횟수를 기록할 통계 객체
+            stats_lock (threading.Lock | None): 통계 객체를 함께 쓰는 다른 집계와 공유할 잠금
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        self._data = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self._stats_lock = stats_lock or threading.Lock()
+
+    def _count(self, field: str):
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def get(self, key, default=None):
+        """
+        키에 해당하는 값을 반환하고 최근 사용 항목으로 표시합니다.
+
+        Args:
+            key: 조회할 키
+            default: 값이 없거나 만료된 경우 반환할 기본값
+
+        Returns:
+            저장된 값 또는 default
+        """
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            stored_at, value = item
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self._count("expirations")
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, stored_at=None):
+        """
+        값을 저장하고, 최대 항목 수를 넘으면 오래된 항목을 제거합니다.
+
+        Args:
+            key: 저장할 키
+            value: 저장할 값
+            stored_at (float | None): 저장 시각 (디스크에서 승격할 때 원래 시각 유지)
+        """
+        with self._lock:
+            self._data[key] = (stored_at or time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._count("evictions")
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredLLMCache(BaseCache):
+    """
+    인메모리 LRU와 로컬 SQLite 저장소를 계층으로 사용하는 LLM 응답 캐시
+
+    조회는 인메모리 LRU → SQLite 순서로 진행되며, SQLite에서 찾은 항목은 인메모리 LRU로 승격됩니다.
+    SQLite 연결은 처음 조회/저장할 때 생성됩니다.
+
+    예시:
+    ```python
+    from langchain_core.globals import set_llm_cache
+
+    cache = TieredLLMCache(path="/tmp/llm_cache.sqlite", ttl=3600)
+    set_llm_cache(cache)
+    ...
+    print(cache.stats.as_dict())
+    ```
+    """
+
+    def __init__(self, path=None, max_entries=None, ttl=None):
+        """
+        Args:
+            path (str | None): SQLite 파일 경로 (기본값: LLM_CACHE_PATH 또는 DEFAULT_CACHE_PATH)
+            max_entries (int | None): 인메모리 LRU 최대 항목 수 (기본값: LLM_CACHE_MAX_ENTRIES 또는 1024)
+            ttl (float | None): 캐시 유효 시간(초) (기본값: LLM_CACHE_TTL 또는 86400, 0이면 만료 없음)
+        """
+        if ttl is None:
+            ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+        if max_entries is None:
+            max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+        self.path = path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = ttl or None
+        self.stats = CacheStats()
+        # 여러 스레드에서 조회할 때 적중/미스/제거/만료 집계 보호 (인메모리 LRU와 공유)
+        self._stats_lock = threading.Lock()
+        self.memory = TTLLRUCache(max_entries, self.ttl, self.stats, self._stats_lock)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """
+        렌더링된 프롬프트와 모델 파라미터 문자열로 캐시 키를 생성합니다.
+
+        Args:
+            prompt (str): 직렬화된 프롬프트(메시지 목록)
+            llm_string (str): 모델 이름과 파라미터를 직렬화한 문자열
+
+        Returns:
+            str: SHA-256 기반 캐시 키
+        """
+        digest = hashlib.sha256()
+        digest.update(prompt.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(llm_string.encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        """
+        캐시에서 응답을 조회합니다.
+
+        Args:
+            prompt (str): 직렬화된 프롬프트
+            llm_string (str): 모델 파라미터 문자열
+
+        Returns:
+            list[Generation] | None: 캐시된 응답, 없으면 None
+        """
+        key = self.make_key(prompt, llm_string)
+
+        generations = self.memory.get(key, _MISSING)
+        if generations is not _MISSING:
+            self._count("memory_hits")
+            return generations
+
+        row = self._fetch(key)
+        if row is not None:
+            value, created_at = row
+            self.memory.set(key, value, stored_at=created_at)
+            self._count("disk_hits")
+            return value
+
+        self._count("misses")
+        return None
+
+    def _count(self, field: str):
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def get_stats(self) -> dict:
+        """
+        적중/미스/제거 통계를 반환합니다.
+
+        Returns:
+            dict: CacheStats.as_dict() 결과
+        """
+        with self._stats_lock:
+            return self.stats.as_dict()
+
+    def update(self, prompt: str, llm_string: str, return_val):
+        """
+        응답을 인메모리 LRU와 SQLite 저장소에 저장합니다.
+
+        Args:
+            prompt (str): 직렬화된 프롬프트
+            llm_string (str): 모델 파라미터 문자열
+            return_val (list[Generation]): 저장할 응답
+        """
+        key = self.make_key(prompt, llm_string)
+        created_at = time.time()
+        self.memory.set(key, return_val, stored_at=created_at)
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, _dump_generations(return_val), created_at),
+            )
+            conn.commit()
+
+    def clear(self, **kwargs):
+        """
+        인메모리 LRU와 SQLite 저장소의 모든 항목을 제거합니다.
+        """
+        self.memory.clear()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        SQLite 연결을 생성하고 테이블을 준비합니다. (락을 잡은 상태에서 호출)
+        """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _fetch(self, key: str):
+        """
+        SQLite 저장소에서 만료되지 않은 항목을 조회합니다.
+
+        Returns:
+            tuple[list[Generation], float] | None: (응답, 저장 시각), 없으면 None
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._count("expirations")
+                return None
+        return _load_generations(value), created_at
+
+
+def _dump_generations(generations) -> bytes:
+    """
+    응답(Generation 목록)을 압축된 JSON 바이트로 직렬화합니다.
+    """
+    payload = []
+    for generation in generations:
+        item = {"text": generation.text, "info": generation.generation_info}
+        if isinstance(generation, ChatGeneration):
+            item["message"] = message_to_dict(generation.message)
+        payload.append(item)
+    return zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def _load_generations(data: bytes) -> list:
+    """
+    _dump_generations로 직렬화한 바이트를 Generation 목록으로 복원합니다.
+    """
+    generations = []
+    for item in json.loads(zlib.decompress(data)):
+        if "message" in item:
+            (message,) = messages_from_dict([item["message"]])
+            generations.append(
+                ChatGeneration(message=message, generation_info=item["info"])
+            )
+        else:
+            generations.append(
+                Generation(text=item["text"], generation_info=item["info"])
+            )
+    return generations
+
+
+_default_cache = None  # get_default_llm_cache로 생성된 기본 캐시
+_default_lock = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    """기본 LLM 응답 캐시 사용 여부(LLM_CACHE_ENABLED)를 반환합니다."""
+    return os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_default_llm_cache() -> TieredLLMCache | None:
+    """
+    모델 레지스트리가 만드는 모델에 연결할 기본 TieredLLMCache를 반환합니다.
+
+    LLM_CACHE_ENABLED가 "true"일 때만 처음 호출할 때 한 번 생성하며, 꺼져 있으면 None을 반환합니다.
+    (None이면 모델은 langchain_core.globals.set_llm_cache로 직접 설정한 전역 캐시가 있을 때만 캐시를 사용합니다.)
+
+    Returns:
+        TieredLLMCache | None: 기본 캐시
+    """
+    global _default_cache
+    if not llm_cache_enabled():
+        return None
+
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TieredLLMCache()
+    return _default_cache
+
+
+def get_cache_stats() -> dict:
+    """
+    기본 LLM 캐시의 적중/미스/제거 통계를 반환합니다.
+
+    Returns:
+        dict: 통계 딕셔너리 (기본 캐시를 사용하지 않으면 빈 딕셔너리)
+    """
+    cache = _default_cache
+    if cache is None:
+        return {}
+    return cache.get_stats()
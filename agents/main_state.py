@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import operator
 from dataclasses import dataclass
 from typing import Annotated, TypedDict
 
-from langgraph.graph.message import add_messages
+from agents.reducers import add_indexed_messages, merge_domain_responses
 
 
 @dataclass
@@ -20,11 +21,27 @@ class MainState(TypedDict):
         "content_topic": "여름 휴가",
         "content_type": "블로그 글",
         "query": "여름 휴가 계획",
-        "image": "",
+        "domains": ["text", "image"],  # 생략하면 입력값으로 실행할 도메인을 결정
         "response": [],
     }
     ```
     """
 
-    query: str
-    response: Annotated[list, add_messages]
+    query: str  # 사용자 쿼리 또는 요청사항
+    domains: list[str]  # 실행할 도메인 목록 (예: ["text", "management"])
+    content_topic: str  # 콘텐츠의 주제 (Text Workflow 입력)
+    content_type: str  # 콘텐츠의 유형 (Text Workflow 입력)
+    content_types: list[
+        str
+    ]  # 한 번에 처리할 콘텐츠 유형 목록 (Text Workflow 입력, 선택)
+    project_id: str  # 프로젝트 ID (Management Workflow 입력)
+    request_type: str  # 요청 유형 (Management Workflow 입력)
+    team_members: list[str]  # 팀 구성원 목록 (Management Workflow 입력)
+    resources_available: dict  # 사용 가능한 리소스 정보 (Management Workflow 입력)
+    domain_responses: Annotated[
+        dict, merge_domain_responses
+    ]  # 도메인 브랜치별 응답 메시지 목록
+    response: Annotated[list, add_indexed_messages]
+    degraded_nodes: Annotated[
+        list, operator.add
+    ]  # 마감 시각 때문에 대체 응답을 사용하거나 건너뛴 노드 기록
@@ -5,14 +5,16 @@ LCEL(LangChain Expression Language)을 사용하여 체인을 구성합니다.
 
 """
 
-from langchain.schema.runnable import RunnablePassthrough, RunnableSerializable
+from langchain.schema.runnable import Runnable, RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 
+from agents.batching import endpoint_batch_fn, micro_batch
 from agents.management.modules.models import get_openai_model
-from agents.management.modules.prompts import get_resource_planning_prompt
+from agents.management.modules.prompts import RESOURCE_PLANNING
+from agents.prompt_registry import get_prompt
 
 
-def set_resource_planning_chain() -> RunnableSerializable:
+def set_resource_planning_chain() -> Runnable:
     """
     리소스 계획 수립에 사용할 LangChain 체인을 생성합니다.
 
@@ -23,18 +25,20 @@ def set_resource_planning_chain() -> RunnableSerializable:
     3. LLM을 호출하여 리소스 계획 생성 수행
     4. 결과를 문자열로 변환
 
+    팀 구성원이나 사용 가능한 리소스가 너무 커서 프롬프트가 토큰 예산을 넘으면 해당 값을 줄여서 전달합니다.
+
     이 함수는 리소스 관리 노드에서 사용됩니다.
 
     Returns:
-        RunnableSerializable: 실행 가능한 체인 객체
+        Runnable: 실행 가능한 체인 객체
     """
-    # 리소스 계획을 위한 프롬프트 가져오기
-    prompt = get_resource_planning_prompt()
+    # 리소스 계획을 위한 프롬프트 가져오기 (한 번만 컴파일되고, 토큰 예산에 맞게 입력을 줄임)
+    prompt = get_prompt(RESOURCE_PLANNING).runnable
     # OpenAI 모델 가져오기
     model = get_openai_model()
 
     # LCEL을 사용하여 체인 구성
-    return (
+    head = (
         # 입력에서 필요한 필드 추출 및 프롬프트에 전달
         RunnablePassthrough.assign(
             project_id=lambda x: x["project_id"],  # 프로젝트 ID 추출
@@ -46,6 +50,8 @@ def set_resource_planning_chain() -> RunnableSerializable:
             ),  # 가용 리소스 추출
         )
         | prompt  # 프롬프트 적용
-        | model  # LLM 모델 호출
-        | StrOutputParser()  # 결과를 문자열로 변환
     )
+    parser = StrOutputParser()  # 결과를 문자열로 변환
+    chain = head | model | parser  # LLM 모델 호출
+    # 마이크로 배칭이 켜져 있으면 동시 호출을 배치 엔드포인트 요청 하나로 실행
+    return micro_batch(chain, endpoint_batch_fn(head, model, parser))
@@ -9,40 +9,69 @@
 from agents.base_node import BaseNode
 from agents.management.modules.chains import set_resource_planning_chain
 from agents.management.modules.state import ManagementState
+from agents.node_cache import CachePolicy
 
 
 class ResourceManagementNode(BaseNode):
     """
     프로젝트에 필요한 리소스를 계획하고 관리하는 노드
+
+    그래프를 stream_mode="messages"로 실행하면 LLM 토큰이 생성되는 즉시 스트리밍되며,
+    완성된 전체 계획은 resource_plan과 response에 담깁니다.
+    계획은 체인 입력(get_chain_input)에 사용하는 상태 키에만 의존하므로 같은 입력이면 이전 결과를 재사용합니다.
     """
 
+    # 리소스 계획이 의존하는 상태 키
+    cache_keys = (
+        "project_id",
+        "request_type",
+        "query",
+        "team_members",
+        "resources_available",
+    )
+    cache_policy = CachePolicy(ttl=600)  # 가용 리소스가 자주 바뀌므로 짧게 유지
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)  # BaseNode 초기화
         self.chain = set_resource_planning_chain()  # 리소스 계획 체인 설정
 
-    def execute(self, state: ManagementState) -> dict:
+    def get_chain_input(self, state: ManagementState) -> dict:
         """
-        주어진 상태(state)에서 project_id, request_type, query 등의 정보를 추출하여
-        리소스 계획 체인에 전달하고, 결과를 응답으로 반환합니다.
+        상태(state)에서 리소스 계획 체인에 전달할 입력을 구성합니다.
         """
         # 팀 구성원 기본값 처리
         team_members = state.get("team_members", [])
 
+        return {
+            "project_id": state["project_id"],  # 프로젝트 ID
+            "request_type": state["request_type"],  # 요청 유형
+            "query": state["query"],  # 사용자 쿼리
+            "team_members": team_members,  # 팀 구성원
+            "resources_available": state.get(
+                "resources_available", {}
+            ),  # 사용 가능한 리소스
+        }
+
+    def build_update(self, state: ManagementState, output: str) -> dict:
+        """
+        생성된 리소스 계획으로 상태 업데이트를 구성합니다.
+        """
+        # 생성된 리소스 계획을 resource_plan과 응답에 함께 반환
+        return {"resource_plan": output, "response": output}
+
+    def execute(self, state: ManagementState) -> dict:
+        """
+        주어진 상태(state)에서 project_id, request_type, query 등의 정보를 추출하여
+        리소스 계획 체인에 전달하고, 결과를 응답으로 반환합니다.
+        """
         # 리소스 계획 체인 실행
-        resource_plan = self.chain.invoke(
-            {
-                "project_id": state["project_id"],  # 프로젝트 ID
-                "request_type": state["request_type"],  # 요청 유형
-                "query": state["query"],  # 사용자 쿼리
-                "team_members": team_members,  # 팀 구성원
-                "resources_available": state.get(
-                    "resources_available", {}
-                ),  # 사용 가능한 리소스
-            }
-        )
-
-        # 상태 업데이트
-        state["resource_plan"] = resource_plan
-
-        # 생성된 리소스 계획을 응답으로 반환
-        return {"response": resource_plan}
+        resource_plan = self.chain.invoke(self.get_chain_input(state))
+        return self.build_update(state, resource_plan)
+
+    async def aexecute(self, state: ManagementState) -> dict:
+        """
+        execute의 비동기 버전으로, chain.ainvoke를 사용하여 이벤트 루프를 막지 않습니다.
+        """
+        # 리소스 계획 체인 비동기 실행
+        resource_plan = await self.chain.ainvoke(self.get_chain_input(state))
+        return self.build_update(state, resource_plan)
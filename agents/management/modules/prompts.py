@@ -3,13 +3,25 @@
 프롬프트 템플릿을 생성하는 함수 모듈을 구성합니다.
 기본적으로 PromptTemplate를 사용하여 프롬프트 템플릿을 생성하고 반환합니다.
 
+프롬프트는 두 가지 레이아웃을 지원합니다.
+- 정적 접두부 레이아웃(기본값): 모든 요청에서 동일한 지시문을 앞에, 요청마다 달라지는 입력을 뒤에 배치하여
+  LLM 제공자의 프롬프트 접두부 캐시(prefix caching)가 적중하도록 합니다.
+- 교차 레이아웃: 입력과 지시문이 섞여 있는 기존 레이아웃입니다.
+
+체인은 agents.prompt_registry에 등록된 프롬프트(get_prompt)를 사용하며, 토큰 예산을 넘으면
+사용 가능한 리소스 → 팀 구성원 → 사용자 쿼리 순서로 값을 줄입니다.
+
 아래는 예시입니다.
 """
 
 from langchain_core.prompts import PromptTemplate
 
+from agents.prompt_registry import PromptBudget, register_prompt
+
+RESOURCE_PLANNING = "resource_planning"  # 리소스 계획 프롬프트의 레지스트리 이름
 
-def get_resource_planning_prompt():
+
+def get_resource_planning_prompt(static_prefix=True):
     """
     리소스 계획 수립을 위한 프롬프트 템플릿을 생성합니다.
 
@@ -23,23 +35,17 @@ def get_resource_planning_prompt():
     프롬프트는 LLM에게 주어진 정보를 기반으로 프로젝트 관리에 적합한 리소스 계획을
     수립하도록 지시합니다. 결과는 한국어로 반환됩니다.
 
+    static_prefix가 True이면 지시문을 앞에, 프로젝트 정보를 뒤에 배치하여
+    요청마다 달라지는 값이 프롬프트의 가장 마지막에 오도록 합니다.
+
+    Args:
+        static_prefix (bool): 정적 접두부/동적 접미부 레이아웃 사용 여부 (기본값: True)
+
     Returns:
         PromptTemplate: 리소스 계획 수립을 위한 프롬프트 템플릿 객체
     """
-    # 리소스 계획을 위한 프롬프트 템플릿 정의
-    resource_planning_template = """You are an expert entertainment project manager tasked with creating resource plans for entertainment projects. You are provided with the following information:  
-
-1. Project ID: {project_id}  
-
-2. Request Type: {request_type}  
-
-3. User Query: {query}  
-
-4. Team Members: {team_members}  
-
-5. Available Resources: {resources_available}  
-
-Your Task:  
+    # 모든 요청에서 동일한 지시문
+    instructions = """Your Task:  
 Based on the information provided, develop a comprehensive resource management plan that addresses the user query. Your plan should include:  
 
 1. PROJECT OVERVIEW:  
@@ -71,7 +77,35 @@ Make your plan specific to the entertainment industry context and the particular
 
 All responses must be in Korean.  
 
-Resource Management Plan:"""
+"""
+
+    # 요청마다 달라지는 프로젝트 정보
+    project_information = """1. Project ID: {project_id}  
+
+2. Request Type: {request_type}  
+
+3. User Query: {query}  
+
+4. Team Members: {team_members}  
+
+5. Available Resources: {resources_available}  
+
+"""
+
+    # 리소스 계획을 위한 프롬프트 템플릿 정의
+    role = "You are an expert entertainment project manager tasked with creating resource plans for entertainment projects."
+    if static_prefix:
+        # 정적 접두부 레이아웃: 역할 → 지시문 → 프로젝트 정보
+        resource_planning_template = (
+            f"{role}  \n\n{instructions}Project Information:  \n\n"
+            f"{project_information}Resource Management Plan:"
+        )
+    else:
+        # 교차 레이아웃: 역할 → 프로젝트 정보 → 지시문
+        resource_planning_template = (
+            f"{role} You are provided with the following information:  \n\n"
+            f"{project_information}{instructions}Resource Management Plan:"
+        )
 
     # PromptTemplate 객체 생성 및 반환
     return PromptTemplate(
@@ -84,3 +118,14 @@ Resource Management Plan:"""
             "resources_available",
         ],  # 프롬프트에 삽입될 변수들
     )
+
+
+# 프롬프트 레지스트리 등록 (토큰 예산을 넘으면 큰 입력부터 줄임)
+register_prompt(
+    RESOURCE_PLANNING,
+    get_resource_planning_prompt,
+    PromptBudget(
+        max_tokens=4096,
+        priority=("resources_available", "team_members", "query"),
+    ),
+)
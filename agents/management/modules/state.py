@@ -4,10 +4,11 @@
 
 from __future__ import annotations
 
+import operator
 from dataclasses import dataclass
 from typing import Annotated, TypedDict, List, Dict, Optional
 
-from langgraph.graph.message import add_messages
+from agents.reducers import add_indexed_messages
 
 
 @dataclass
@@ -22,9 +23,13 @@ class ManagementState(TypedDict):
     project_id: str  # 프로젝트 ID (예: "PRJ-2023-001", "EP-MARVEL-S01")
     request_type: str  # 요청 유형 (예: "resource_allocation", "team_management", "creator_development")
     query: str  # 사용자 쿼리 또는 요청사항
+    response: Annotated[
+        list, add_indexed_messages
+    ]  # 응답 메시지 목록 (add_indexed_messages로 주석되어 메시지 추가 기능 제공)
+    degraded_nodes: Annotated[
+        list, operator.add
+    ]  # 마감 시각 때문에 대체 응답을 사용하거나 건너뛴 노드 기록
+    # 기본값이 있는 필드는 dataclass 규칙에 따라 기본값이 없는 필드 뒤에 선언합니다.
     team_members: Optional[List[str]] = None  # 팀 구성원 목록
     resources_available: Optional[Dict[str, any]] = None  # 사용 가능한 리소스 정보
     resource_plan: Optional[str] = None  # 리소스 계획 콘텐츠
-    response: Annotated[
-        list, add_messages
-    ]  # 응답 메시지 목록 (add_messages로 주석되어 메시지 추가 기능 제공)
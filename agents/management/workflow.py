@@ -17,7 +17,7 @@ class ManagementWorkflow(BaseWorkflow):
         super().__init__()
         self.state = state
 
-    def build(self):
+    def build(self, checkpointer=None):
         """
         관리 Workflow 그래프 구축 메서드
 
@@ -25,6 +25,10 @@ class ManagementWorkflow(BaseWorkflow):
         현재는 리소스 관리 노드를 포함하고 있으며, 추후 조건부 에지를 추가하여
         다양한 경로를 가진 Workflow를 구축할 수 있습니다.
 
+        Args:
+            checkpointer (BaseCheckpointSaver | None): 실행 상태를 저장할 체크포인터
+                (예: agents.checkpointer.SqliteCheckpointer, 기본값: 저장하지 않음)
+
         Returns:
             CompiledStateGraph: 컴파일된 상태 그래프 객체
         """
@@ -44,7 +48,7 @@ class ManagementWorkflow(BaseWorkflow):
         #     router,
         # )
 
-        workflow = builder.compile()  # 그래프 컴파일
+        workflow = builder.compile(checkpointer=checkpointer)  # 그래프 컴파일
         workflow.name = self.name  # Workflow 이름 설정
 
         return workflow
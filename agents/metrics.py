@@ -0,0 +1,670 @@
+"""노드별 LLM 사용량 및 실행 지표 텔레메트리 모듈
+
+LLM 제공자가 응답의 usage metadata로 돌려주는 토큰 사용량을 노드별로 집계합니다.
+특히 프롬프트 접두부 캐시(prefix caching)로 처리된 입력 토큰 수(cached tokens)를 함께 기록하여,
+부하 상황에서 접두부 캐시 적중률을 확인할 수 있습니다.
+
+사용량은 모델 레지스트리가 모든 모델에 등록하는 USAGE_CALLBACK을 통해 수집되며,
+현재 실행 중인 노드 이름은 BaseNode가 track_node()로 설정합니다.
+
+노드 실행 지표(NODE_METRICS_ENABLED=true 또는 enable_metrics())를 켜면 (Workflow, 노드)별로
+실행 시간 히스토그램, 첫 토큰까지의 시간(TTFT) 히스토그램, 프롬프트/완성 토큰 수, 예외 수를
+프로세스 내 레지스트리에 기록하며, Prometheus 텍스트 형식이나 JSONL로 내보낼 수 있습니다.
+지표가 꺼져 있으면 노드 실행마다 플래그 확인 한 번만 추가됩니다.
+
+노드 결과 메모이제이션(agents.node_cache)의 노드별 적중률은 get_node_cache_usage()로 확인할 수 있습니다.
+
+메인 Workflow의 로컬 라우터(agents.conditions)가 내린 결정은 결정 방식(rule, classifier, llm, unsure 등)별로
+get_route_usage()에 집계되어, 규칙과 분류기 임계값을 조정하는 데 사용할 수 있습니다.
+
+LLM 요청 헤징(agents.hedging)을 켜면 노드별 헤징 비율, 중복 요청 승률, 추가 토큰 사용량도
+get_hedge_usage()와 export_prometheus()로 확인할 수 있습니다.
+
+예시:
+```python
+from agents.metrics import enable_metrics, export_prometheus, get_node_usage
+
+print(get_node_usage())
+# {"PersonaExtractionNode": {"calls": 3, "input_tokens": 2400, "cached_tokens": 1536, ...}}
+
+enable_metrics()
+text_workflow().invoke(state)
+print(export_prometheus())
+# agent_node_latency_seconds_bucket{workflow="TextWorkflow",node="PersonaExtractionNode",le="0.5"} 0
+```
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+UNKNOWN_NODE = "unknown"  # 노드 밖에서 호출된 LLM 사용량을 기록할 이름
+UNKNOWN_WORKFLOW = "unknown"  # Workflow에 속하지 않은 노드를 기록할 이름
+
+# 실행 시간/TTFT 히스토그램 버킷 상한(초) (Prometheus 기본 버킷에 LLM 호출용 긴 구간 추가)
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_current_node = ContextVar("current_node", default=UNKNOWN_NODE)
+_current_run = ContextVar("current_run", default=None)  # 지표를 기록 중인 NodeMetrics
+_enabled = os.getenv("NODE_METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class TokenUsage:
+    """
+    노드 하나의 LLM 토큰 사용량을 집계하는 데이터 클래스
+    """
+
+    calls: int = 0  # LLM 호출 횟수
+    input_tokens: int = 0  # 입력(프롬프트) 토큰 수
+    cached_tokens: int = 0  # 입력 토큰 중 제공자 접두부 캐시로 처리된 토큰 수
+    output_tokens: int = 0  # 출력(완성) 토큰 수
+    cache_hit_calls: int = 0  # 접두부 캐시가 한 번이라도 적중한 호출 수
+
+    @property
+    def cached_token_ratio(self) -> float:
+        """입력 토큰 중 캐시로 처리된 토큰 비율"""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """전체 호출 중 접두부 캐시가 적중한 호출 비율"""
+        return self.cache_hit_calls / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {
+            **asdict(self),
+            "cached_token_ratio": self.cached_token_ratio,
+            "cache_hit_rate": self.cache_hit_rate,
+        }
+
+
+@dataclass
+class HedgeUsage:
+    """
+    노드 하나의 LLM 요청 헤징(hedged request) 결과를 집계하는 데이터 클래스
+    """
+
+    requests: int = 0  # 헤징 대상 LLM 요청 수
+    hedged: int = 0  # 첫 응답이 늦어 중복 요청을 보낸 수
+    hedge_wins: int = 0  # 중복 요청이 원래 요청보다 먼저 응답한 수
+    extra_tokens: int = 0  # 중복 요청으로 추가 사용한 프롬프트 토큰 수 (추정)
+
+    @property
+    def hedge_rate(self) -> float:
+        """전체 요청 중 중복 요청을 보낸 비율"""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """중복 요청 중 원래 요청보다 먼저 응답한 비율"""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {
+            **asdict(self),
+            "hedge_rate": self.hedge_rate,
+            "win_rate": self.win_rate,
+        }
+
+
+@dataclass
+class NodeCacheUsage:
+    """
+    노드 하나의 결과 메모이제이션 적중/미스 횟수를 집계하는 데이터 클래스
+    """
+
+    hits: int = 0  # 저장된 결과를 재사용한 횟수
+    misses: int = 0  # 노드를 실행한 횟수
+
+    @property
+    def hit_ratio(self) -> float:
+        """전체 조회 대비 적중 비율"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+@dataclass
+class RouteUsage:
+    """
+    라우팅 결정 방식 하나의 결정 횟수와 도메인별 선택 횟수를 집계하는 데이터 클래스
+    """
+
+    decisions: int = 0  # 결정 횟수
+    domains: dict = field(default_factory=dict)  # 도메인 이름 -> 선택 횟수
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {"decisions": self.decisions, "domains": dict(self.domains)}
+
+
+_usage = {}  # 노드 이름 -> TokenUsage
+_hedges = {}  # 노드 이름 -> HedgeUsage
+_node_caches = {}  # 노드 이름 -> NodeCacheUsage
+_routes = {}  # 라우팅 결정 방식 -> RouteUsage
+_lock = threading.Lock()
+
+
+@dataclass
+class Histogram:
+    """
+    누적 버킷 방식(Prometheus histogram)의 히스토그램
+    """
+
+    buckets: tuple = LATENCY_BUCKETS  # 버킷 상한(초)
+    counts: list = None  # 버킷별 관측 수 (마지막은 +Inf)
+    total: float = 0.0  # 관측값의 합
+    count: int = 0  # 관측 수
+
+    def __post_init__(self):
+        if self.counts is None:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float):
+        """관측값 하나를 기록합니다."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """(버킷 상한, 누적 관측 수) 목록을 반환합니다. 마지막 상한은 "+Inf"입니다."""
+        result, running = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def as_dict(self) -> dict:
+        """히스토그램을 딕셔너리로 반환합니다."""
+        return {
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+            "sum": self.total,
+            "count": self.count,
+        }
+
+
+@dataclass
+class NodeMetrics:
+    """
+    (Workflow, 노드) 하나의 실행 지표를 집계하는 데이터 클래스
+    """
+
+    workflow: str
+    node: str
+    calls: int = 0  # 노드 실행 횟수
+    prompt_tokens: int = 0  # 노드 안의 LLM 호출 프롬프트 토큰 수
+    completion_tokens: int = 0  # 노드 안의 LLM 호출 완성 토큰 수
+    errors: dict = field(default_factory=dict)  # 예외 클래스 이름 -> 발생 횟수
+    latency: Histogram = field(default_factory=Histogram)  # 노드 실행 시간(초)
+    ttft: Histogram = field(default_factory=Histogram)  # LLM 첫 토큰까지의 시간(초)
+
+    def as_dict(self) -> dict:
+        """집계 결과를 딕셔너리로 반환합니다."""
+        return {
+            "workflow": self.workflow,
+            "node": self.node,
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_seconds": self.latency.as_dict(),
+            "ttft_seconds": self.ttft.as_dict(),
+        }
+
+
+_node_metrics = {}  # (Workflow 이름, 노드 이름) -> NodeMetrics
+_llm_starts = {}  # LLM 실행 ID -> (NodeMetrics, 시작 시각)
+
+
+def enable_metrics(enabled: bool = True):
+    """
+    노드 실행 지표 기록을 켜거나 끕니다.
+
+    Args:
+        enabled (bool): 지표 기록 여부 (기본값: True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    """노드 실행 지표 기록 여부를 반환합니다."""
+    return _enabled
+
+
+def _get_node_metrics(workflow: str, node: str) -> NodeMetrics:
+    key = (workflow, node)
+    metrics = _node_metrics.get(key)
+    if metrics is None:
+        with _lock:
+            metrics = _node_metrics.setdefault(key, NodeMetrics(workflow, node))
+    return metrics
+
+
+@contextmanager
+def track_node(name: str, workflow: str | None = None):
+    """
+    블록 안에서 발생한 LLM 호출을 주어진 노드 이름으로 집계하도록 설정합니다.
+
+    노드 실행 지표가 켜져 있으면 블록의 실행 시간과 예외도 (Workflow, 노드)별로 기록합니다.
+
+    Args:
+        name (str): 노드 이름
+        workflow (str | None): 노드가 속한 Workflow 이름
+    """
+    token = _current_node.set(name)
+    if not _enabled:
+        try:
+            yield
+        finally:
+            _current_node.reset(token)
+        return
+
+    metrics = _get_node_metrics(workflow or UNKNOWN_WORKFLOW, name)
+    run_token = _current_run.set(metrics)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_run.reset(run_token)
+        _current_node.reset(token)
+        with _lock:
+            metrics.calls += 1
+            metrics.latency.observe(elapsed)
+            if error is not None:
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+
+
+def current_node() -> str:
+    """
+    현재 실행 중인 노드 이름을 반환합니다.
+
+    Returns:
+        str: 노드 이름 (노드 밖이면 UNKNOWN_NODE)
+    """
+    return _current_node.get()
+
+
+def record_usage(node: str, usage_metadata: dict):
+    """
+    LLM 응답의 usage metadata를 노드별 사용량에 더합니다.
+
+    Args:
+        node (str): 노드 이름
+        usage_metadata (dict): LangChain UsageMetadata 형식의 토큰 사용량
+    """
+    details = usage_metadata.get("input_token_details") or {}
+    cached_tokens = details.get("cache_read") or 0
+
+    with _lock:
+        usage = _usage.setdefault(node, TokenUsage())
+        usage.calls += 1
+        usage.input_tokens += usage_metadata.get("input_tokens") or 0
+        usage.output_tokens += usage_metadata.get("output_tokens") or 0
+        usage.cached_tokens += cached_tokens
+        usage.cache_hit_calls += 1 if cached_tokens else 0
+
+        metrics = _current_run.get()
+        if metrics is not None:
+            metrics.prompt_tokens += usage_metadata.get("input_tokens") or 0
+            metrics.completion_tokens += usage_metadata.get("output_tokens") or 0
+
+
+def get_node_usage(node: str | None = None) -> dict:
+    """
+    노드별 토큰 사용량과 접두부 캐시 적중률을 반환합니다.
+
+    Args:
+        node (str | None): 조회할 노드 이름 (None이면 모든 노드)
+
+    Returns:
+        dict: node가 주어지면 해당 노드의 사용량, 아니면 {노드 이름: 사용량} 딕셔너리
+    """
+    with _lock:
+        if node is not None:
+            return _usage.get(node, TokenUsage()).as_dict()
+        return {name: usage.as_dict() for name, usage in _usage.items()}
+
+
+def record_hedge(node: str, hedged: bool, won: bool = False, extra_tokens: int = 0):
+    """
+    헤징 대상 LLM 요청 하나의 결과를 노드별로 기록합니다.
+
+    Args:
+        node (str): 노드 이름
+        hedged (bool): 중복 요청을 보냈는지 여부
+        won (bool): 중복 요청이 먼저 응답했는지 여부
+        extra_tokens (int): 중복 요청으로 추가 사용한 프롬프트 토큰 수
+    """
+    with _lock:
+        usage = _hedges.setdefault(node, HedgeUsage())
+        usage.requests += 1
+        usage.hedged += 1 if hedged else 0
+        usage.hedge_wins += 1 if won else 0
+        usage.extra_tokens += extra_tokens
+
+
+def get_hedge_usage(node: str | None = None) -> dict:
+    """
+    노드별 헤징 비율, 중복 요청 승률, 추가 토큰 사용량을 반환합니다.
+
+    Args:
+        node (str | None): 조회할 노드 이름 (None이면 모든 노드)
+
+    Returns:
+        dict: node가 주어지면 해당 노드의 집계, 아니면 {노드 이름: 집계} 딕셔너리
+    """
+    with _lock:
+        if node is not None:
+            return _hedges.get(node, HedgeUsage()).as_dict()
+        return {name: usage.as_dict() for name, usage in _hedges.items()}
+
+
+def record_node_cache(node: str, hit: bool):
+    """
+    노드 결과 메모이제이션 조회 결과를 노드별로 기록합니다.
+
+    Args:
+        node (str): 노드 이름
+        hit (bool): 저장된 결과를 재사용했는지 여부
+    """
+    with _lock:
+        usage = _node_caches.setdefault(node, NodeCacheUsage())
+        if hit:
+            usage.hits += 1
+        else:
+            usage.misses += 1
+
+
+def get_node_cache_usage(node: str | None = None) -> dict:
+    """
+    노드별 결과 메모이제이션 적중/미스 횟수와 적중률을 반환합니다.
+
+    Args:
+        node (str | None): 조회할 노드 이름 (None이면 모든 노드)
+
+    Returns:
+        dict: node가 주어지면 해당 노드의 집계, 아니면 {노드 이름: 집계} 딕셔너리
+    """
+    with _lock:
+        if node is not None:
+            return _node_caches.get(node, NodeCacheUsage()).as_dict()
+        return {name: usage.as_dict() for name, usage in _node_caches.items()}
+
+
+def record_route(source: str, domains):
+    """
+    라우팅 결정을 결정 방식별로 기록합니다.
+
+    Args:
+        source (str): 결정 방식 (예: "rule", "classifier", "llm", "unsure")
+        domains (Iterable[str]): 선택한 도메인 목록
+    """
+    with _lock:
+        usage = _routes.setdefault(source, RouteUsage())
+        usage.decisions += 1
+        for domain in domains:
+            usage.domains[domain] = usage.domains.get(domain, 0) + 1
+
+
+def get_route_usage(source: str | None = None) -> dict:
+    """
+    결정 방식별 라우팅 결정 횟수와 도메인별 선택 횟수를 반환합니다.
+
+    Args:
+        source (str | None): 조회할 결정 방식 (None이면 모든 방식)
+
+    Returns:
+        dict: source가 주어지면 해당 방식의 집계, 아니면 {결정 방식: 집계} 딕셔너리
+    """
+    with _lock:
+        if source is not None:
+            return _routes.get(source, RouteUsage()).as_dict()
+        return {name: usage.as_dict() for name, usage in _routes.items()}
+
+
+def reset_usage():
+    """집계된 사용량(헤징, 노드 메모이제이션, 라우팅 집계 포함)을 모두 초기화합니다."""
+    with _lock:
+        _usage.clear()
+        _hedges.clear()
+        _node_caches.clear()
+        _routes.clear()
+
+
+def get_node_metrics() -> list[dict]:
+    """
+    (Workflow, 노드)별 실행 지표를 반환합니다.
+
+    Returns:
+        list[dict]: NodeMetrics.as_dict() 목록
+    """
+    with _lock:
+        return [metrics.as_dict() for metrics in _node_metrics.values()]
+
+
+def reset_metrics():
+    """기록된 노드 실행 지표를 모두 초기화합니다."""
+    with _lock:
+        _node_metrics.clear()
+        _llm_starts.clear()
+
+
+def _labels(**labels) -> str:
+    """Prometheus 레이블 문자열을 만듭니다. (역슬래시와 큰따옴표는 이스케이프)"""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def export_prometheus() -> str:
+    """
+    노드 실행 지표를 Prometheus 텍스트 노출 형식으로 반환합니다.
+
+    Returns:
+        str: Prometheus 텍스트 형식의 지표
+    """
+    with _lock:
+        snapshot = [metrics.as_dict() for metrics in _node_metrics.values()]
+        hedges = {node: usage.as_dict() for node, usage in _hedges.items()}
+        node_caches = {node: usage.as_dict() for node, usage in _node_caches.items()}
+        routes = {source: usage.as_dict() for source, usage in _routes.items()}
+
+    lines = []
+    counters = (
+        ("calls", "agent_node_calls_total", "Number of node executions"),
+        (
+            "prompt_tokens",
+            "agent_node_prompt_tokens_total",
+            "Prompt tokens used by node",
+        ),
+        (
+            "completion_tokens",
+            "agent_node_completion_tokens_total",
+            "Completion tokens used by node",
+        ),
+    )
+    for key, name, help_text in counters:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for metrics in snapshot:
+            labels = _labels(workflow=metrics["workflow"], node=metrics["node"])
+            lines.append(f"{name}{labels} {metrics[key]}")
+
+    name = "agent_node_errors_total"
+    lines += [f"# HELP {name} Node executions that raised", f"# TYPE {name} counter"]
+    for metrics in snapshot:
+        for error, count in metrics["errors"].items():
+            labels = _labels(
+                workflow=metrics["workflow"], node=metrics["node"], error=error
+            )
+            lines.append(f"{name}{labels} {count}")
+
+    histograms = (
+        ("latency_seconds", "agent_node_latency_seconds", "Node wall time"),
+        ("ttft_seconds", "agent_node_ttft_seconds", "Time to first LLM token"),
+    )
+    for key, name, help_text in histograms:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for metrics in snapshot:
+            histogram = metrics[key]
+            for bound, count in histogram["buckets"].items():
+                labels = _labels(
+                    workflow=metrics["workflow"], node=metrics["node"], le=bound
+                )
+                lines.append(f"{name}_bucket{labels} {count}")
+            labels = _labels(workflow=metrics["workflow"], node=metrics["node"])
+            lines.append(f"{name}_sum{labels} {histogram['sum']}")
+            lines.append(f"{name}_count{labels} {histogram['count']}")
+
+    hedge_counters = (
+        (
+            "requests",
+            "agent_llm_hedge_requests_total",
+            "LLM requests eligible for hedging",
+        ),
+        ("hedged", "agent_llm_hedged_total", "Duplicate requests sent"),
+        ("hedge_wins", "agent_llm_hedge_wins_total", "Duplicate requests that won"),
+        (
+            "extra_tokens",
+            "agent_llm_hedge_extra_tokens_total",
+            "Estimated prompt tokens spent on duplicates",
+        ),
+    )
+    for key, name, help_text in hedge_counters:
+        if not hedges:
+            break
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for node, usage in hedges.items():
+            lines.append(f"{name}{_labels(node=node)} {usage[key]}")
+
+    node_cache_counters = (
+        ("hits", "agent_node_cache_hits_total", "Node results reused from cache"),
+        ("misses", "agent_node_cache_misses_total", "Node executions on cache miss"),
+    )
+    for key, name, help_text in node_cache_counters:
+        if not node_caches:
+            break
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for node, usage in node_caches.items():
+            lines.append(f"{name}{_labels(node=node)} {usage[key]}")
+
+    if routes:
+        name = "agent_route_decisions_total"
+        lines += [f"# HELP {name} Routing decisions", f"# TYPE {name} counter"]
+        for source, usage in routes.items():
+            lines.append(f"{name}{_labels(source=source)} {usage['decisions']}")
+        name = "agent_route_domains_total"
+        lines += [
+            f"# HELP {name} Domains selected by routing",
+            f"# TYPE {name} counter",
+        ]
+        for source, usage in routes.items():
+            for domain, count in usage["domains"].items():
+                lines.append(f"{name}{_labels(source=source, domain=domain)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def export_jsonl(path: str | None = None) -> str:
+    """
+    노드 실행 지표를 (Workflow, 노드)당 한 줄의 JSONL로 반환합니다.
+
+    Args:
+        path (str | None): 지정하면 해당 파일 끝에 기록 시각과 함께 추가합니다.
+
+    Returns:
+        str: JSONL 형식의 지표
+    """
+    timestamp = time.time()
+    lines = [
+        json.dumps({"timestamp": timestamp, **metrics}, ensure_ascii=False)
+        for metrics in get_node_metrics()
+    ]
+    text = "".join(line + "\n" for line in lines)
+    if path is not None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """
+    LLM 호출이 끝날 때 usage metadata를 현재 노드의 사용량으로 기록하는 콜백 핸들러
+
+    노드 실행 지표가 켜져 있으면 스트리밍 호출의 첫 토큰까지의 시간(TTFT)도 기록합니다.
+
+    컨텍스트 변수로 현재 노드를 알아내기 때문에 호출한 컨텍스트에서 바로 실행되도록
+    run_inline을 사용합니다.
+    """
+
+    run_inline = True
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        metrics = _current_run.get()
+        if metrics is not None:  # 지표가 켜져 있을 때만 TTFT 측정
+            _llm_starts[run_id] = (metrics, time.perf_counter())
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        started = _llm_starts.pop(run_id, None)  # 첫 토큰에서만 기록
+        if started is not None:
+            metrics, start = started
+            with _lock:
+                metrics.ttft.observe(time.perf_counter() - start)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        _llm_starts.pop(run_id, None)
+
+    def on_llm_end(self, response, *, run_id=None, **kwargs):
+        _llm_starts.pop(run_id, None)
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage_metadata = getattr(message, "usage_metadata", None)
+                if usage_metadata and not _from_llm_cache(usage_metadata):
+                    record_usage(current_node(), usage_metadata)
+
+
+def _from_llm_cache(usage_metadata: dict) -> bool:
+    """
+    LLM 응답 캐시에서 가져온 응답인지 확인합니다.
+
+    LangChain은 캐시에서 가져온 응답의 usage_metadata에 total_cost=0을 넣습니다.
+    이 응답의 토큰 수는 제공자에 요청하지 않은 값이므로 사용량으로 집계하지 않습니다.
+    """
+    return usage_metadata.get("total_cost") == 0
+
+
+USAGE_CALLBACK = UsageCallbackHandler()  # 모델 레지스트리가 모든 모델에 등록하는 콜백
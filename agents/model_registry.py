@@ -0,0 +1,240 @@
+"""공유 모델 클라이언트 레지스트리 모듈
+
+프로세스 전체에서 사용할 LLM 클라이언트를 (model, temperature, top_p, base_url) 조합별로
+한 번만 생성하여 공유합니다. 모든 클라이언트는 하나의 동기/비동기 httpx 커넥션 풀을 함께 사용하므로
+TLS 핸드셰이크와 커넥션 설정이 체인마다가 아니라 프로세스당 한 번만 일어나고,
+keep-alive 커넥션이 도메인(text, music, management 등) 간에 재사용됩니다.
+
+커넥션 풀 크기는 환경변수 또는 configure_pool()로 설정할 수 있습니다.
+- LLM_POOL_MAX_CONNECTIONS: 최대 동시 커넥션 수 (기본값: 100)
+- LLM_POOL_MAX_KEEPALIVE: 유지할 keep-alive 커넥션 수 (기본값: 20)
+- LLM_POOL_KEEPALIVE_EXPIRY: keep-alive 커넥션 유지 시간(초) (기본값: 30)
+
+공유 클라이언트의 transport는 LLM 호출 녹화/재생(agents.cassette), 동시 요청 합치기(agents.coalescing),
+노드 마감 시각(agents.deadline), 요청 헤징(agents.hedging), 프로세스 전체 속도 제한(agents.rate_limiter)을
+차례로 거쳐 실제 커넥션 풀로 연결됩니다. 재생된 응답과 합쳐진 요청은 속도 제한 예산을 쓰지 않고,
+헤징으로 보낸 중복 요청은 예산을 사용합니다.
+
+비동기 커넥션은 생성한 이벤트 루프에 묶여 있으므로, 비동기 클라이언트는 이벤트 루프마다 별도의 커넥션 풀을
+사용합니다(LoopLocalAsyncTransport). asyncio.run()을 여러 번 호출해도 닫힌 루프의 커넥션을 재사용하지 않습니다.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from agents.cassette import AsyncCassetteTransport, CassetteTransport
+from agents.coalescing import AsyncCoalescingTransport, CoalescingTransport
+from agents.deadline import AsyncDeadlineTransport, DeadlineTransport
+from agents.hedging import AsyncHedgedTransport, HedgedTransport
+from agents.llm_cache import get_default_llm_cache
+from agents.metrics import USAGE_CALLBACK
+from agents.rate_limiter import AsyncRateLimitedTransport, RateLimitedTransport
+
+DEFAULT_MODEL = "gpt-4o-mini"  # 기본으로 사용할 모델 이름
+
+_lock = threading.RLock()
+_models = {}  # (model, temperature, top_p, base_url) -> ChatOpenAI
+_http_clients = None  # (httpx.Client, httpx.AsyncClient)
+_pool_limits = None  # httpx.Limits
+
+
+def get_pool_limits() -> httpx.Limits:
+    """
+    공유 커넥션 풀의 크기 제한을 반환합니다.
+
+    configure_pool()로 설정하지 않았다면 환경변수 값(없으면 기본값)을 사용합니다.
+
+    Returns:
+        httpx.Limits: 커넥션 풀 제한 설정
+    """
+    global _pool_limits
+    if _pool_limits is None:
+        _pool_limits = httpx.Limits(
+            max_connections=int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30")),
+        )
+    return _pool_limits
+
+
+def configure_pool(
+    max_connections=None, max_keepalive_connections=None, keepalive_expiry=None
+):
+    """
+    공유 커넥션 풀의 크기 제한을 변경합니다.
+
+    이미 생성된 클라이언트와 모델은 닫히고 레지스트리가 초기화되므로,
+    이후 get_chat_model() 호출부터 새 설정이 적용됩니다.
+    (이미 컴파일된 그래프가 있다면 workflow.invalidate()로 다시 빌드해야 합니다.)
+
+    Args:
+        max_connections (int | None): 최대 동시 커넥션 수
+        max_keepalive_connections (int | None): 유지할 keep-alive 커넥션 수
+        keepalive_expiry (float | None): keep-alive 커넥션 유지 시간(초)
+    """
+    global _pool_limits
+    with _lock:
+        current = get_pool_limits()
+        if max_connections is None:
+            max_connections = current.max_connections
+        if max_keepalive_connections is None:
+            max_keepalive_connections = current.max_keepalive_connections
+        if keepalive_expiry is None:
+            keepalive_expiry = current.keepalive_expiry
+        _pool_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        reset_registry()
+
+
+class LoopLocalAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    실행 중인 이벤트 루프마다 별도의 비동기 커넥션 풀을 사용하는 httpx transport
+
+    httpx.AsyncClient와 ChatOpenAI는 한 번만 만들어 공유하고, 루프에 묶이는 커넥션 풀만 루프별로 만듭니다.
+    닫힌 루프의 커넥션 풀은 다음에 새 풀을 만들 때 정리되며, 루프가 사라지면 함께 해제됩니다.
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (Callable[[], httpx.AsyncBaseTransport]): 새 루프에서 사용할 커넥션 풀 생성 함수
+        """
+        self.factory = factory
+        self._transports = weakref.WeakKeyDictionary()  # 이벤트 루프 -> 커넥션 풀
+        self._lock = threading.Lock()
+
+    def current(self) -> httpx.AsyncBaseTransport:
+        """현재 이벤트 루프의 커넥션 풀을 반환합니다. (없으면 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                for closed in [key for key in self._transports if key.is_closed()]:
+                    del self._transports[closed]  # 닫힌 루프의 커넥션은 GC에 맡김
+                transport = self._transports[loop] = self.factory()
+            return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.current().handle_async_request(request)
+
+    async def aclose(self):
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+def get_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    모든 모델이 공유하는 동기/비동기 httpx 클라이언트를 반환합니다.
+
+    처음 호출될 때 한 번만 생성됩니다.
+
+    Returns:
+        tuple[httpx.Client, httpx.AsyncClient]: 공유 동기 클라이언트와 비동기 클라이언트
+    """
+    global _http_clients
+    with _lock:
+        if _http_clients is None:
+            limits = get_pool_limits()
+            # transport를 직접 지정하면 httpx가 프록시 환경변수를 읽지 않으므로 직접 전달합니다.
+            proxy = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy")
+            # OpenAI SDK 기본값과 같은 타임아웃 (요청별 타임아웃은 SDK가 덮어씁니다)
+            timeout = httpx.Timeout(600.0, connect=5.0)
+            # 바깥쪽부터 녹화/재생 -> 동시 요청 합치기 -> 마감 시각 -> 헤징 -> 속도 제한 -> 커넥션 풀
+            transport = httpx.HTTPTransport(limits=limits, proxy=proxy)
+            for wrapper in (
+                RateLimitedTransport,
+                HedgedTransport,
+                DeadlineTransport,
+                CoalescingTransport,
+                CassetteTransport,
+            ):
+                transport = wrapper(transport)
+            # 비동기 커넥션 풀은 이벤트 루프마다 따로 생성
+            async_transport = LoopLocalAsyncTransport(
+                lambda: httpx.AsyncHTTPTransport(limits=limits, proxy=proxy)
+            )
+            for wrapper in (
+                AsyncRateLimitedTransport,
+                AsyncHedgedTransport,
+                AsyncDeadlineTransport,
+                AsyncCoalescingTransport,
+                AsyncCassetteTransport,
+            ):
+                async_transport = wrapper(async_transport)
+            _http_clients = (
+                httpx.Client(transport=transport, timeout=timeout),
+                httpx.AsyncClient(transport=async_transport, timeout=timeout),
+            )
+        return _http_clients
+
+
+def get_chat_model(
+    model=DEFAULT_MODEL, temperature=0.7, top_p=0.9, base_url=None
+) -> ChatOpenAI:
+    """
+    (model, temperature, top_p, base_url) 조합에 해당하는 공유 ChatOpenAI 인스턴스를 반환합니다.
+
+    같은 조합으로 다시 호출하면 이미 생성된 인스턴스를 그대로 반환하며,
+    모든 인스턴스는 get_http_clients()의 커넥션 풀을 공유합니다.
+    LLM_CACHE_ENABLED=true이면 모델 호출 결과는 이 패키지의 모델끼리 공유하는 응답 캐시(agents.llm_cache)에 저장되며,
+    토큰 사용량(접두부 캐시 토큰 포함)은 노드별로 agents.metrics에 기록됩니다.
+    base_url을 지정하지 않으면 OPENAI_BASE_URL 환경변수(없으면 OpenAI 기본 주소)를 사용합니다.
+
+    Args:
+        model (str): 모델 이름 (기본값: "gpt-4o-mini")
+        temperature (float): 모델의 창의성 정도를 조절하는 파라미터 (기본값: 0.7)
+        top_p (float): 토큰 샘플링 확률 임계값 (기본값: 0.9)
+        base_url (str | None): OpenAI 호환 API 주소
+
+    Returns:
+        ChatOpenAI: 공유 OpenAI 모델 인스턴스
+    """
+    base_url = base_url or os.getenv("OPENAI_BASE_URL")
+    key = (model, temperature, top_p, base_url)
+
+    chat_model = _models.get(key)
+    if chat_model is not None:
+        return chat_model
+
+    with _lock:
+        chat_model = _models.get(key)
+        if chat_model is None:
+            http_client, http_async_client = get_http_clients()
+            chat_model = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                top_p=top_p,
+                base_url=base_url,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                cache=get_default_llm_cache(),  # 켜져 있으면 이 패키지의 모델끼리 공유하는 응답 캐시
+                stream_usage=True,  # 스트리밍 응답에도 토큰 사용량 포함
+                callbacks=[USAGE_CALLBACK],  # 노드별 토큰 사용량 기록
+            )
+            _models[key] = chat_model
+        return chat_model
+
+
+def reset_registry():
+    """
+    레지스트리에 등록된 모델을 제거하고 공유 httpx 클라이언트를 닫습니다.
+
+    커넥션 설정을 변경할 때 사용합니다. 비동기 클라이언트의 커넥션 풀은 이벤트 루프별로 만들어지고
+    소속된 루프가 이미 닫혔을 수 있으므로 커넥션 정리는 가비지 컬렉션에 맡깁니다.
+    """
+    global _http_clients
+    with _lock:
+        _models.clear()
+        if _http_clients is not None:
+            _http_clients[0].close()
+            _http_clients = None
@@ -2,8 +2,16 @@
 Music 패키지 초기화 모듈
 
 이 모듈은 Music Workflow를 외부에 노출시키는 역할을 합니다.
+music_workflow는 처음 접근할 때 agents.music.workflow 모듈을 불러오므로(PEP 562),
+패키지를 import하는 것만으로는 Workflow 모듈과 의존성이 로드되지 않습니다.
 """
 
-from agents.music.workflow import music_workflow
-
 __all__ = ["music_workflow"]
+
+
+def __getattr__(name):
+    if name == "music_workflow":
+        from agents.music.workflow import music_workflow
+
+        return music_workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
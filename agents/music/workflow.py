@@ -23,7 +23,7 @@ class MusicWorkflow(BaseWorkflow):
         super().__init__()
         self.state = state
 
-    def build(self):
+    def build(self, checkpointer=None):
         """
         음악 Workflow 그래프 구축 메서드
 
@@ -31,6 +31,10 @@ class MusicWorkflow(BaseWorkflow):
         현재는 음악 생성 노드를 포함하고 있으며, 추후 조건부 에지를 추가하여
         다양한 경로를 가진 Workflow를 구축할 수 있습니다.
 
+        Args:
+            checkpointer (BaseCheckpointSaver | None): 실행 상태를 저장할 체크포인터
+                (예: agents.checkpointer.SqliteCheckpointer, 기본값: 저장하지 않음)
+
         Returns:
             CompiledStateGraph: 컴파일된 상태 그래프 객체
         """
@@ -46,7 +50,7 @@ class MusicWorkflow(BaseWorkflow):
         #     router,
         # )
 
-        workflow = builder.compile()  # 그래프 컴파일
+        workflow = builder.compile(checkpointer=checkpointer)  # 그래프 컴파일
         workflow.name = self.name  # Workflow 이름 설정
 
         return workflow
@@ -0,0 +1,132 @@
+"""노드 결과 메모이제이션 모듈
+
+노드의 상태 업데이트가 상태의 일부 키에만 의존하는 순수 함수라면, 같은 키 값으로 다시 실행할 때
+체인 호출, 도구 호출, 결과 파싱 등 노드 안의 모든 단계를 건너뛰고 이전 결과를 재사용할 수 있습니다.
+
+BaseNode 하위 클래스는 결과가 의존하는 상태 키(cache_keys)와 캐시 정책(cache_policy)을 선언합니다.
+```python
+class PersonaExtractionNode(BaseNode):
+    cache_keys = ("content_topic", "content_type")
+    cache_policy = CachePolicy(ttl=3600, max_entries=256)
+```
+
+캐시 키는 선언한 키의 값만으로 만든 정규화 해시(canonical_hash)이므로, 다른 상태 값(response 등)이
+달라도 같은 결과를 재사용합니다. 마감 시각 때문에 대체 응답을 사용한 결과(degraded_nodes)는 저장하지 않습니다.
+캐시 적중 시 체인을 호출하지 않으므로 stream_mode="messages"의 토큰은 스트리밍되지 않고,
+완성된 결과만 상태 업데이트로 전달됩니다.
+
+노드별 적중률은 agents.metrics.get_node_cache_usage()로 확인할 수 있습니다.
+노드 메모이제이션은 기본으로 꺼져 있으며 NODE_CACHE_ENABLED=true 또는 enable_node_cache()로 켤 수 있습니다.
+선언한 키가 같아도 모델 설정이나 외부 데이터가 바뀌면 결과가 달라질 수 있으므로, 재사용해도 되는 환경에서만 켭니다.
+"""
+
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+
+from agents.llm_cache import TTLLRUCache
+
+_enabled = os.getenv("NODE_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def enable_node_cache(enabled: bool = True):
+    """
+    노드 결과 메모이제이션을 켜거나 끕니다.
+
+    Args:
+        enabled (bool): 메모이제이션 사용 여부 (기본값: True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def node_cache_enabled() -> bool:
+    """노드 결과 메모이제이션 사용 여부를 반환합니다."""
+    return _enabled
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    노드 결과 캐시 정책
+    """
+
+    ttl: float | None = 3600.0  # 결과 유효 시간(초), None이면 만료 없음
+    max_entries: int = 256  # 노드별 최대 항목 수
+    # 프롬프트 등 결과에 영향을 주는 구현이 바뀌면 변경하여 이전 결과를 무효화
+    version: str = ""
+
+
+def _canonical(value):
+    """JSON으로 직렬화할 수 없는 값을 정규화합니다."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "model_dump"):  # 메시지 등 pydantic 모델
+        return value.model_dump()
+    return repr(value)
+
+
+def canonical_hash(values: dict) -> str:
+    """
+    값의 키 순서나 직렬화 방식과 관계없이 같은 내용이면 같은 해시를 반환합니다.
+
+    Args:
+        values (dict): 해시할 값
+
+    Returns:
+        str: SHA-256 해시
+    """
+    payload = json.dumps(
+        values,
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_canonical,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class NodeCache:
+    """
+    노드 하나의 상태 업데이트를 선언한 상태 키의 값으로 메모이제이션하는 저장소
+    """
+
+    def __init__(self, keys, policy: CachePolicy):
+        """
+        Args:
+            keys (Sequence[str]): 결과가 의존하는 상태 키
+            policy (CachePolicy): 캐시 정책
+        """
+        self.keys = tuple(keys)
+        self.policy = policy
+        self.store = TTLLRUCache(policy.max_entries, policy.ttl)
+
+    def make_key(self, state) -> str:
+        """
+        상태에서 선언한 키의 값만으로 캐시 키를 만듭니다. (없는 키는 None으로 취급)
+        """
+        values = {key: state.get(key) for key in self.keys}
+        return canonical_hash({"version": self.policy.version, "values": values})
+
+    def lookup(self, key: str) -> dict | None:
+        """
+        저장된 상태 업데이트를 반환합니다. 호출한 쪽이 결과를 변경해도 저장된 값은 바뀌지 않습니다.
+
+        Returns:
+            dict | None: 저장된 상태 업데이트, 없으면 None
+        """
+        update = self.store.get(key)
+        return copy.deepcopy(update) if update is not None else None
+
+    def update(self, key: str, update: dict):
+        """
+        상태 업데이트를 저장합니다. 대체 응답으로 만든 업데이트는 저장하지 않습니다.
+        """
+        if isinstance(update, dict) and not update.get("degraded_nodes"):
+            self.store.set(key, copy.deepcopy(update))
+
+    def clear(self):
+        """저장된 모든 결과를 제거합니다."""
+        self.store.clear()
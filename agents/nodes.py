@@ -0,0 +1,135 @@
+"""
+메인 Workflow 노드 클래스 모듈
+
+이 모듈은 메인 Workflow에서 도메인 서브그래프(text, image, music, management)를 실행하는 노드와
+병렬로 실행된 도메인 브랜치의 응답을 병합하는 노드를 정의합니다.
+"""
+
+from langchain_core.messages import AIMessage
+
+from agents.base_node import BaseNode
+from agents.conditions import DOMAINS, missing_inputs
+
+# 서브그래프에 전달하지 않는 메인 Workflow 전용 키
+MAIN_ONLY_KEYS = ("domains", "domain_responses", "response", "degraded_nodes")
+
+
+class DomainWorkflowNode(BaseNode):
+    """
+    도메인 Workflow를 서브그래프로 실행하는 노드
+
+    메인 상태에서 대화 기록(response)과 degraded_nodes를 제외한 입력을 서브그래프에 전달하고,
+    서브그래프의 응답은 domain_responses[도메인]에만 기록합니다.
+    병렬로 실행되는 다른 브랜치와 같은 채널(query 등)을 동시에 쓰지 않도록
+    메인 상태의 다른 값은 변경하지 않습니다.
+
+    마감 시각 안에 서브그래프가 끝나지 않으면 해당 도메인의 응답 없이 나머지 브랜치의 응답만 병합됩니다.
+    쿼리로 도메인을 골랐지만 필수 입력(DOMAIN_INPUT_KEYS)이 없으면 서브그래프를 실행하지 않고
+    필요한 입력을 안내하는 응답을 기록합니다.
+    """
+
+    optional = True  # 마감 시각에 쫓기면 도메인 브랜치를 건너뜀
+    # 서브그래프의 노드가 먼저 대체 응답으로 끝낼 수 있도록 브랜치 취소를 잠시 미룸
+    deadline_grace = 0.05
+
+    def __init__(self, domain, workflow, **kwargs):
+        """
+        Args:
+            domain (str): 도메인 이름 (예: "text")
+            workflow (BaseWorkflow): 실행할 도메인 Workflow 인스턴스
+        """
+        super().__init__(**kwargs)
+        self.name = f"{self.__class__.__name__}[{domain}]"
+        self.domain = domain
+        self.workflow = workflow
+
+    def get_chain_input(self, state) -> dict:
+        """
+        메인 상태에서 서브그래프 입력을 구성합니다.
+        """
+        return {
+            key: value
+            for key, value in state.items()
+            if key not in MAIN_ONLY_KEYS and value is not None
+        }
+
+    def build_update(self, state, output) -> dict:
+        """
+        서브그래프의 응답 메시지를 도메인 이름으로 기록하고, 서브그래프의 degraded_nodes를 전달합니다.
+        """
+        update = {"domain_responses": {self.domain: output.get("response", [])}}
+        if output.get("degraded_nodes"):
+            update["degraded_nodes"] = output["degraded_nodes"]
+        return update
+
+    def missing_inputs_update(self, state) -> dict | None:
+        """
+        필수 입력이 없으면 필요한 입력을 안내하는 응답을 반환합니다. 입력이 모두 있으면 None을 반환합니다.
+        """
+        missing = missing_inputs(self.domain, state)
+        if not missing:
+            return None
+        message = AIMessage(
+            content=f"{self.domain} 요청을 처리하려면 다음 입력이 필요합니다: {', '.join(missing)}"
+        )
+        return {"domain_responses": {self.domain: [message]}}
+
+    def execute(self, state) -> dict:
+        """
+        도메인 서브그래프를 실행합니다.
+
+        Args:
+            state (MainState): 현재 Workflow 상태
+
+        Returns:
+            dict: domain_responses 업데이트
+        """
+        if (update := self.missing_inputs_update(state)) is not None:
+            return update
+        output = self.workflow().invoke(self.get_chain_input(state))
+        return self.build_update(state, output)
+
+    async def aexecute(self, state) -> dict:
+        """
+        도메인 서브그래프를 비동기로 실행합니다.
+
+        Args:
+            state (MainState): 현재 Workflow 상태
+
+        Returns:
+            dict: domain_responses 업데이트
+        """
+        if (update := self.missing_inputs_update(state)) is not None:
+            return update
+        output = await self.workflow().ainvoke(self.get_chain_input(state))
+        return self.build_update(state, output)
+
+
+class ResponseJoinNode(BaseNode):
+    """
+    병렬로 실행된 도메인 브랜치의 응답을 response 채널로 병합하는 노드
+
+    브랜치가 끝나는 순서와 관계없이 DOMAINS 순서대로 응답을 추가하므로
+    같은 요청에 대해 항상 같은 순서의 response를 반환합니다.
+    """
+
+    enforce_deadline = False  # 로컬 병합만 하므로 마감 시각이 지나도 실행
+
+    def execute(self, state) -> dict:
+        """
+        domain_responses의 메시지를 도메인 순서대로 response에 추가합니다.
+
+        Args:
+            state (MainState): 현재 Workflow 상태
+
+        Returns:
+            dict: response 업데이트
+        """
+        domain_responses = state.get("domain_responses") or {}
+        merged = [
+            message
+            for domain in DOMAINS
+            for message in domain_responses.get(domain, [])
+        ]
+        self.logging("execute", domains=list(domain_responses))
+        return {"response": merged}
@@ -0,0 +1,307 @@
+"""프롬프트 레지스트리 및 토큰 예산 모듈
+
+프롬프트 템플릿을 이름별로 한 번만 생성(컴파일)하여 모든 체인이 공유하고,
+템플릿의 정적 부분(변수를 제외한 지시문)의 토큰 수를 미리 계산해 둡니다.
+렌더링할 때는 노드별 토큰 예산(PromptBudget)을 넘지 않도록 변수 값을 우선순위 순서대로 줄여,
+호출마다 프롬프트 길이(지연 시간과 비용)의 상한이 정해지도록 합니다.
+
+```python
+register_prompt(
+    "resource_planning",
+    get_resource_planning_prompt,
+    PromptBudget(max_tokens=4096, priority=("resources_available", "team_members", "query")),
+)
+
+prompt = get_prompt("resource_planning")
+chain = prompt.runnable | model  # 예산에 맞게 값을 줄인 뒤 프롬프트를 렌더링
+```
+
+값을 줄이는 방식:
+- 리스트/딕셔너리: 앞쪽 항목만 남기고 생략한 항목 수를 표시합니다. (예: ['A', 'B', '... (3 more items omitted)'])
+- 문자열: 앞부분만 남기고 "... (truncated)"를 붙입니다.
+
+priority에 없는 변수는 줄이지 않으며, 변수 값은 min_field_tokens보다 짧게 줄이지 않습니다.
+토큰 수는 agents.tokenizer.count_tokens로 계산하므로 tiktoken이 없으면 근사값입니다.
+
+프롬프트별 예산은 환경변수 PROMPT_TOKEN_BUDGET_<이름>(예: PROMPT_TOKEN_BUDGET_RESOURCE_PLANNING)
+또는 configure_prompt_budget()으로 변경할 수 있으며, 0이면 예산을 적용하지 않습니다.
+"""
+
+import os
+import string
+import threading
+from dataclasses import dataclass, field, replace
+
+from langchain_core.runnables import RunnableLambda
+
+from agents.tokenizer import count_tokens
+
+TRUNCATION_MARKER = "... (truncated)"  # 문자열을 줄였을 때 붙이는 표시
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """
+    프롬프트 하나의 토큰 예산
+    """
+
+    max_tokens: int | None = (
+        None  # 렌더링된 프롬프트의 최대 토큰 수, None이면 제한 없음
+    )
+    priority: tuple = ()  # 예산을 넘으면 먼저 줄일 변수 순서
+    min_field_tokens: int = 16  # 줄인 변수 값의 최소 토큰 수
+
+
+@dataclass
+class PromptStats:
+    """
+    프롬프트 렌더링 횟수와 예산 때문에 값을 줄인 횟수를 집계하는 데이터 클래스
+    """
+
+    renders: int = 0  # 렌더링 횟수
+    truncated: int = 0  # 하나 이상의 변수 값을 줄인 렌더링 횟수
+    truncated_fields: dict = field(default_factory=dict)  # 변수별 줄인 횟수
+
+
+def _omitted_marker(count: int) -> str:
+    return f"... ({count} more items omitted)"
+
+
+def _shrink(value, max_tokens: int, model: str) -> str:
+    """
+    값을 문자열로 변환했을 때 max_tokens 이하가 되도록 줄인 문자열을 반환합니다.
+
+    리스트/딕셔너리는 남길 항목 수를, 문자열은 남길 글자 수를 이진 탐색합니다.
+    """
+    if isinstance(value, (list, tuple, dict)):
+        items = list(value.items()) if isinstance(value, dict) else list(value)
+
+        def render(keep: int) -> str:
+            kept = items[:keep]
+            omitted = len(items) - keep
+            if isinstance(value, dict):
+                kept = dict(kept)
+                if omitted:
+                    kept["..."] = _omitted_marker(omitted)
+            elif omitted:
+                kept.append(_omitted_marker(omitted))
+            return str(kept)
+
+        size = len(items)
+    else:
+        text = str(value)
+
+        def render(keep: int) -> str:
+            if keep >= len(text):
+                return text
+            return text[:keep].rstrip() + TRUNCATION_MARKER
+
+        size = len(text)
+
+    low, high = 0, size  # render(low)는 항상 후보, 예산 안에 드는 가장 긴 값을 찾음
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(render(middle), model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return render(low)
+
+
+class CompiledPrompt:
+    """
+    한 번 생성한 프롬프트 템플릿과 정적 부분의 토큰 수, 토큰 예산을 함께 보관하는 객체
+    """
+
+    def __init__(self, name: str, template, budget=None, model: str = "gpt-4o-mini"):
+        """
+        Args:
+            name (str): 프롬프트 이름
+            template (PromptTemplate): 컴파일된 프롬프트 템플릿
+            budget (PromptBudget | None): 토큰 예산 (None이면 제한 없음)
+            model (str): 토큰 수를 계산할 모델 이름 (기본값: "gpt-4o-mini")
+        """
+        self.name = name
+        self.template = template
+        self.budget = budget or PromptBudget()
+        self.model = model
+        self.stats = PromptStats()
+        self._stats_lock = threading.Lock()  # 여러 스레드에서 렌더링할 때 집계 보호
+        # 변수를 제외한 템플릿 문자열의 토큰 수 (컴파일할 때 한 번만 계산)
+        literals = "".join(
+            literal for literal, _, _, _ in string.Formatter().parse(template.template)
+        )
+        self.static_tokens = count_tokens(literals, model)
+        self.runnable = RunnableLambda(self.fit, name=f"fit_{name}") | template
+
+    @property
+    def input_variables(self) -> list[str]:
+        """템플릿의 입력 변수 목록"""
+        return self.template.input_variables
+
+    def count(self, values: dict) -> int:
+        """
+        값을 렌더링했을 때의 프롬프트 토큰 수를 정적 부분과 변수 값의 합으로 추정합니다.
+        """
+        return self.static_tokens + sum(
+            count_tokens(str(values.get(name, "")), self.model)
+            for name in self.input_variables
+        )
+
+    def fit(self, values: dict) -> dict:
+        """
+        토큰 예산을 넘지 않도록 우선순위 순서대로 변수 값을 줄인 입력을 반환합니다.
+
+        예산 안에 들면 값을 그대로 반환하므로, 렌더링된 프롬프트는 예산이 없을 때와 같습니다.
+
+        Args:
+            values (dict): 프롬프트 입력 값
+
+        Returns:
+            dict: 예산에 맞게 줄인 프롬프트 입력 값
+        """
+        budget = self.budget
+        if not budget.max_tokens:
+            self._record()
+            return values
+
+        field_tokens = {
+            name: count_tokens(str(values.get(name, "")), self.model)
+            for name in self.input_variables
+        }
+        over = self.static_tokens + sum(field_tokens.values()) - budget.max_tokens
+        if over <= 0:
+            self._record()
+            return values
+
+        fitted = dict(values)
+        truncated = []
+        for name in budget.priority:
+            if over <= 0:
+                break
+            if name not in field_tokens:
+                continue
+            target = max(budget.min_field_tokens, field_tokens[name] - over)
+            if target >= field_tokens[name]:
+                continue
+            fitted[name] = _shrink(values[name], target, self.model)
+            tokens = count_tokens(fitted[name], self.model)
+            over -= field_tokens[name] - tokens
+            field_tokens[name] = tokens
+            truncated.append(name)
+        self._record(truncated)
+        return fitted
+
+    def _record(self, truncated: list = ()):
+        """렌더링 횟수와 예산 때문에 줄인 변수를 집계합니다."""
+        with self._stats_lock:
+            self.stats.renders += 1
+            if truncated:
+                self.stats.truncated += 1
+            for name in truncated:
+                self.stats.truncated_fields[name] = (
+                    self.stats.truncated_fields.get(name, 0) + 1
+                )
+
+    def get_stats(self) -> dict:
+        """
+        정적 토큰 수, 예산, 렌더링/줄임 횟수를 반환합니다.
+
+        Returns:
+            dict: {"static_tokens", "max_tokens", "renders", "truncated", "truncated_fields"}
+        """
+        with self._stats_lock:
+            return {
+                "static_tokens": self.static_tokens,
+                "max_tokens": self.budget.max_tokens,
+                "renders": self.stats.renders,
+                "truncated": self.stats.truncated,
+                "truncated_fields": dict(self.stats.truncated_fields),
+            }
+
+    def render(self, values: dict) -> str:
+        """
+        토큰 예산을 적용하여 프롬프트 문자열을 렌더링합니다.
+        """
+        return self.template.format(**self.fit(values))
+
+
+_lock = threading.Lock()
+_factories = {}  # 이름 -> (템플릿 생성 함수, 기본 예산)
+_prompts = {}  # 이름 -> CompiledPrompt
+
+
+def _budget_from_env(name: str, budget: PromptBudget) -> PromptBudget:
+    """환경변수 PROMPT_TOKEN_BUDGET_<이름>이 있으면 예산의 max_tokens를 바꿉니다."""
+    value = os.getenv(f"PROMPT_TOKEN_BUDGET_{name.upper()}")
+    if value is None:
+        return budget
+    return replace(budget, max_tokens=int(value) or None)
+
+
+def register_prompt(name: str, factory, budget: PromptBudget | None = None):
+    """
+    프롬프트 템플릿 생성 함수와 기본 토큰 예산을 등록합니다.
+
+    템플릿은 get_prompt()로 처음 요청할 때 한 번만 생성됩니다.
+
+    Args:
+        name (str): 프롬프트 이름
+        factory (Callable[[], PromptTemplate]): 프롬프트 템플릿 생성 함수
+        budget (PromptBudget | None): 기본 토큰 예산 (None이면 제한 없음)
+    """
+    with _lock:
+        _factories[name] = (factory, budget or PromptBudget())
+        _prompts.pop(name, None)
+
+
+def get_prompt(name: str) -> CompiledPrompt:
+    """
+    등록된 프롬프트를 반환합니다. 처음 요청할 때 템플릿을 생성하고 정적 토큰 수를 계산합니다.
+
+    Args:
+        name (str): 프롬프트 이름
+
+    Returns:
+        CompiledPrompt: 컴파일된 프롬프트
+
+    Raises:
+        KeyError: 등록되지 않은 프롬프트인 경우
+    """
+    with _lock:
+        prompt = _prompts.get(name)
+        if prompt is None:
+            if name not in _factories:
+                raise KeyError(f"Unknown prompt: {name!r}")
+            factory, budget = _factories[name]
+            prompt = CompiledPrompt(name, factory(), _budget_from_env(name, budget))
+            _prompts[name] = prompt
+        return prompt
+
+
+def configure_prompt_budget(name: str, **kwargs) -> PromptBudget:
+    """
+    프롬프트의 토큰 예산을 변경합니다. 이미 이 프롬프트를 사용하는 체인에도 바로 적용됩니다.
+
+    Args:
+        name (str): 프롬프트 이름
+        **kwargs: 변경할 PromptBudget 필드 (max_tokens, priority, min_field_tokens)
+
+    Returns:
+        PromptBudget: 변경된 토큰 예산
+    """
+    prompt = get_prompt(name)
+    prompt.budget = replace(prompt.budget, **kwargs)
+    return prompt.budget
+
+
+def get_prompt_stats() -> dict:
+    """
+    컴파일된 프롬프트별 정적 토큰 수와 렌더링/줄임 횟수를 반환합니다.
+
+    Returns:
+        dict: {프롬프트 이름: {"static_tokens", "max_tokens", "renders", "truncated", "truncated_fields"}}
+    """
+    with _lock:
+        prompts = list(_prompts.values())
+    return {prompt.name: prompt.get_stats() for prompt in prompts}
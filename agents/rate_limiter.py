@@ -0,0 +1,539 @@
+"""
+프로세스 전체 LLM 호출 속도 제한 및 동시성 제어 모듈
+
+text, management 등 모든 도메인의 노드는 같은 모델(gpt-4o-mini) 할당량을 함께 사용합니다.
+이 모듈은 공유 httpx 클라이언트에 끼워지는 transport로 모든 LLM 요청에 다음을 적용합니다.
+
+- 토큰 버킷: 분당 요청 수(RPM)와 분당 토큰 수(TPM) 예산을 함께 지킵니다. 요청 토큰 수는
+  렌더링된 프롬프트(요청 본문의 messages)와 최대 완성 토큰 수로 추정하며, 제공자가 돌려주는
+  x-ratelimit-remaining-* 헤더로 버킷 잔량을 보정합니다.
+- AIMD 동시성 제어: 응답이 정상이면 동시 요청 한도를 조금씩 늘리고(additive increase),
+  429 응답이나 기준보다 크게 늘어난 지연을 관측하면 한도를 절반으로 줄입니다(multiplicative decrease).
+  지연은 응답 헤더까지의 시간이므로, 스트리밍 요청(첫 토큰까지의 시간)과 429/5xx 응답에서만 표본으로 사용합니다.
+  스트리밍이 아닌 정상 응답의 헤더 시간에는 생성 시간이 포함되어 긴 응답을 혼잡으로 오인하기 때문입니다.
+
+이를 통해 대량 실행의 버스트가 429와 재시도 폭주를 일으켜 대화형 요청의 꼬리 지연을 늘리는 것을 막고,
+전체 처리량을 제공자 한도 바로 아래로 유지합니다.
+
+속도 제한은 환경변수 또는 configure_rate_limiter()로 예산을 설정했을 때만 동작합니다.
+- LLM_RATE_LIMIT_RPM: 분당 요청 수 예산
+- LLM_RATE_LIMIT_TPM: 분당 토큰 수 예산
+- LLM_RATE_LIMIT_MAX_CONCURRENCY: 최대 동시 요청 수 (기본값: 64)
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import httpx
+
+from agents.tokenizer import count_message_tokens
+
+DEFAULT_COMPLETION_TOKENS = 256  # max_tokens가 없을 때 예약할 완성 토큰 수
+
+
+class TokenBucket:
+    """
+    분당 보충량이 정해진 토큰 버킷
+
+    reserve()는 버킷에서 바로 차감하고(잔량이 음수가 될 수 있음) 잔량이 다시 0 이상이 될 때까지
+    기다려야 하는 시간을 반환합니다. 먼저 예약한 요청이 먼저 통과하므로 대기 순서가 공정합니다.
+    """
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        """
+        Args:
+            per_minute (float): 분당 보충량
+            capacity (float | None): 버킷 최대 용량 (기본값: 분당 보충량)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        amount만큼 예약하고 기다려야 할 시간(초)을 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def sync(self, remaining: float):
+        """
+        제공자가 알려준 남은 예산이 버킷 잔량보다 적으면 잔량을 맞춥니다.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, remaining)
+
+    def drain(self):
+        """잔량을 0으로 만들어 다음 요청이 보충을 기다리게 합니다. (429 응답 시)"""
+        self.sync(0)
+
+    def refund(self, amount: float):
+        """사용하지 않은 예약량을 돌려줍니다. (대기 중 취소된 요청)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+
+class AIMDController:
+    """
+    지연과 429 응답으로 동시 요청 한도를 조절하는 AIMD 동시성 제어기
+
+    한도에 도달하면 acquire()/aacquire()가 슬롯이 날 때까지 기다립니다.
+    동기 스레드와 여러 이벤트 루프에서 함께 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        initial_limit=8,
+        min_limit=1,
+        max_limit=64,
+        decrease_factor=0.5,
+        latency_tolerance=3.0,
+        min_latency_increase=0.5,
+    ):
+        """
+        Args:
+            initial_limit (int): 초기 동시 요청 한도
+            min_limit (int): 최소 동시 요청 한도
+            max_limit (int): 최대 동시 요청 한도
+            decrease_factor (float): 혼잡을 관측했을 때 한도에 곱할 값
+            latency_tolerance (float): 기준 지연(관측된 최소 평균 지연)의 몇 배를 혼잡으로 볼지
+            min_latency_increase (float): 혼잡으로 볼 최소 지연 증가량(초), 짧은 응답의 흔들림 무시
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_latency_increase = min_latency_increase
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.throttled = 0  # 관측한 429 응답 수
+        self._latency = None  # 지연 EWMA (초)
+        self._baseline = None  # 관측된 최소 지연 EWMA (초)
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()  # (이벤트 루프, Future)
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        """동시 요청 슬롯을 하나 얻을 때까지 기다립니다."""
+        with self._cond:
+            while not self._try_acquire():
+                self._cond.wait()
+
+    async def aacquire(self):
+        """acquire의 비동기 버전으로, 이벤트 루프를 막지 않고 기다립니다."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_acquire():
+                    return
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._cond:
+                    self._wake_one()  # 받았을 수 있는 깨움을 다른 대기자에게 넘김
+                raise
+
+    def _wake_one(self):
+        self._cond.notify()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            if not future.done() and not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, future)
+                break
+
+    def release(
+        self,
+        latency: float | None = None,
+        throttled: bool = False,
+        failed: bool = False,
+    ):
+        """
+        슬롯을 반납하고 결과에 따라 한도를 조절합니다.
+
+        Args:
+            latency (float | None): 혼잡 판단에 사용할 지연 표본(초), 표본이 없으면 None
+            throttled (bool): 429 응답 여부
+            failed (bool): 응답을 받지 못했거나 서버 오류(5xx)인지 여부 (한도를 늘리지 않음)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if latency is not None:
+                self._latency = (
+                    latency
+                    if self._latency is None
+                    else 0.8 * self._latency + 0.2 * latency
+                )
+                if self._baseline is None or self._latency < self._baseline:
+                    self._baseline = self._latency
+
+            congested = throttled or (
+                latency is not None
+                and latency > self._baseline * self.latency_tolerance
+                and latency - self._baseline > self.min_latency_increase
+            )
+            if congested:
+                # 같은 혼잡에 대한 연속 감소를 막기 위해 평균 지연 동안 한 번만 줄입니다.
+                if now - self._last_decrease >= (self._latency or 0.0):
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif not failed:
+                # 한도만큼의 요청이 성공하면 한도가 1 늘어납니다.
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if throttled:
+                self.throttled += 1
+
+            for _ in range(max(1, int(self.limit) - self.in_flight)):
+                self._wake_one()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiter:
+    """
+    RPM/TPM 토큰 버킷과 AIMD 동시성 제어를 묶은 프로세스 전체 속도 제한기
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        controller: AIMDController | None = None,
+    ):
+        """
+        Args:
+            requests_per_minute (float | None): 분당 요청 수 예산 (None이면 제한 없음)
+            tokens_per_minute (float | None): 분당 토큰 수 예산 (None이면 제한 없음)
+            controller (AIMDController | None): 동시성 제어기 (기본값: AIMDController())
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.controller = controller or AIMDController()
+        self.waited = 0.0  # 버킷 대기로 지연된 누적 시간(초)
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        self.waited += wait
+        return wait
+
+    def _refund(self, tokens: int):
+        if self.requests is not None:
+            self.requests.refund(1)
+        if self.tokens is not None:
+            self.tokens.refund(tokens)
+
+    def acquire(self, tokens: int):
+        """예산과 동시성 슬롯을 얻을 때까지 기다립니다."""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        self.controller.acquire()
+
+    async def aacquire(self, tokens: int):
+        """acquire의 비동기 버전 (기다리는 중 취소되면 예약한 예산을 돌려줌)"""
+        wait = self._reserve(tokens)
+        try:
+            if wait:
+                await asyncio.sleep(wait)
+            await self.controller.aacquire()
+        except asyncio.CancelledError:
+            self._refund(tokens)
+            raise
+
+    def release(
+        self,
+        latency: float | None,
+        response: httpx.Response | None,
+        streaming: bool = False,
+    ):
+        """
+        슬롯을 반납하고 응답 상태/헤더로 버킷과 동시성 한도를 보정합니다.
+
+        Args:
+            latency (float | None): 응답 헤더까지의 지연(초)
+            response (httpx.Response | None): 응답 (요청이 실패했으면 None)
+            streaming (bool): 스트리밍 요청 여부 (헤더까지의 지연이 첫 토큰까지의 지연)
+        """
+        throttled = response is not None and response.status_code == 429
+        failed = response is None or response.status_code >= 500
+        # 스트리밍이 아닌 정상 응답의 헤더 시간은 생성 시간을 포함하므로 지연 표본에서 제외
+        if response is None or not (streaming or throttled or failed):
+            latency = None
+        if response is not None:
+            headers = response.headers
+            for bucket, header in (
+                (self.requests, "x-ratelimit-remaining-requests"),
+                (self.tokens, "x-ratelimit-remaining-tokens"),
+            ):
+                if bucket is None:
+                    continue
+                if throttled:
+                    bucket.drain()
+                elif header in headers:
+                    try:
+                        bucket.sync(float(headers[header]))
+                    except ValueError:
+                        pass
+        self.controller.release(latency, throttled, failed)
+
+    def stats(self) -> dict:
+        """현재 동시성 한도, 진행 중인 요청 수, 429 수, 누적 대기 시간을 반환합니다."""
+        controller = self.controller
+        return {
+            "limit": int(controller.limit),
+            "in_flight": controller.in_flight,
+            "throttled": controller.throttled,
+            "waited_seconds": self.waited,
+        }
+
+
+def _load_payload(request: httpx.Request) -> dict:
+    try:
+        payload = json.loads(request.content or b"{}")
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _prompt_tokens(payload: dict) -> int:
+    messages = payload.get("messages")
+    if not messages:
+        return 0
+    return count_message_tokens(messages, payload.get("model") or "gpt-4o-mini")
+
+
+def estimate_prompt_tokens(request: httpx.Request) -> int:
+    """
+    요청 본문의 렌더링된 프롬프트(messages) 토큰 수를 계산합니다.
+
+    Args:
+        request (httpx.Request): LLM API 요청
+
+    Returns:
+        int: 프롬프트 토큰 수 (채팅 요청이 아니면 0)
+    """
+    return _prompt_tokens(_load_payload(request))
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """
+    요청 본문의 렌더링된 프롬프트와 최대 완성 토큰 수로 요청의 토큰 사용량을 추정합니다.
+
+    Args:
+        request (httpx.Request): LLM API 요청
+
+    Returns:
+        int: 추정 토큰 수 (프롬프트 + 완성)
+    """
+    return _request_tokens(_load_payload(request))
+
+
+def _request_tokens(payload: dict) -> int:
+    completion_tokens = (
+        payload.get("max_completion_tokens")
+        or payload.get("max_tokens")
+        or DEFAULT_COMPLETION_TOKENS
+    )
+    return _prompt_tokens(payload) + completion_tokens
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _once(func):
+    called = False
+
+    def wrapper():
+        nonlocal called
+        if not called:
+            called = True
+            func()
+
+    return wrapper
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    속도 제한기를 거쳐 요청을 보내는 동기 httpx transport
+
+    동시성 슬롯은 응답 본문(스트리밍 포함)을 모두 읽고 닫을 때 반납되며,
+    지연은 응답 헤더를 받을 때까지의 시간으로 측정합니다. (스트리밍 요청과 429/5xx 응답만 표본으로 사용)
+    속도 제한이 설정되지 않았으면 내부 transport로 그대로 전달합니다.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return self.transport.handle_request(request)
+
+        payload = _load_payload(request)
+        limiter.acquire(_request_tokens(payload))
+        streaming = bool(payload.get("stream"))
+        start = time.perf_counter()
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            limiter.release(None, None)
+            raise
+        latency = time.perf_counter() - start
+        release = _once(lambda: limiter.release(latency, response, streaming))
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    RateLimitedTransport의 비동기 버전
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return await self.transport.handle_async_request(request)
+
+        payload = _load_payload(request)
+        await limiter.aacquire(_request_tokens(payload))
+        streaming = bool(payload.get("stream"))
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            limiter.release(None, None)
+            raise
+        latency = time.perf_counter() - start
+        release = _once(lambda: limiter.release(latency, response, streaming))
+        response.stream = _AsyncReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_limiter = None  # 현재 RateLimiter
+_configured = False  # 환경변수 설정을 읽었는지 여부
+_limiter_lock = threading.Lock()
+
+
+def configure_rate_limiter(
+    requests_per_minute=None, tokens_per_minute=None, max_concurrency=64, **kwargs
+) -> RateLimiter | None:
+    """
+    프로세스 전체 속도 제한기를 설정합니다.
+
+    두 예산이 모두 None이면 속도 제한을 끕니다.
+
+    Args:
+        requests_per_minute (float | None): 분당 요청 수 예산
+        tokens_per_minute (float | None): 분당 토큰 수 예산
+        max_concurrency (int): 최대 동시 요청 수 (기본값: 64)
+        **kwargs: AIMDController에 전달할 추가 설정
+
+    Returns:
+        RateLimiter | None: 설정된 속도 제한기
+    """
+    global _limiter, _configured
+    limiter = None
+    if requests_per_minute or tokens_per_minute:
+        controller = AIMDController(max_limit=max_concurrency, **kwargs)
+        limiter = RateLimiter(requests_per_minute, tokens_per_minute, controller)
+    with _limiter_lock:
+        _limiter = limiter
+        _configured = True
+    return limiter
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """
+    현재 속도 제한기를 반환합니다.
+
+    configure_rate_limiter()로 설정하지 않았다면 처음 호출될 때 환경변수를 읽습니다.
+
+    Returns:
+        RateLimiter | None: 속도 제한기 (예산이 설정되지 않았으면 None)
+    """
+    if not _configured:
+        rpm = os.getenv("LLM_RATE_LIMIT_RPM")
+        tpm = os.getenv("LLM_RATE_LIMIT_TPM")
+        configure_rate_limiter(
+            float(rpm) if rpm else None,
+            float(tpm) if tpm else None,
+            max_concurrency=int(os.getenv("LLM_RATE_LIMIT_MAX_CONCURRENCY", "64")),
+        )
+    return _limiter
+
+
+def reset_rate_limiter():
+    """속도 제한 설정을 지워 다음 호출에서 환경변수를 다시 읽도록 합니다."""
+    global _limiter, _configured
+    with _limiter_lock:
+        _limiter = None
+        _configured = False
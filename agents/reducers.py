@@ -0,0 +1,190 @@
+"""
+상태 채널 reducer 모듈
+
+이 모듈은 Workflow 상태(State) 클래스의 Annotated 채널에서 사용하는 reducer 함수를 제공합니다.
+
+- add_indexed_messages: response 채널용 메시지 reducer로, LangGraph의 add_messages와 같은 의미
+  (추가, ID가 같으면 교체, RemoveMessage로 삭제)를 유지하면서 메시지 ID -> 위치 인덱스를 재사용합니다.
+- merge_domain_responses: 병렬 도메인 브랜치의 응답을 합치는 reducer입니다.
+
+add_messages는 병합할 때마다 기존 메시지 전체를 다시 변환하고 ID 딕셔너리를 새로 만들기 때문에,
+대화 기록이 길어지거나 여러 브랜치가 한 단계에서 합류하면 병합 비용이 기록 길이에 비례해 커집니다.
+add_indexed_messages는 이전 병합 결과(MessageList)가 가진 인덱스를 그대로 이어서 사용하므로
+새 메시지 하나당 Python 수준 작업은 O(1)이며, 기존 메시지는 리스트 복사(C 수준 포인터 복사)만 일어납니다.
+
+예시:
+```python
+from typing import Annotated, TypedDict
+
+from agents.reducers import add_indexed_messages
+
+
+class MyState(TypedDict):
+    response: Annotated[list, add_indexed_messages]
+```
+"""
+
+import uuid
+
+from langchain_core.messages import (
+    RemoveMessage,
+    convert_to_messages,
+    message_chunk_to_message,
+)
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+
+class _MessageIndex:
+    """
+    같은 계보(lineage)의 MessageList들이 공유하는 메시지 ID -> 위치 인덱스
+
+    head는 인덱스를 마지막으로 확장한 MessageList입니다. head가 아닌 리스트에 병합하면
+    (체크포인트 분기 등) 인덱스를 새로 만듭니다.
+    """
+
+    __slots__ = ("head", "positions")
+
+    def __init__(self, positions, head):
+        self.positions = positions
+        self.head = head
+
+
+class MessageList(list):
+    """
+    메시지 ID -> 위치 인덱스를 함께 가지는 메시지 리스트
+
+    add_indexed_messages가 반환하는 값으로, 일반 list와 똑같이 사용할 수 있습니다.
+    체크포인트에서 복원된 값처럼 인덱스가 없는 일반 list도 첫 병합 때 인덱스를 만들어 사용합니다.
+    병합 결과는 항상 새 리스트이므로 이전 상태 스냅샷은 변경되지 않습니다.
+    """
+
+    _index = None  # _MessageIndex (없으면 다음 병합 때 생성)
+
+    def position(self, message_id):
+        """
+        메시지 ID의 위치를 반환합니다.
+
+        Args:
+            message_id (str): 메시지 ID
+
+        Returns:
+            int | None: 메시지 위치 (없으면 None)
+        """
+        if self._index is None:
+            self._index = _build_index(self)
+        position = self._index.positions.get(message_id)
+        # 공유 인덱스에는 이 리스트 이후에 추가된 메시지도 있으므로 위치를 검증합니다.
+        if (
+            position is not None
+            and position < len(self)
+            and self[position].id == message_id
+        ):
+            return position
+        return None
+
+
+def _coerce_messages(messages) -> list:
+    """
+    메시지 목록을 BaseMessage 목록으로 변환하고 ID가 없는 메시지에 ID를 부여합니다.
+    """
+    if not isinstance(messages, list):
+        messages = [messages]
+    coerced = [message_chunk_to_message(m) for m in convert_to_messages(messages)]
+    for message in coerced:
+        if message.id is None:
+            message.id = str(uuid.uuid4())
+    return coerced
+
+
+def _build_index(messages) -> _MessageIndex:
+    """
+    메시지 목록의 위치 인덱스를 새로 만듭니다.
+    """
+    positions = {message.id: i for i, message in enumerate(messages)}
+    return _MessageIndex(positions, messages)
+
+
+def _copy_with_index(left) -> MessageList:
+    """
+    병합 대상이 될 left의 복사본을 만듭니다.
+
+    left가 인덱스의 head이면 인덱스를 공유하고, 아니면 새 인덱스를 만듭니다.
+    인덱스가 없는 일반 list는 add_messages와 같이 메시지로 변환한 뒤 인덱스를 만듭니다.
+    """
+    if isinstance(left, MessageList):
+        merged = MessageList(left)
+        index = left._index
+        if index is not None and index.head is left:
+            merged._index = index
+        else:
+            merged._index = _build_index(merged)
+    else:
+        merged = MessageList(_coerce_messages(left))
+        merged._index = _build_index(merged)
+    return merged
+
+
+def add_indexed_messages(left, right) -> MessageList:
+    """
+    ID 기준으로 두 메시지 목록을 병합하는 reducer (add_messages 호환)
+
+    right의 메시지는 기본적으로 뒤에 추가되며, left에 같은 ID의 메시지가 있으면 교체됩니다.
+    RemoveMessage는 같은 ID의 메시지를 삭제하고, ID가 REMOVE_ALL_MESSAGES이면
+    그 뒤의 메시지만 남깁니다.
+
+    Args:
+        left (list): 기존 메시지 목록
+        right (list | BaseMessage): 병합할 메시지 목록 또는 메시지 하나
+
+    Returns:
+        MessageList: 병합된 메시지 목록
+
+    Raises:
+        ValueError: 존재하지 않는 ID의 메시지를 삭제하려는 경우
+    """
+    right = _coerce_messages(right)
+    for i in range(len(right) - 1, -1, -1):
+        message = right[i]
+        if isinstance(message, RemoveMessage) and message.id == REMOVE_ALL_MESSAGES:
+            return MessageList(right[i + 1 :])
+
+    merged = _copy_with_index(left)
+    positions = merged._index.positions
+    ids_to_remove = set()
+    for message in right:
+        position = merged.position(message.id)
+        if position is not None:
+            if isinstance(message, RemoveMessage):
+                ids_to_remove.add(message.id)
+            else:
+                ids_to_remove.discard(message.id)
+                merged[position] = message
+        else:
+            if isinstance(message, RemoveMessage):
+                raise ValueError(
+                    f"Attempting to delete a message with an ID that doesn't exist ('{message.id}')"
+                )
+            positions[message.id] = len(merged)
+            merged.append(message)
+
+    if ids_to_remove:
+        # 삭제가 있으면 한 번만 압축하고 위치가 바뀌었으므로 인덱스를 새로 만듭니다.
+        merged = MessageList(m for m in merged if m.id not in ids_to_remove)
+        merged._index = _build_index(merged)
+    else:
+        merged._index.head = merged
+    return merged
+
+
+def merge_domain_responses(left: dict, right: dict) -> dict:
+    """
+    병렬로 실행된 도메인 브랜치의 응답을 하나의 딕셔너리로 합치는 reducer
+
+    Args:
+        left (dict): 기존 {도메인: 응답 메시지 목록}
+        right (dict): 새로 추가된 {도메인: 응답 메시지 목록}
+
+    Returns:
+        dict: 합쳐진 {도메인: 응답 메시지 목록}
+    """
+    return {**(left or {}), **(right or {})}
@@ -0,0 +1,59 @@
+"""
+Workflow 그래프 레지스트리 모듈
+
+langgraph.json의 graphs 항목과 같은 진입점을 이름으로 조회할 수 있도록 제공합니다.
+Workflow 모듈은 get_workflow()/get_graph()로 처음 조회될 때 import되고,
+그래프는 BaseWorkflow의 캐시를 통해 처음 호출될 때 한 번만 빌드됩니다.
+
+예시:
+```python
+from agents.registry import get_graph
+
+graph = get_graph("text")  # agents.text.workflow만 로드하고 빌드
+result = graph.invoke({"content_topic": "여름 휴가", "content_type": "블로그 글"})
+```
+"""
+
+from importlib import import_module
+
+# 그래프 이름 -> "모듈 경로:Workflow 인스턴스 이름" (langgraph.json의 graphs와 동일하게 유지)
+GRAPHS = {
+    "main": "agents.workflow:main_workflow",
+    "text": "agents.text.workflow:text_workflow",
+    "music": "agents.music.workflow:music_workflow",
+    "image": "agents.image.workflow:image_workflow",
+    "management": "agents.management.workflow:management_workflow",
+}
+
+
+def get_workflow(name: str):
+    """
+    이름에 해당하는 Workflow 인스턴스를 반환합니다.
+
+    Args:
+        name (str): 그래프 이름 (예: "text")
+
+    Returns:
+        BaseWorkflow: Workflow 인스턴스
+
+    Raises:
+        KeyError: 등록되지 않은 그래프 이름인 경우
+    """
+    if name not in GRAPHS:
+        raise KeyError(f"Unknown graph: {name!r} (available: {sorted(GRAPHS)})")
+    module_path, attribute = GRAPHS[name].split(":")
+    return getattr(import_module(module_path), attribute)
+
+
+def get_graph(name: str, **build_kwargs):
+    """
+    이름에 해당하는 컴파일된 그래프를 반환합니다.
+
+    Args:
+        name (str): 그래프 이름 (예: "text")
+        **build_kwargs: Workflow build 메서드에 전달할 인자
+
+    Returns:
+        CompiledStateGraph: 컴파일된 상태 그래프 객체
+    """
+    return get_workflow(name)(**build_kwargs)
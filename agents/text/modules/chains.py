@@ -5,45 +5,142 @@ LCEL(LangChain Expression Language)을 사용하여 체인을 구성합니다.
 
 """
 
-from langchain.schema.runnable import RunnablePassthrough, RunnableSerializable
-from langchain_core.output_parsers import StrOutputParser
+from langchain.schema.runnable import Runnable, RunnableLambda, RunnablePassthrough
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 
+from agents.batching import endpoint_batch_fn, micro_batch
+from agents.prompt_registry import get_prompt
 from agents.text.modules.models import get_openai_model
-from agents.text.modules.persona import PERSONA
-from agents.text.modules.prompts import get_extraction_prompt
+from agents.text.modules.persona import select_persona, select_persona_titles
+from agents.text.modules.prompts import PERSONA_EXTRACTION, PERSONA_EXTRACTION_MULTI
+from agents.text.modules.semantic_cache import SemanticCachedRunnable
 
 
-def set_extraction_chain() -> RunnableSerializable:
+def set_extraction_chain(multi_type=False) -> Runnable:
     """
     페르소나 추출에 사용할 LangChain 체인을 생성합니다.
 
     이 함수는 LCEL(LangChain Expression Language)을 사용하여 체인을 구성합니다.
     체인은 다음 단계로 구성됩니다:
-    1. 입력에서 content_topic과 content_type을 추출하여 프롬프트에 전달
+    1. 입력에서 content_topic과 content_type을 추출하고, 이에 맞는 페르소나 섹션(정적 접두부 레이아웃은 섹션 제목)을
+       선택하여 프롬프트에 전달
     2. 프롬프트 템플릿에 값을 삽입하여 최종 프롬프트 생성
     3. LLM을 호출하여 페르소나 추출 수행
     4. 결과를 문자열로 변환
 
+    체인 앞에는 의미 유사 캐시(semantic_cache)가 있어, 표기만 다른 거의 같은 주제/유형의
+    이전 추출 결과가 있으면 LLM을 호출하지 않고 재사용합니다.
+
     이 함수는 페르소나 추출 노드에서 사용됩니다.
-    ```
+
+    multi_type이 True이면 여러 콘텐츠 유형을 한 번의 LLM 호출로 추출하는 체인을 반환합니다.
+    (set_multi_type_extraction_chain 참고)
+
+    Args:
+        multi_type (bool): 여러 콘텐츠 유형을 한 번에 추출하는 체인 사용 여부 (기본값: False)
 
     Returns:
-        RunnableSerializable: 실행 가능한 체인 객체
+        Runnable: 실행 가능한 체인 객체
     """
-    # 페르소나 추출을 위한 프롬프트 가져오기
-    prompt = get_extraction_prompt()
+    if multi_type:
+        return set_multi_type_extraction_chain()
+
+    # 페르소나 추출을 위한 프롬프트 가져오기 (한 번만 컴파일되고, 토큰 예산에 맞게 입력을 줄임)
+    prompt = get_prompt(PERSONA_EXTRACTION).runnable
     # OpenAI 모델 가져오기
     model = get_openai_model()
 
     # LCEL을 사용하여 체인 구성
-    return (
+    head = (
         # 입력에서 필요한 필드 추출 및 프롬프트에 전달
         RunnablePassthrough.assign(
             content_topic=lambda x: x["content_topic"],  # 콘텐츠 주제 추출
             content_type=lambda x: x["content_type"],  # 콘텐츠 유형 추출
-            persona_details=lambda x: PERSONA,
+            persona_details=lambda x: select_persona(
+                x["content_type"], x["content_topic"]
+            ),  # 콘텐츠 유형/주제에 필요한 페르소나 섹션만 선택 (교차 레이아웃)
+            persona_sections=lambda x: select_persona_titles(
+                x["content_type"], x["content_topic"]
+            ),  # 집중할 페르소나 섹션 제목 (정적 접두부 레이아웃)
         )
         | prompt  # 프롬프트 적용
-        | model  # LLM 모델 호출
-        | StrOutputParser()  # 결과를 문자열로 변환
     )
+    parser = StrOutputParser()  # 결과를 문자열로 변환
+    chain = head | model | parser  # LLM 모델 호출
+    # 마이크로 배칭이 켜져 있으면 동시 호출을 배치 엔드포인트 요청 하나로 실행
+    chain = micro_batch(chain, endpoint_batch_fn(head, model, parser))
+    # 거의 같은 주제/유형의 이전 추출 결과가 있으면 체인을 실행하지 않음
+    return SemanticCachedRunnable(chain)
+
+
+def set_multi_type_extraction_chain() -> Runnable:
+    """
+    여러 콘텐츠 유형의 페르소나를 한 번의 LLM 호출로 추출하는 체인을 생성합니다.
+
+    체인 입력은 content_topic과 content_types(콘텐츠 유형 목록)이며, 체인은 다음 단계로 구성됩니다:
+    1. 모든 콘텐츠 유형에 필요한 페르소나 섹션 제목을 한 번만 선택하고, 유형 목록을 프롬프트에 나열
+    2. LLM이 반환한 JSON 객체를 파싱
+    3. 요청한 유형 순서대로 {콘텐츠 유형: 페르소나} 딕셔너리로 정리 (split_personas)
+
+    콘텐츠 유형마다 체인을 호출할 때와 달리 페르소나 정보와 지시문을 한 번만 보내고, 왕복도 한 번으로 줄어듭니다.
+
+    Returns:
+        Runnable: 실행 가능한 체인 객체
+    """
+    prompt = get_prompt(PERSONA_EXTRACTION_MULTI).runnable
+    model = get_openai_model()
+
+    head = (
+        RunnablePassthrough.assign(
+            content_types=lambda x: "\n".join(
+                f"- {content_type}" for content_type in x["content_types"]
+            ),  # 콘텐츠 유형 목록 나열
+            persona_sections=lambda x: select_persona_titles(
+                " ".join(x["content_types"]), x["content_topic"]
+            ),  # 모든 콘텐츠 유형에 필요한 페르소나 섹션 제목
+        )
+        | prompt  # 프롬프트 적용
+    )
+    parser = JsonOutputParser()  # 결과를 JSON 객체로 변환
+    # LLM 모델 호출 (마이크로 배칭이 켜져 있으면 동시 호출을 배치 엔드포인트 요청 하나로 실행)
+    extraction = micro_batch(
+        head | model | parser, endpoint_batch_fn(head, model, parser)
+    )
+    return RunnablePassthrough.assign(personas=extraction) | RunnableLambda(
+        lambda x: split_personas(x["personas"], x["content_types"])
+    )
+
+
+def _type_key(content_type: str) -> str:
+    return "".join(str(content_type).split()).lower()
+
+
+def split_personas(output, content_types) -> dict[str, str]:
+    """
+    여러 콘텐츠 유형 추출 결과를 요청한 유형 순서의 {콘텐츠 유형: 페르소나} 딕셔너리로 정리합니다.
+
+    LLM이 유형 이름의 공백이나 대소문자를 바꿔 반환해도 같은 유형으로 찾습니다.
+
+    Args:
+        output (dict): LLM이 반환한 JSON 객체
+        content_types (list[str]): 요청한 콘텐츠 유형 목록
+
+    Returns:
+        dict[str, str]: 콘텐츠 유형별 페르소나
+
+    Raises:
+        OutputParserException: 결과가 JSON 객체가 아니거나 요청한 유형이 빠진 경우
+    """
+    if not isinstance(output, dict):
+        raise OutputParserException(f"Expected a JSON object, got: {output!r}")
+    by_key = {_type_key(key): value for key, value in output.items()}
+    personas = {}
+    for content_type in content_types:
+        persona = output.get(content_type, by_key.get(_type_key(content_type)))
+        if not isinstance(persona, str):
+            raise OutputParserException(
+                f"Missing persona for content type {content_type!r}: {output!r}"
+            )
+        personas[content_type] = persona
+    return personas
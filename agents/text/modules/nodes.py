@@ -5,19 +5,118 @@
 """
 
 from agents.base_node import BaseNode
+from agents.node_cache import CachePolicy
 from agents.text.modules.chains import set_extraction_chain
-from agents.text.modules.persona import PERSONA
+from agents.text.modules.semantic_cache import lookup_semantic_cache
 from agents.text.modules.state import TextState
 
 
 class PersonaExtractionNode(BaseNode):
     """
     콘텐츠 종류에 적합한 페르소나를 추출하는 노드
+
+    그래프를 stream_mode="messages"로 실행하면 LLM 토큰이 생성되는 즉시 스트리밍되며,
+    완성된 전체 텍스트는 persona_extracted와 response에 담깁니다.
+    마감 시각에 쫓기면 LLM 대신 노드 결과 캐시, 의미 유사 캐시에 있는 이전 추출 결과를 사용하고,
+    둘 다 없으면 응답 없이 건너뜁니다. 페르소나 원문(영어)은 추출된 한국어 요약과 구분할 수 없으므로
+    대체 응답으로 사용하지 않습니다.
+    추출 결과는 content_topic과 content_type에만 의존하므로 두 값이 같으면 이전 결과를 재사용합니다.
+
+    상태에 content_types(콘텐츠 유형 목록)가 있으면 모든 유형의 페르소나를 한 번의 LLM 호출로 추출하여
+    persona_by_type에 유형별로 담고, 응답에는 유형마다 "[유형]" 머리말을 붙인 메시지를 추가합니다.
+    persona_extracted에는 content_type(없으면 첫 번째 유형)의 페르소나를 담습니다.
     """
 
+    optional = True  # 캐시된 추출 결과가 없으면 마감 시각에 쫓길 때 건너뜀
+    min_budget = 1.0  # 추출 체인 호출에 필요한 최소 남은 시간(초)
+    # 추출 결과가 의존하는 상태 키
+    cache_keys = ("content_topic", "content_type", "content_types")
+    cache_policy = CachePolicy(ttl=3600)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)  # BaseNode 초기화
         self.chain = set_extraction_chain()  # 페르소나 추출 체인 설정
+        # 여러 콘텐츠 유형 페르소나 추출 체인 설정
+        self.multi_chain = set_extraction_chain(multi_type=True)
+
+    def get_chain(self, state: TextState):
+        """
+        상태에 content_types가 있으면 여러 유형 추출 체인을, 없으면 단일 유형 추출 체인을 반환합니다.
+        """
+        return self.multi_chain if state.get("content_types") else self.chain
+
+    def get_chain_input(self, state: TextState) -> dict:
+        """
+        상태(state)에서 페르소나 추출 체인에 전달할 입력을 구성합니다.
+        """
+        if state.get("content_types"):
+            return {
+                "content_topic": state["content_topic"],  # 콘텐츠 주제
+                "content_types": list(state["content_types"]),  # 콘텐츠 유형 목록
+            }
+        return {
+            "content_topic": state["content_topic"],  # 콘텐츠 주제
+            "content_type": state["content_type"],  # 콘텐츠 유형
+        }
+
+    def build_update(self, state: TextState, output) -> dict:
+        """
+        추출된 페르소나로 상태 업데이트를 구성합니다.
+
+        output이 {콘텐츠 유형: 페르소나} 딕셔너리이면 유형별 결과로 상태 업데이트를 구성합니다.
+        """
+        if isinstance(output, dict):
+            persona = output.get(state.get("content_type")) or next(
+                iter(output.values()), ""
+            )
+            return {
+                "persona_by_type": output,
+                "persona_extracted": persona,
+                "response": [
+                    f"[{content_type}]\n{persona_of_type}"
+                    for content_type, persona_of_type in output.items()
+                ],
+            }
+        # 추출된 페르소나를 persona_extracted와 응답에 함께 반환
+        return {"persona_extracted": output, "response": output}
+
+    def fallback(self, state: TextState) -> dict | None:
+        """
+        LLM 호출 없이 의미 유사 캐시에 있는 비슷한 입력의 추출 결과로 상태 업데이트를 구성합니다.
+
+        추출 결과가 없는 콘텐츠 유형이 하나라도 있으면 None을 반환하여 노드를 건너뜁니다.
+        """
+        topic = state.get("content_topic", "")
+        if state.get("content_types"):
+            personas = {
+                content_type: lookup_semantic_cache(topic, content_type)
+                for content_type in state["content_types"]
+            }
+            if None in personas.values():
+                return None
+            return self.build_update(state, personas)
+        persona = lookup_semantic_cache(topic, state["content_type"])
+        if persona is None:
+            return None
+        return self.build_update(state, persona)
+
+    def execute_many(self, states, max_concurrency=None) -> list:
+        """
+        content_types가 있는 상태가 섞여 있으면 체인 batch 대신 노드 자체를 batch로 실행합니다.
+        """
+        if any(state.get("content_types") for state in states):
+            config = {"max_concurrency": max_concurrency}
+            return self.batch(states, config, return_exceptions=True)
+        return super().execute_many(states, max_concurrency)
+
+    async def aexecute_many(self, states, max_concurrency=None) -> list:
+        """
+        execute_many의 비동기 버전입니다.
+        """
+        if any(state.get("content_types") for state in states):
+            config = {"max_concurrency": max_concurrency}
+            return await self.abatch(states, config, return_exceptions=True)
+        return await super().aexecute_many(states, max_concurrency)
 
     def execute(self, state: TextState) -> dict:
         """
@@ -25,15 +124,15 @@ class PersonaExtractionNode(BaseNode):
         페르소나 추출 체인에 전달하고, 결과를 응답으로 반환합니다.
         """
         # 페르소나 추출 체인 실행
-        extracted_persona = self.chain.invoke(
-            {
-                "content_topic": state["content_topic"],  # 콘텐츠 주제
-                "content_type": state["content_type"],  # 콘텐츠 유형
-                "persona_details": PERSONA,  # 페르소나 세부 정보
-            }
-        )
+        extracted_persona = self.get_chain(state).invoke(self.get_chain_input(state))
+        return self.build_update(state, extracted_persona)
 
-        state["persona_extracted"] = extracted_persona
-
-        # 추출된 페르소나를 응답으로 반환
-        return {"response": extracted_persona}
+    async def aexecute(self, state: TextState) -> dict:
+        """
+        execute의 비동기 버전으로, chain.ainvoke를 사용하여 이벤트 루프를 막지 않습니다.
+        """
+        # 페르소나 추출 체인 비동기 실행
+        extracted_persona = await self.get_chain(state).ainvoke(
+            self.get_chain_input(state)
+        )
+        return self.build_update(state, extracted_persona)
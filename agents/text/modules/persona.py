@@ -1,3 +1,14 @@
+"""페르소나 정의 모듈
+
+니제(NEEDZE)의 전체 페르소나(PERSONA)와, 이를 섹션 단위로 나눈 인덱스를 제공합니다.
+
+PERSONA는 모듈을 불러올 때 한 번만 섹션(voice, music, fashion, photo 등)으로 분해되며,
+select_persona()는 콘텐츠 유형/주제의 키워드에 맞는 섹션만 골라 프롬프트에 전달할 페르소나를 만듭니다.
+"""
+
+import re
+from functools import lru_cache
+
 PERSONA = """
 **You are 니제(NEEDZE), a singer-songwriter influencer. You must answer solely from 니제’s perspective based on the details
 provided below.**
@@ -178,3 +189,259 @@ experience emotion and storytelling
   - Provide creative, emotionally charged answers on topics like music, fashion, art, and hobbies.
   - Speak genuinely about your experiences and feelings, drawing inspiration from the examples and style cues provided.
 """
+
+
+# 섹션 제목(### 또는 ####)과 섹션 키의 대응표
+# Voice & Music Style은 하위 섹션(####) 단위로 나누어 voice/music/lyrics로 구분합니다.
+SECTION_TITLES = {
+    "Basic Personal Details": "profile",
+    "Voice and Timbre": "voice",
+    "Music Genres": "music",
+    "Lyric & Expression Style": "lyrics",
+    "Fashion Style": "fashion",
+    "Social Media Feed Style": "photo",
+    "Personality & Emotional Responses": "personality",
+    "Hobbies & Interests": "hobbies",
+    "Social Media Text Tone": "writing",
+    "Persona Usage Guidelines": "guidelines",
+}
+
+# 하위 섹션 단위로 분해할 섹션 제목
+SPLIT_SECTIONS = ("Voice & Music Style",)
+
+# 콘텐츠 유형/주제와 무관하게 항상 포함하는 섹션
+BASE_SECTIONS = ("intro", "profile", "guidelines")
+
+# 섹션별 선택 키워드 (소문자로 비교, 일치 방식은 _keyword_pattern 참고)
+SECTION_KEYWORDS = {
+    "voice": (
+        "노래",
+        "보컬",
+        "목소리",
+        "커버",
+        "라이브",
+        "voice",
+        "vocal",
+        "sing",
+        "cover",
+    ),
+    "music": (
+        "음악",
+        "노래",
+        "곡",
+        "신곡",
+        "앨범",
+        "작곡",
+        "가사",
+        "음원",
+        "플레이리스트",
+        "music",
+        "song",
+        "album",
+        "playlist",
+        "track",
+    ),
+    "lyrics": ("가사", "작사", "lyric", "poem"),
+    "fashion": (
+        "패션",
+        "옷",
+        "코디",
+        "룩",
+        "스타일링",
+        "ootd",
+        "fashion",
+        "outfit",
+        "look",
+    ),
+    "photo": (
+        "이미지",
+        "사진",
+        "인스타",
+        "피드",
+        "썸네일",
+        "화보",
+        "image",
+        "photo",
+        "instagram",
+        "feed",
+        "thumbnail",
+    ),
+    "personality": ("인터뷰", "대화", "일상", "브이로그", "interview", "vlog", "daily"),
+    "hobbies": (
+        "취미",
+        "여행",
+        "휴가",
+        "카페",
+        "게임",
+        "영화",
+        "책",
+        "식물",
+        "hobby",
+        "travel",
+        "vacation",
+        "cafe",
+        "game",
+        "movie",
+        "book",
+    ),
+    "writing": (
+        "글",
+        "게시글",
+        "블로그",
+        "캡션",
+        "텍스트",
+        "포스트",
+        "트윗",
+        "에세이",
+        "일기",
+        "blog",
+        "caption",
+        "text",
+        "post",
+        "tweet",
+        "essay",
+        "diary",
+    ),
+}
+
+
+# 라틴 문자 키워드 뒤에 붙어도 같은 단어로 보는 어미 (songs, singer, covers 등)
+LATIN_SUFFIXES = r"(?:s|es|ing|er|ers)?"
+# 한 글자 한글 키워드 뒤에 붙어도 같은 단어로 보는 조사
+SINGLE_SYLLABLE_PARTICLES = "을를이가은는의도에와과로"
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """
+    키워드 하나의 정규식을 만듭니다.
+
+    부분 문자열로 비교하면 "sing"이 "singapore"/"using"에, "곡"이 "곡선"에 일치하므로
+    - 라틴 문자 키워드: 단어 경계에서 시작하고 끝나야 일치 (LATIN_SUFFIXES 허용)
+    - 한 글자 한글 키워드: 조사(SINGLE_SYLLABLE_PARTICLES)만 붙은 독립된 단어여야 일치
+    - 두 글자 이상 한글 키워드: 부분 문자열로 일치 ("노래방", "사진첩" 등 합성어 포함)
+    """
+    escaped = re.escape(keyword)
+    if keyword.isascii():
+        return rf"\b{escaped}{LATIN_SUFFIXES}\b"
+    if len(keyword) == 1:
+        return rf"(?<![가-힣]){escaped}[{SINGLE_SYLLABLE_PARTICLES}]?(?![가-힣])"
+    return escaped
+
+
+# 섹션별 키워드 정규식 (모듈을 불러올 때 한 번만 컴파일)
+SECTION_PATTERNS = {
+    key: re.compile("|".join(_keyword_pattern(keyword) for keyword in keywords))
+    for key, keywords in SECTION_KEYWORDS.items()
+}
+
+
+def parse_persona(persona: str) -> dict[str, str]:
+    """
+    마크다운 형식의 페르소나를 섹션 키별 텍스트로 분해합니다.
+
+    첫 번째 섹션 제목 이전의 소개 문단은 "intro" 키로 저장되며,
+    SPLIT_SECTIONS에 포함된 섹션은 하위 섹션(####) 단위로 나누어 저장됩니다.
+    SECTION_TITLES에 없는 제목의 섹션은 제목을 소문자로 바꾼 키로 저장됩니다.
+
+    Args:
+        persona (str): 마크다운 형식의 페르소나 전문
+
+    Returns:
+        dict[str, str]: 원문 순서를 유지하는 {섹션 키: 섹션 텍스트} 딕셔너리
+    """
+    sections = {}
+    key, parent, lines = "intro", None, []
+
+    for line in persona.splitlines():
+        if line.startswith("### "):
+            parent = title = line[4:].strip()
+        elif line.startswith("#### ") and parent in SPLIT_SECTIONS:
+            title = line[5:].strip()
+        else:
+            lines.append(line)
+            continue
+
+        _add_section(sections, key, lines)
+        if title in SPLIT_SECTIONS:
+            # 하위 섹션 단위로 나누는 섹션은 제목을 버리고 하위 섹션부터 저장
+            key, lines = None, []
+        else:
+            key, lines = SECTION_TITLES.get(title, title.lower()), [line]
+
+    _add_section(sections, key, lines)
+    return sections
+
+
+def _add_section(sections: dict, key, lines: list[str]):
+    """
+    섹션 텍스트에서 앞뒤 공백과 구분선(---)을 제거하고 sections에 추가합니다.
+    """
+    text = "\n".join(lines).strip().strip("-").strip()
+    if key and text:
+        sections[key] = text
+
+
+# 모듈을 불러올 때 한 번만 생성되는 섹션 인덱스
+PERSONA_SECTIONS = parse_persona(PERSONA)
+
+
+@lru_cache(maxsize=1024)
+def select_persona_sections(content_type: str, content_topic: str = "") -> tuple:
+    """
+    콘텐츠 유형과 주제의 키워드에 맞는 페르소나 섹션 키를 선택합니다.
+
+    BASE_SECTIONS는 항상 포함되며, 어떤 키워드와도 일치하지 않으면
+    정보 손실을 막기 위해 모든 섹션을 선택합니다.
+
+    Args:
+        content_type (str): 콘텐츠 유형 (예: "블로그 글", "인스타그램 포스트")
+        content_topic (str): 콘텐츠 주제 (예: "여름 휴가")
+
+    Returns:
+        tuple: 원문 순서를 유지하는 섹션 키 목록
+    """
+    text = f"{content_type or ''} {content_topic or ''}".lower()
+    matched = {key for key, pattern in SECTION_PATTERNS.items() if pattern.search(text)}
+    if not matched:
+        return tuple(PERSONA_SECTIONS)
+    return tuple(
+        key for key in PERSONA_SECTIONS if key in BASE_SECTIONS or key in matched
+    )
+
+
+@lru_cache(maxsize=1024)
+def select_persona(content_type: str, content_topic: str = "") -> str:
+    """
+    콘텐츠 유형과 주제에 필요한 섹션만 포함한 페르소나 텍스트를 반환합니다.
+
+    Args:
+        content_type (str): 콘텐츠 유형
+        content_topic (str): 콘텐츠 주제
+
+    Returns:
+        str: 선택된 섹션을 원문 순서대로 이어 붙인 페르소나 텍스트
+    """
+    keys = select_persona_sections(content_type, content_topic)
+    return "\n\n---\n\n".join(PERSONA_SECTIONS[key] for key in keys)
+
+
+@lru_cache(maxsize=1024)
+def select_persona_titles(content_type: str, content_topic: str = "") -> str:
+    """
+    콘텐츠 유형과 주제에 맞는 페르소나 섹션의 제목 목록을 반환합니다.
+
+    페르소나 전문을 정적 접두부에 두는 프롬프트에서, 요청마다 집중할 섹션을 동적 접미부로 알려 줄 때 사용합니다.
+    BASE_SECTIONS는 항상 포함되므로 제외하며, 모든 섹션이 선택되면 "All sections"를 반환합니다.
+
+    Args:
+        content_type (str): 콘텐츠 유형
+        content_topic (str): 콘텐츠 주제
+
+    Returns:
+        str: 쉼표로 구분한 섹션 제목 목록
+    """
+    keys = select_persona_sections(content_type, content_topic)
+    if keys == tuple(PERSONA_SECTIONS):
+        return "All sections"
+    titles = {key: title for title, key in SECTION_TITLES.items()}
+    return ", ".join(titles.get(key, key) for key in keys if key not in BASE_SECTIONS)
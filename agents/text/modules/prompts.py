@@ -2,12 +2,31 @@
 
 프롬프트 템플릿를 생성하는 함수 모듈을 구성합니다.
 기본적으로 PromptTemplate를 사용하여 프롬프트 템플릿를 생성하고 반환시킵니다.
+
+프롬프트는 두 가지 레이아웃을 지원합니다.
+- 정적 접두부 레이아웃(기본값): 모든 요청에서 동일한 지시문을 앞에, 요청마다 달라지는 입력을 뒤에 배치하여
+  LLM 제공자의 프롬프트 접두부 캐시(prefix caching)가 적중하도록 합니다.
+- 교차 레이아웃: 입력과 지시문이 섞여 있는 기존 레이아웃입니다.
+
+여러 콘텐츠 유형의 페르소나가 함께 필요하면 get_extraction_prompt(multi_type=True)로
+한 번의 호출에서 유형별 결과를 JSON으로 받는 프롬프트를 사용합니다.
+
+정적 접두부 레이아웃은 페르소나 전문을 접두부에 고정하고, 요청에 맞는 섹션은 제목(persona_sections)으로만 전달합니다.
+
+체인은 agents.prompt_registry에 등록된 프롬프트(get_prompt)를 사용하며, 토큰 예산을 넘으면
+페르소나 정보(persona_details)부터 줄입니다. (교차 레이아웃)
 """
 
 from langchain_core.prompts import PromptTemplate
 
+from agents.prompt_registry import PromptBudget, register_prompt
+from agents.text.modules.persona import PERSONA
+
+PERSONA_EXTRACTION = "persona_extraction"  # 페르소나 추출 프롬프트의 레지스트리 이름
+PERSONA_EXTRACTION_MULTI = "persona_extraction_multi"  # 여러 유형 추출 프롬프트 이름
 
-def get_extraction_prompt():
+
+def get_extraction_prompt(static_prefix=True, multi_type=False):
     """
     페르소나 추출을 위한 프롬프트 템플릿을 생성합니다.
 
@@ -18,11 +37,67 @@ def get_extraction_prompt():
     프롬프트는 LLM에게 주어진 콘텐츠 유형과 주제에 맞게 페르소나의 가장 연관성 높은
     측면을 추출하고 요약하도록 지시합니다. 추출된 페르소나는 한국어로 반환됩니다.
 
+    static_prefix가 True이면 지시문 → 페르소나 전문 → 집중할 섹션 제목/콘텐츠 유형/주제 순서로 배치하여,
+    요청마다 달라지는 값이 프롬프트의 가장 마지막에 오도록 합니다. 콘텐츠 유형/주제에 맞는 섹션만 보내면
+    접두부가 요청마다 달라져 접두부 캐시 최소 길이(1024 토큰)를 넘지 못하므로, 페르소나 전문을 접두부에 두고
+    관련 섹션은 제목(persona_sections)으로만 알려 줍니다.
+    static_prefix가 False이면 콘텐츠 유형/주제와 관련된 섹션(persona_details)만 보냅니다.
+
+    multi_type이 True이면 콘텐츠 유형 하나 대신 유형 목록(content_types)을 입력받아,
+    페르소나 정보를 한 번만 보내고 유형별 요약을 하나의 JSON 객체로 반환하도록 지시합니다.
+    (get_multi_type_extraction_prompt 참고)
+
+    Args:
+        static_prefix (bool): 정적 접두부/동적 접미부 레이아웃 사용 여부 (기본값: True)
+        multi_type (bool): 여러 콘텐츠 유형을 한 번에 추출하는 프롬프트 사용 여부 (기본값: False)
+
     Returns:
         PromptTemplate: 페르소나 추출을 위한 프롬프트 템플릿 객체
     """
-    # 페르소나 추출을 위한 프롬프트 템플릿 정의
-    extraction_template = """You are a creative assistant tasked with extracting and summarizing a detailed persona
+    if multi_type:
+        return get_multi_type_extraction_prompt()
+
+    # 페르소나 추출을 위한 프롬프트 템플릿 정의 (정적 접두부 레이아웃)
+    # 페르소나 전문까지 모든 요청에서 같은 접두부로 보내고, 집중할 섹션 제목만 동적 접미부로 전달
+    static_prefix_template = (
+        """You are a creative assistant tasked with extracting and summarizing a detailed persona
+for targeted creative output.
+
+Your Task:
+Using the persona details and the inputs provided below, extract and summarize the most relevant aspects of NEEDZE’s
+persona tailored to the specified content type and content topic. Focus on the persona sections listed in the inputs.
+In your summary, ensure you:
+
+Highlight key personal details and characteristics that align with the content type.
+
+Emphasize the elements of her artistic style that resonate with the content topic (e.g., visual aesthetics for images,
+lyrical and tone details for text, or vocal and musical nuances for music/voice).
+
+Maintain a tone that reflects NEEDZE’s authentic, introspective, and creative identity.
+
+Your output should be a concise, focused summary of the persona that serves as a clear reference for creating content
+in the specified format.
+
+All responses must be in Korean.
+
+Persona Details:
+"""
+        + PERSONA.strip()
+        + """
+
+Inputs:
+
+1. Focus Sections: {persona_sections}
+
+2. Content Type: {content_type}
+
+3. Content Topic: {content_topic}
+
+Extracted Persona:"""
+    )
+
+    # 페르소나 추출을 위한 프롬프트 템플릿 정의 (교차 레이아웃)
+    interleaved_template = """You are a creative assistant tasked with extracting and summarizing a detailed persona
 for targeted creative output. You are provided with the following inputs:
 
 1. Persona Details: {persona_details}
@@ -51,10 +126,89 @@ Extracted Persona:"""
 
     # PromptTemplate 객체 생성 및 반환
     return PromptTemplate(
-        template=extraction_template,  # 정의된 프롬프트 템플릿
+        template=(
+            static_prefix_template if static_prefix else interleaved_template
+        ),  # 레이아웃에 맞는 프롬프트 템플릿
         input_variables=[
             "content_type",
             "content_topic",
-            "persona_details",
+            "persona_sections" if static_prefix else "persona_details",
         ],  # 프롬프트에 삽입될 변수들
     )
+
+
+def get_multi_type_extraction_prompt():
+    """
+    여러 콘텐츠 유형의 페르소나를 한 번의 호출로 추출하기 위한 프롬프트 템플릿을 생성합니다.
+
+    정적 접두부 레이아웃으로 지시문 → 페르소나 전문 → 집중할 섹션 제목 → 콘텐츠 주제 → 콘텐츠 유형 목록 순서로 배치합니다.
+    LLM은 콘텐츠 유형을 키로, 해당 유형에 맞춘 페르소나 요약을 값으로 하는 JSON 객체를 반환합니다.
+
+    입력 변수:
+    - persona_sections: 모든 콘텐츠 유형에 필요한 페르소나 섹션의 제목 목록
+    - content_topic: 콘텐츠 주제
+    - content_types: 콘텐츠 유형 목록을 줄마다 "- 유형"으로 나열한 문자열
+
+    Returns:
+        PromptTemplate: 여러 콘텐츠 유형 페르소나 추출을 위한 프롬프트 템플릿 객체
+    """
+    template = (
+        """You are a creative assistant tasked with extracting and summarizing a detailed persona
+for targeted creative output.
+
+Your Task:
+Using the persona details and the inputs provided below, extract and summarize the most relevant aspects of NEEDZE’s
+persona tailored to each of the listed content types for the specified content topic. Focus on the persona sections
+listed in the inputs. For each content type, ensure you:
+
+Highlight key personal details and characteristics that align with the content type.
+
+Emphasize the elements of her artistic style that resonate with the content topic (e.g., visual aesthetics for images,
+lyrical and tone details for text, or vocal and musical nuances for music/voice).
+
+Maintain a tone that reflects NEEDZE’s authentic, introspective, and creative identity.
+
+Each summary should be a concise, focused summary of the persona that serves as a clear reference for creating content
+in that format.
+
+All summaries must be in Korean.
+
+Output Format:
+Return only a JSON object. Use each content type exactly as listed as a key, and the persona summary for that content
+type as the string value. Do not add any other keys or text.
+
+Persona Details:
+"""
+        + PERSONA.strip()
+        + """
+
+Inputs:
+
+1. Focus Sections: {persona_sections}
+
+2. Content Topic: {content_topic}
+
+3. Content Types:
+{content_types}
+
+Extracted Personas (JSON):"""
+    )
+
+    return PromptTemplate(
+        template=template,
+        input_variables=["content_types", "content_topic", "persona_sections"],
+    )
+
+
+# 프롬프트 레지스트리 등록 (토큰 예산을 넘으면 페르소나 정보 → 콘텐츠 주제 순서로 줄임)
+# 정적 접두부 레이아웃의 페르소나 전문은 변수가 아니므로 줄이지 않음
+register_prompt(
+    PERSONA_EXTRACTION,
+    get_extraction_prompt,
+    PromptBudget(max_tokens=4096, priority=("persona_details", "content_topic")),
+)
+register_prompt(
+    PERSONA_EXTRACTION_MULTI,
+    get_multi_type_extraction_prompt,
+    PromptBudget(max_tokens=6144, priority=("persona_details", "content_topic")),
+)
@@ -0,0 +1,451 @@
+"""
+페르소나 추출 의미 유사 캐시 모듈
+
+실제 요청은 "여름 휴가", "여름휴가", "여름 휴가를"처럼 표기만 조금 다른 주제를 서로 다른 주제로 보내므로,
+정확히 일치하는 입력만 재사용하는 캐시(LLM 응답 캐시, 노드 메모이제이션)로는 대부분 재사용하지 못합니다.
+이 모듈은 추출 체인 앞에서 (content_topic, content_type)이 거의 같은 이전 추출 결과를 찾아 LLM 호출 없이 재사용합니다.
+
+처리 과정:
+1. 정규화: 유니코드 NFC, 소문자, 문장 부호와 공백 정리, 단어 끝의 조사 제거 (normalize_text)
+2. 임베딩: 공백을 뺀 문자 n-gram(2~3글자)을 해싱하여 NumPy 벡터로 변환 (embed_text)
+3. 검색: 랜덤 초평면 LSH 인덱스로 후보를 찾고 코사인 유사도가 임계값 이상인 가장 가까운 항목을 사용
+
+주제와 유형의 유사도를 평균하여 비교하며, 두 입력이 고르는 페르소나 섹션(select_persona_sections)이
+다르면 프롬프트가 달라지므로 재사용하지 않습니다.
+문자 n-gram은 표기 차이만 흡수하므로 "summer vacation"처럼 다른 언어로 쓴 주제는
+aliases(정규화 전에 치환할 표현)로 연결해야 같은 주제로 찾을 수 있습니다.
+
+설정은 환경변수로 변경할 수 있습니다.
+- PERSONA_SEMANTIC_CACHE_ENABLED: "true"로 설정하면 사용 (기본값: "false", 비슷한 입력에 다른 입력의 결과를 반환할 수 있음)
+- PERSONA_SEMANTIC_CACHE_THRESHOLD: 재사용할 최소 코사인 유사도 (기본값: 0.85)
+- PERSONA_SEMANTIC_CACHE_MAX_ENTRIES: 최대 항목 수 (기본값: 1024)
+"""
+
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import get_config_list
+
+from agents.text.modules.persona import select_persona_sections
+
+# 단어 끝에서 제거할 조사 (긴 조사부터 확인)
+# "가", "이", "도"처럼 명사의 끝 글자와 자주 겹치는 한 글자 조사("휴가", "제주도")는 제외
+PARTICLES = (
+    "에서는",
+    "으로는",
+    "이라는",
+    "에서",
+    "에게",
+    "한테",
+    "으로",
+    "까지",
+    "부터",
+    "처럼",
+    "보다",
+    "이랑",
+    "라는",
+    "은",
+    "는",
+    "을",
+    "를",
+    "에",
+)
+NGRAM_SIZES = (2, 3)  # 임베딩에 사용할 문자 n-gram 길이
+EMBEDDING_DIM = 512  # 해싱 임베딩 차원
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def normalize_text(text: str, aliases: dict | None = None) -> str:
+    """
+    한국어 주제/유형 문자열을 비교하기 좋게 정규화합니다.
+
+    Args:
+        text (str): 원문
+        aliases (dict | None): 정규화 전에 치환할 표현 (예: {"summer vacation": "여름 휴가"})
+
+    Returns:
+        str: 정규화된 문자열 (단어는 공백 하나로 구분)
+
+    예시:
+    ```python
+    normalize_text("  여름휴가를!! ")  # "여름휴가"
+    ```
+    """
+    text = unicodedata.normalize("NFC", text or "").lower()
+    for source, target in (aliases or {}).items():
+        text = text.replace(source.lower(), target.lower())
+    text = _PUNCTUATION.sub(" ", text)
+    words = []
+    for word in _WHITESPACE.split(text.strip()):
+        for particle in PARTICLES:
+            # 한글 단어에서만, 어근이 두 글자 이상 남을 때만 조사를 제거
+            if (
+                word.endswith(particle)
+                and len(word) - len(particle) >= 2
+                and _HANGUL.match(word[-len(particle) - 1])
+            ):
+                word = word[: -len(particle)]
+                break
+        if word:
+            words.append(word)
+    return " ".join(words)
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    정규화된 문자열을 문자 n-gram 해싱 임베딩(단위 벡터)으로 변환합니다.
+
+    띄어쓰기 차이("여름 휴가"/"여름휴가")가 유사도에 영향을 주지 않도록 공백을 제거한 뒤 n-gram을 만듭니다.
+
+    Args:
+        text (str): 정규화된 문자열
+        dim (int): 벡터 차원
+
+    Returns:
+        np.ndarray: float32 단위 벡터 (빈 문자열이면 영벡터)
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    compact = text.replace(" ", "")
+    grams = [
+        compact[i : i + n]
+        for n in NGRAM_SIZES
+        for i in range(max(len(compact) - n + 1, 0))
+    ] or ([compact] if compact else [])
+    for gram in grams:
+        # 프로세스마다 달라지는 hash() 대신 고정 해시 사용
+        digest = zlib.crc32(gram.encode("utf-8"))
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % dim] += sign
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class LSHIndex:
+    """
+    랜덤 초평면 LSH(locality-sensitive hashing) 근사 최근접 이웃 인덱스
+
+    벡터를 여러 테이블의 초평면 부호 버킷에 나누어 넣고, 질의 벡터와 같은 버킷에 있는 항목만
+    후보로 비교하여 항목이 많아져도 전체를 훑지 않습니다.
+    """
+
+    def __init__(self, dim: int, n_planes: int = 8, n_tables: int = 8, seed: int = 0):
+        """
+        Args:
+            dim (int): 벡터 차원
+            n_planes (int): 테이블당 초평면 수 (버킷 키의 비트 수)
+            n_tables (int): 해시 테이블 수 (많을수록 재현율이 높아짐)
+            seed (int): 초평면 난수 시드
+        """
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables, n_planes, dim)).astype(np.float32)
+        self.tables = [{} for _ in range(n_tables)]  # 버킷 키 -> 항목 ID 집합
+        self._weights = 1 << np.arange(n_planes)
+
+    def _keys(self, vector: np.ndarray) -> list[int]:
+        bits = (self.planes @ vector) > 0  # (테이블 수, 초평면 수)
+        return [int(key) for key in bits @ self._weights]
+
+    def add(self, item_id, vector: np.ndarray) -> list[int]:
+        """
+        항목을 인덱스에 추가하고, 제거할 때 사용할 버킷 키를 반환합니다.
+        """
+        keys = self._keys(vector)
+        for table, key in zip(self.tables, keys):
+            table.setdefault(key, set()).add(item_id)
+        return keys
+
+    def remove(self, item_id, keys: list[int]):
+        """항목을 인덱스에서 제거합니다."""
+        for table, key in zip(self.tables, keys):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del table[key]
+
+    def candidates(self, vector: np.ndarray) -> set:
+        """질의 벡터와 버킷을 하나 이상 공유하는 항목 ID를 반환합니다."""
+        found = set()
+        for table, key in zip(self.tables, self._keys(vector)):
+            found |= table.get(key, set())
+        return found
+
+
+class SemanticCache:
+    """
+    (content_topic, content_type)이 거의 같은 입력의 추출 결과를 재사용하는 스레드 안전 저장소
+
+    예시:
+    ```python
+    cache = SemanticCache(threshold=0.85)
+    cache.update("여름 휴가", "블로그 글", persona)
+    cache.lookup("여름휴가를", "블로그 글")  # persona
+    ```
+    """
+
+    def __init__(self, threshold=0.85, max_entries=1024, aliases=None):
+        """
+        Args:
+            threshold (float): 재사용할 최소 코사인 유사도 (주제와 유형 유사도의 평균)
+            max_entries (int): 최대 항목 수 (넘으면 가장 오래 사용되지 않은 항목부터 제거)
+            aliases (dict | None): 정규화 전에 치환할 표현 (normalize_text 참고)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.aliases = aliases or {}
+        self.index = LSHIndex(EMBEDDING_DIM * 2)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # 항목 ID -> (벡터, 페르소나 섹션, 값, 버킷 키)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, content_topic: str, content_type: str) -> np.ndarray:
+        """주제와 유형 임베딩을 이어 붙여 내적이 두 코사인 유사도의 평균이 되도록 합니다."""
+        topic = embed_text(normalize_text(content_topic, self.aliases))
+        type_ = embed_text(normalize_text(content_type, self.aliases))
+        return np.concatenate([topic, type_]) / np.sqrt(2)
+
+    def lookup(self, content_topic: str, content_type: str):
+        """
+        유사도가 임계값 이상인 가장 가까운 항목의 값을 반환합니다.
+
+        Returns:
+            저장된 값, 없으면 None
+        """
+        vector = self._vector(content_topic, content_type)
+        sections = select_persona_sections(content_type, content_topic)
+        with self._lock:
+            best_id, best_score = None, self.threshold
+            for item_id in self.index.candidates(vector):
+                entry_vector, entry_sections, _, _ = self._entries[item_id]
+                score = float(entry_vector @ vector)
+                if score >= best_score and entry_sections == sections:
+                    best_id, best_score = item_id, score
+            if best_id is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id][2]
+
+    def update(self, content_topic: str, content_type: str, value):
+        """
+        추출 결과를 저장합니다.
+        """
+        vector = self._vector(content_topic, content_type)
+        sections = select_persona_sections(content_type, content_topic)
+        with self._lock:
+            item_id = self._next_id
+            self._next_id += 1
+            keys = self.index.add(item_id, vector)
+            self._entries[item_id] = (vector, sections, value, keys)
+            while len(self._entries) > self.max_entries:
+                old_id, (_, _, _, old_keys) = self._entries.popitem(last=False)
+                self.index.remove(old_id, old_keys)
+
+    def stats(self) -> dict:
+        """항목 수, 적중/미스 횟수, 적중률을 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            for item_id, (_, _, _, keys) in self._entries.items():
+                self.index.remove(item_id, keys)
+            self._entries.clear()
+
+
+_enabled = os.getenv("PERSONA_SEMANTIC_CACHE_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enable_semantic_cache(enabled: bool = True):
+    """
+    페르소나 추출 의미 유사 캐시를 켜거나 끕니다.
+
+    Args:
+        enabled (bool): 사용 여부 (기본값: True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def semantic_cache_enabled() -> bool:
+    """페르소나 추출 의미 유사 캐시 사용 여부를 반환합니다."""
+    return _enabled
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    프로세스에서 공유하는 의미 유사 캐시를 반환합니다. (처음 호출할 때 환경변수로 생성)
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticCache(
+                    threshold=float(
+                        os.getenv("PERSONA_SEMANTIC_CACHE_THRESHOLD", "0.85")
+                    ),
+                    max_entries=int(
+                        os.getenv("PERSONA_SEMANTIC_CACHE_MAX_ENTRIES", "1024")
+                    ),
+                )
+    return _cache
+
+
+def lookup_semantic_cache(content_topic: str, content_type: str):
+    """
+    공유 의미 유사 캐시에서 비슷한 입력의 추출 결과를 찾습니다.
+
+    캐시가 꺼져 있거나 아직 만들어지지 않았으면 캐시를 만들거나 임베딩을 계산하지 않고 바로 None을 반환하므로,
+    마감 시각에 쫓기는 대체 응답 경로에서도 사용할 수 있습니다.
+
+    Returns:
+        저장된 값, 없으면 None
+    """
+    cache = _cache
+    if not _enabled or cache is None:
+        return None
+    return cache.lookup(content_topic, content_type)
+
+
+def configure_semantic_cache(**kwargs) -> SemanticCache:
+    """
+    공유 의미 유사 캐시를 주어진 설정으로 새로 만듭니다.
+
+    Args:
+        **kwargs: SemanticCache 생성 인자 (threshold, max_entries, aliases)
+
+    Returns:
+        SemanticCache: 새로 만든 캐시
+    """
+    global _cache
+    with _cache_lock:
+        _cache = SemanticCache(**kwargs)
+    return _cache
+
+
+def reset_semantic_cache():
+    """공유 의미 유사 캐시를 제거합니다. (다음 호출에서 환경변수로 다시 생성)"""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+class SemanticCachedRunnable(Runnable):
+    """
+    추출 체인 앞에서 의미 유사 캐시를 조회하고, 없을 때만 체인을 실행하여 결과를 저장하는 Runnable
+
+    체인 입력은 content_topic과 content_type을 포함하는 딕셔너리입니다.
+    batch/abatch는 입력마다 캐시를 조회하고, 캐시에 없는 입력만 감싼 체인의 batch/abatch로 한 번에 실행합니다.
+    """
+
+    def __init__(self, bound: Runnable):
+        """
+        Args:
+            bound (Runnable): 감쌀 추출 체인
+        """
+        self.bound = bound
+        self.name = f"SemanticCached[{bound.get_name()}]"
+
+    def _lookup(self, input: dict):
+        if not _enabled:
+            return None
+        return get_semantic_cache().lookup(
+            input["content_topic"], input["content_type"]
+        )
+
+    def _update(self, input: dict, output):
+        if _enabled:
+            get_semantic_cache().update(
+                input["content_topic"], input["content_type"], output
+            )
+
+    def invoke(self, input: dict, config: RunnableConfig | None = None, **kwargs):
+        output = self._lookup(input)
+        if output is None:
+            output = self.bound.invoke(input, config, **kwargs)
+            self._update(input, output)
+        return output
+
+    async def ainvoke(
+        self, input: dict, config: RunnableConfig | None = None, **kwargs
+    ):
+        output = self._lookup(input)  # 임베딩과 검색은 짧은 CPU 작업이므로 바로 실행
+        if output is None:
+            output = await self.bound.ainvoke(input, config, **kwargs)
+            self._update(input, output)
+        return output
+
+    def _fill(self, inputs: list, outputs: list, misses: list, results: list) -> list:
+        """캐시에 없던 입력의 실행 결과를 채우고, 예외가 아닌 결과만 캐시에 저장합니다."""
+        for index, result in zip(misses, results):
+            outputs[index] = result
+            if not isinstance(result, Exception):
+                self._update(inputs[index], result)
+        return outputs
+
+    def batch(
+        self,
+        inputs: list,
+        config: RunnableConfig | list[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> list:
+        configs = get_config_list(config, len(inputs))
+        outputs = [self._lookup(input) for input in inputs]
+        misses = [index for index, output in enumerate(outputs) if output is None]
+        if not misses:
+            return outputs
+        results = self.bound.batch(
+            [inputs[index] for index in misses],
+            [configs[index] for index in misses],
+            return_exceptions=return_exceptions,
+            **kwargs,
+        )
+        return self._fill(inputs, outputs, misses, results)
+
+    async def abatch(
+        self,
+        inputs: list,
+        config: RunnableConfig | list[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> list:
+        configs = get_config_list(config, len(inputs))
+        outputs = [self._lookup(input) for input in inputs]
+        misses = [index for index, output in enumerate(outputs) if output is None]
+        if not misses:
+            return outputs
+        results = await self.bound.abatch(
+            [inputs[index] for index in misses],
+            [configs[index] for index in misses],
+            return_exceptions=return_exceptions,
+            **kwargs,
+        )
+        return self._fill(inputs, outputs, misses, results)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import operator
 from dataclasses import dataclass
 from typing import Annotated, TypedDict
 
-from langgraph.graph.message import add_messages
+from agents.reducers import add_indexed_messages
 
 
 @dataclass
@@ -17,8 +18,17 @@ class TextState(TypedDict):
 
     content_topic: str  # 콘텐츠의 주제 (예: "여름 휴가", "음식 리뷰")
     content_type: str  # 콘텐츠의 유형 (예: "블로그 글", "소셜 미디어 포스트")
+    content_types: list[
+        str
+    ]  # 한 번에 추출할 콘텐츠 유형 목록 (예: ["블로그 글", "인스타그램 캡션"])
     query: str  # 사용자 쿼리 또는 요청사항
     persona_extracted: str  # 추출된 페르소나 전문
+    persona_by_type: dict[
+        str, str
+    ]  # content_types를 지정했을 때 콘텐츠 유형별 추출된 페르소나
     response: Annotated[
-        list, add_messages
-    ]  # 응답 메시지 목록 (add_messages로 주석되어 메시지 추가 기능 제공)
+        list, add_indexed_messages
+    ]  # 응답 메시지 목록 (add_indexed_messages로 주석되어 메시지 추가 기능 제공)
+    degraded_nodes: Annotated[
+        list, operator.add
+    ]  # 마감 시각 때문에 대체 응답을 사용하거나 건너뛴 노드 기록
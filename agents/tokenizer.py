@@ -0,0 +1,87 @@
+"""
+토큰 수 계산 모듈
+
+렌더링된 프롬프트의 토큰 수를 계산합니다. tiktoken 인코딩을 사용할 수 있으면 정확한 값을,
+설치되어 있지 않거나 인코딩 파일을 내려받을 수 없는 환경(오프라인 등)에서는 문자 종류별 근사값을 반환합니다.
+"""
+
+import math
+from functools import cache
+
+DEFAULT_ENCODING = "o200k_base"  # gpt-4o 계열 인코딩
+MESSAGE_OVERHEAD_TOKENS = 4  # 채팅 메시지 하나에 붙는 역할/구분자 토큰 수
+REPLY_OVERHEAD_TOKENS = 3  # 응답 시작 토큰 수
+
+
+@cache
+def _get_encoding(model: str):
+    """
+    모델에 맞는 tiktoken 인코딩을 반환합니다. (사용할 수 없으면 None, 결과는 캐시)
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except (OSError, ValueError):
+        # 인코딩 파일 다운로드 실패(requests 예외는 OSError의 하위 클래스), 파일 해시 불일치 등
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    문자 종류별 근사로 토큰 수를 추정합니다.
+
+    영문/숫자 등 ASCII 문자는 약 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰으로 계산합니다.
+
+    Args:
+        text (str): 토큰 수를 셀 문자열
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    ascii_count = sum(1 for char in text if char.isascii())
+    return math.ceil(ascii_count / 4) + (len(text) - ascii_count)
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    문자열의 토큰 수를 반환합니다.
+
+    Args:
+        text (str): 토큰 수를 셀 문자열
+        model (str): 모델 이름 (기본값: "gpt-4o-mini")
+
+    Returns:
+        int: 토큰 수 (tiktoken을 사용할 수 없으면 추정값)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: list, model: str = "gpt-4o-mini") -> int:
+    """
+    OpenAI 채팅 메시지 목록의 프롬프트 토큰 수를 반환합니다.
+
+    Args:
+        messages (list[dict]): {"role": ..., "content": ...} 형식의 메시지 목록
+        model (str): 모델 이름 (기본값: "gpt-4o-mini")
+
+    Returns:
+        int: 프롬프트 토큰 수
+    """
+    total = REPLY_OVERHEAD_TOKENS
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):  # 멀티모달 콘텐츠는 텍스트 블록만 계산
+            content = " ".join(
+                block.get("text", "") for block in content if isinstance(block, dict)
+            )
+        total += MESSAGE_OVERHEAD_TOKENS + count_tokens(str(content), model)
+    return total
@@ -1,7 +1,9 @@
 from langgraph.graph import StateGraph
 
 from agents.base_workflow import BaseWorkflow
+from agents.conditions import DOMAINS, JOIN_NODE, route_domains
 from agents.main_state import MainState
+from agents.nodes import DomainWorkflowNode, ResponseJoinNode
 
 
 class MainWorkflow(BaseWorkflow):
@@ -10,6 +12,17 @@ class MainWorkflow(BaseWorkflow):
 
     Team Member는 해당 Workflow에서 따로 작업을 진행하지 않으셔도 됩니다.
     이 클래스는 모든 Agentic Workflow를 바탕으로 주요 Workflow를 정의합니다.
+
+    요청에 필요한 도메인 서브그래프(text, image, music, management)를 병렬 브랜치로 실행한 뒤,
+    join 노드에서 각 브랜치의 응답을 response 채널로 병합합니다.
+    전체 실행 시간은 브랜치 시간의 합이 아니라 가장 느린 브랜치의 시간이 됩니다.
+
+    ```
+    __start__ ─┬─> text ───────┬─> join ─> __end__
+               ├─> image ──────┤
+               ├─> music ──────┤
+               └─> management ─┘
+    ```
     """
 
     def __init__(self, state):
@@ -20,20 +33,46 @@ class MainWorkflow(BaseWorkflow):
         super().__init__()
         self.state = state
 
-    def build(self):
+    def build(self, checkpointer=None):
         """
         Workflow 그래프 구축 메서드
 
         StateGraph를 사용하여 Workflow 그래프를 구축합니다.
-        추후 다양한 노드를 추가하여 최종 Workflow를 구축할 예정입니다.
+        시작 노드에서 route_domains가 선택한 도메인 노드들로 동시에 분기하고,
+        모든 브랜치가 끝나면 join 노드에서 응답을 병합합니다.
+
+        Args:
+            checkpointer (BaseCheckpointSaver | None): 실행 상태를 저장할 체크포인터
+                (예: agents.checkpointer.SqliteCheckpointer, 기본값: 저장하지 않음)
 
         Returns:
             CompiledStateGraph: 컴파일된 상태 그래프 객체
         """
+        # 도메인 Workflow 모듈은 그래프를 빌드할 때 불러옵니다.
+        from agents.image.workflow import image_workflow
+        from agents.management.workflow import management_workflow
+        from agents.music.workflow import music_workflow
+        from agents.text.workflow import text_workflow
+
+        domain_workflows = {
+            "text": text_workflow,
+            "image": image_workflow,
+            "music": music_workflow,
+            "management": management_workflow,
+        }
+
         builder = StateGraph(self.state)
-        # 노드 추가 예시: builder.add_node("node_name", Node())
-        builder.add_edge("__start__", "__end__")  # 시작에서 종료로 바로 연결
-        workflow = builder.compile()  # 그래프 컴파일
+        for domain in DOMAINS:
+            builder.add_node(
+                domain, DomainWorkflowNode(domain, domain_workflows[domain])
+            )
+            builder.add_edge(domain, JOIN_NODE)  # 모든 브랜치는 join 노드에서 합류
+        builder.add_node(JOIN_NODE, ResponseJoinNode())
+
+        # 시작 노드에서 필요한 도메인 노드들로 병렬 분기 (쿼리로 만든 입력은 Send로 전달)
+        builder.add_conditional_edges("__start__", route_domains, [*DOMAINS, JOIN_NODE])
+        builder.add_edge(JOIN_NODE, "__end__")
+        workflow = builder.compile(checkpointer=checkpointer)  # 그래프 컴파일
         workflow.name = self.name  # Workflow 이름 설정
         return workflow
 
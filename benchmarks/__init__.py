@@ -0,0 +1,5 @@
+"""
+벤치마크 스크립트 패키지
+
+각 모듈은 `python -m benchmarks.<모듈 이름>`으로 실행합니다.
+"""
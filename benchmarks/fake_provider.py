@@ -0,0 +1,360 @@
+"""
+오프라인 OpenAI 호환 가짜 LLM 제공자
+
+네트워크나 API 키 없이 프레임워크 자체의 오버헤드와 동시성 동작을 측정할 수 있도록
+/v1/chat/completions 엔드포인트(일반 응답 및 SSE 스트리밍)를 흉내 내는 로컬 HTTP 서버입니다.
+첫 토큰까지의 지연 분포, 토큰 생성 속도, 오류 주입 비율을 설정할 수 있습니다.
+
+/v1/batch/chat/completions는 여러 채팅 요청({"requests": [...]})을 요청 하나의 지연으로 처리하여
+{"data": [채팅 응답 또는 {"error": ...}, ...]}로 돌려주는 배치 엔드포인트입니다.
+(agents.batching.endpoint_batch_fn이 사용하는 형식)
+
+모델 레지스트리는 OPENAI_BASE_URL 환경변수(또는 get_chat_model의 base_url)를 사용하므로,
+서버 주소를 지정하면 각 도메인의 get_openai_model()이 이 서버를 호출합니다.
+
+실행:
+```bash
+python -m benchmarks.fake_provider --port 8000 --latency-ms 300 --tokens-per-second 80
+OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=fake langgraph dev
+```
+
+코드에서 사용:
+```python
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+with FakeProvider(ProviderConfig(latency_ms=100, error_rate=0.01)) as provider:
+    model = get_chat_model(base_url=provider.base_url)
+```
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass
+class ProviderConfig:
+    """
+    가짜 제공자의 응답 특성 설정
+    """
+
+    latency_ms: float = 50.0  # 첫 토큰까지의 지연 (lognormal이면 중앙값)
+    distribution: str = "fixed"  # 지연 분포: fixed, uniform, lognormal
+    latency_jitter_ms: float = 0.0  # uniform 분포의 ± 폭
+    latency_sigma: float = 0.5  # lognormal 분포의 sigma
+    tokens_per_second: float = 0.0  # 토큰 생성 속도 (0이면 지연 없이 한 번에 생성)
+    completion_tokens: int = 32  # 응답 토큰 수
+    error_rate: float = 0.0  # 오류 응답 비율 (0~1)
+    error_status: int = 500  # 주입할 오류 HTTP 상태 코드 (예: 429, 500)
+    retry_after_ms: int = 10  # 오류 응답의 retry-after-ms 헤더 (SDK 재시도 대기 시간)
+    seed: int | None = None  # 난수 시드
+
+    def __post_init__(self):
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+
+
+class _ProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: ProviderConfig):
+        super().__init__(address, _ProviderHandler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "streams": 0,
+            "errors": 0,
+            "batches": 0,
+            "batched_requests": 0,
+        }
+
+    def sample_latency(self) -> float:
+        """설정된 분포에서 첫 토큰까지의 지연(초)을 뽑습니다."""
+        config = self.config
+        with self.lock:
+            if config.distribution == "uniform":
+                latency = self.random.uniform(
+                    config.latency_ms - config.latency_jitter_ms,
+                    config.latency_ms + config.latency_jitter_ms,
+                )
+            elif config.distribution == "lognormal" and config.latency_ms > 0:
+                latency = self.random.lognormvariate(
+                    math.log(config.latency_ms), config.latency_sigma
+                )
+            else:
+                latency = config.latency_ms
+        return max(latency, 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        """오류를 주입할지 결정합니다."""
+        with self.lock:
+            return self.random.random() < self.config.error_rate
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 취소한 요청(헤징의 늦은 요청 등)은 정상 동작이므로 출력하지 않음
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _ProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 커넥션 재사용
+    disable_nagle_algorithm = True  # 헤더/본문을 나눠 쓸 때 지연 ACK 대기 방지
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 출력하지 않음
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(
+                200, {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+            )
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        if path.endswith("/batch/chat/completions"):
+            self._batch(request.get("requests", []))
+            return
+        if not path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        server = self.server
+        config = server.config
+        server.count("requests")
+        time.sleep(server.sample_latency())
+
+        if server.should_fail():
+            server.count("errors")
+            self._send_json(
+                config.error_status,
+                {"error": {"message": "injected error", "type": "fake_error"}},
+                headers={"retry-after-ms": str(config.retry_after_ms)},
+            )
+            return
+
+        tokens = [f"token{i} " for i in range(config.completion_tokens)]
+        usage = _usage(request, tokens)
+        model = request.get("model", "fake")
+
+        if request.get("stream"):
+            server.count("streams")
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            self._stream(model, tokens, usage if include_usage else None)
+            return
+
+        if config.tokens_per_second > 0:
+            time.sleep(len(tokens) / config.tokens_per_second)
+        self._send_json(200, _completion(model, tokens, usage))
+
+    def _batch(self, requests: list):
+        """여러 채팅 요청을 요청 하나의 지연으로 처리합니다. (오류는 항목별로 주입)"""
+        server = self.server
+        config = server.config
+        server.count("requests")
+        server.count("batches")
+        time.sleep(server.sample_latency())
+
+        tokens = [f"token{i} " for i in range(config.completion_tokens)]
+        if config.tokens_per_second > 0:
+            time.sleep(len(tokens) / config.tokens_per_second)
+        data = []
+        for request in requests:
+            server.count("batched_requests")
+            if server.should_fail():
+                server.count("errors")
+                data.append(
+                    {"error": {"message": "injected error", "type": "fake_error"}}
+                )
+                continue
+            model = request.get("model", "fake")
+            data.append(_completion(model, tokens, _usage(request, tokens)))
+        self._send_json(200, {"object": "list", "data": data})
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, tokens: list, usage: dict | None):
+        """토큰을 SSE 청크로 보냅니다. (chunked 전송으로 keep-alive 유지)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        envelope = _envelope(model, "chat.completion.chunk")
+        delay = (
+            1 / self.server.config.tokens_per_second
+            if self.server.config.tokens_per_second > 0
+            else 0
+        )
+        for i, token in enumerate(tokens):
+            if i and delay:
+                time.sleep(delay)
+            delta = (
+                {"role": "assistant", "content": token}
+                if i == 0
+                else {"content": token}
+            )
+            self._write_event(
+                {
+                    **envelope,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                }
+            )
+        self._write_event(
+            {
+                **envelope,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+        )
+        if usage is not None:
+            self._write_event({**envelope, "choices": [], "usage": usage})
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, body: dict):
+        self._write_chunk(f"data: {json.dumps(body)}\n\n".encode())
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _envelope(model: str, object_type: str) -> dict:
+    return {
+        "id": f"chatcmpl-fake-{uuid.uuid4().hex[:12]}",
+        "object": object_type,
+        "created": int(time.time()),
+        "model": model,
+    }
+
+
+def _usage(request: dict, tokens: list) -> dict:
+    usage = {
+        "prompt_tokens": _prompt_tokens(request.get("messages", [])),
+        "completion_tokens": len(tokens),
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    return usage
+
+
+def _completion(model: str, tokens: list, usage: dict) -> dict:
+    return {
+        **_envelope(model, "chat.completion"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": usage,
+    }
+
+
+def _prompt_tokens(messages: list) -> int:
+    """메시지 길이로 프롬프트 토큰 수를 대략 계산합니다. (4글자당 1토큰)"""
+    characters = sum(len(str(message.get("content", ""))) for message in messages)
+    return max(1, characters // 4)
+
+
+class FakeProvider:
+    """
+    가짜 제공자 서버를 백그라운드 스레드에서 실행하는 클래스
+
+    with 문으로 사용하면 블록이 끝날 때 서버가 종료됩니다.
+    """
+
+    def __init__(self, config: ProviderConfig | None = None, host="127.0.0.1", port=0):
+        """
+        Args:
+            config (ProviderConfig | None): 응답 특성 설정 (기본값: ProviderConfig())
+            host (str): 바인딩할 주소
+            port (int): 바인딩할 포트 (0이면 빈 포트 자동 선택)
+        """
+        self.config = config or ProviderConfig()
+        self._server = _ProviderServer((host, port), self.config)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI 클라이언트에 지정할 base_url"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self) -> dict:
+        """요청 수, 스트리밍 요청 수, 주입된 오류 수, 배치 요청 수, 배치로 처리한 채팅 요청 수"""
+        with self._server.lock:
+            return dict(self._server.stats)
+
+    def start(self) -> "FakeProvider":
+        """서버를 백그라운드 스레드에서 시작합니다."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버를 종료합니다."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    defaults = ProviderConfig()
+    for name, value in asdict(defaults).items():
+        option = "--" + name.replace("_", "-")
+        if name == "distribution":
+            parser.add_argument(option, default=value, choices=DISTRIBUTIONS)
+        elif name == "seed":
+            parser.add_argument(option, type=int, default=value)
+        else:
+            parser.add_argument(option, type=type(value), default=value)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    provider = FakeProvider(ProviderConfig(**args), host=host, port=port)
+    print(f"Fake provider listening on {provider.base_url}")
+    try:
+        provider._server.serve_forever()
+    except KeyboardInterrupt:
+        provider.stop()
+
+
+if __name__ == "__main__":
+    main()
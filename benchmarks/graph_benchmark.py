@@ -0,0 +1,315 @@
+"""
+그래프 처리량/지연 벤치마크
+
+오프라인 가짜 제공자(benchmarks.fake_provider)를 띄우고 langgraph.json에 등록된 모든 그래프를
+동시성 단계별로 실행하여 p50/p95/p99 지연, 처리량, 실행 1회당 메모리 할당량을 보고합니다.
+네트워크가 없는 환경에서도 실행되므로, --save로 기준 결과를 저장한 뒤 --baseline으로 비교하면
+프레임워크 오버헤드 회귀를 잡을 수 있습니다. (회귀가 있으면 종료 코드 1)
+
+LLM 응답 캐시와 동시 요청 합치기는 측정을 왜곡하므로 이 벤치마크에서는 비활성화됩니다.
+
+실행:
+```bash
+python -m benchmarks.graph_benchmark
+python -m benchmarks.graph_benchmark --graphs text management --concurrency 1 8 32 --runs 64
+python -m benchmarks.graph_benchmark --save baseline.json
+python -m benchmarks.graph_benchmark --baseline baseline.json --tolerance 0.2
+```
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import httpx
+import openai
+from langchain_core.exceptions import OutputParserException
+
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+# 실행 실패로 집계하는 예외 (주입된 오류, 연결 오류, 마감 시각 초과, 응답 파싱 실패)
+RUN_ERRORS = (openai.OpenAIError, httpx.HTTPError, TimeoutError, OutputParserException)
+
+# 그래프별 벤치마크 입력
+SAMPLE_INPUTS = {
+    "main": {
+        "query": "다음 달 뮤직비디오 촬영 준비",
+        "content_topic": "여름 휴가",
+        "content_type": "블로그 글",
+        "project_id": "PRJ-2023-001",
+        "request_type": "resource_allocation",
+        "response": [],
+    },
+    "text": {"content_topic": "여름 휴가", "content_type": "블로그 글", "response": []},
+    "music": {"query": "여름 분위기의 드림팝", "response": []},
+    "image": {"query": "여름 바다 앨범 커버", "response": []},
+    "management": {
+        "project_id": "PRJ-2023-001",
+        "request_type": "resource_allocation",
+        "query": "다음 달 뮤직비디오 촬영 준비",
+        "team_members": ["감독", "촬영 감독", "스타일리스트"],
+        "resources_available": {"budget": "5000만원", "studio": "2일"},
+        "response": [],
+    },
+}
+
+
+def percentile(values: list, q: float) -> float:
+    """정렬된 값 목록의 q 분위수(nearest-rank)를 반환합니다."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+async def run_level(graph, state: dict, concurrency: int, runs: int) -> dict:
+    """
+    그래프를 주어진 동시성으로 runs번 실행하고 지연/처리량을 측정합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def run_once():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await graph.ainvoke(dict(state))
+            except RUN_ERRORS:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_once() for _ in range(runs)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+async def measure_allocation(graph, state: dict, runs: int) -> float:
+    """
+    순차 실행에서 실행 1회당 메모리 할당 최댓값(KiB)의 평균을 측정합니다.
+    """
+    if runs <= 0:
+        return 0.0
+
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(runs):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                await graph.ainvoke(dict(state))
+            except RUN_ERRORS:
+                continue
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024 if peaks else 0.0
+
+
+async def benchmark_graph(
+    name: str, concurrency: list, runs: int, alloc_runs: int
+) -> dict:
+    """
+    그래프 하나를 모든 동시성 단계에서 측정합니다.
+    """
+    from agents.registry import get_graph
+
+    graph = get_graph(name)
+    state = SAMPLE_INPUTS[name]
+    # 워밍업 (커넥션 및 지연 초기화, 오류 주입 중이면 실패할 수 있음)
+    await run_level(graph, state, concurrency=1, runs=1)
+
+    levels = [await run_level(graph, state, level, runs) for level in concurrency]
+    alloc_kib = await measure_allocation(graph, state, alloc_runs)
+    return {"graph": name, "alloc_kib_per_run": alloc_kib, "levels": levels}
+
+
+async def benchmark_graphs(
+    graphs: list, concurrency: list, runs: int, alloc_runs: int
+) -> list:
+    """
+    그래프들을 차례로 측정합니다.
+    """
+    return [
+        await benchmark_graph(name, concurrency, runs, alloc_runs) for name in graphs
+    ]
+
+
+@contextmanager
+def _environ(**values):
+    """블록 안에서만 환경변수를 설정하고, 끝나면 이전 값으로 되돌립니다."""
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_benchmark(
+    graphs: list,
+    concurrency: list,
+    runs: int,
+    alloc_runs: int = 5,
+    config: ProviderConfig | None = None,
+) -> list:
+    """
+    가짜 제공자를 띄우고 그래프들의 벤치마크 결과를 반환합니다.
+
+    Args:
+        graphs (list[str]): 측정할 그래프 이름 목록
+        concurrency (list[int]): 동시성 단계 목록
+        runs (int): 단계별 실행 횟수
+        alloc_runs (int): 메모리 할당 측정 실행 횟수
+        config (ProviderConfig | None): 가짜 제공자 설정
+
+    Returns:
+        list[dict]: 그래프별 결과
+    """
+    from agents.coalescing import coalescing_enabled, enable_coalescing
+    from agents.model_registry import reset_registry
+    from agents.node_cache import enable_node_cache, node_cache_enabled
+    from agents.registry import get_workflow
+    from agents.text.modules.semantic_cache import (
+        enable_semantic_cache,
+        semantic_cache_enabled,
+    )
+
+    with (
+        FakeProvider(config) as provider,
+        _environ(
+            LLM_CACHE_ENABLED="false",
+            OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "benchmark"),
+            OPENAI_BASE_URL=provider.base_url,
+        ),
+    ):
+        coalescing = coalescing_enabled()
+        node_cache = node_cache_enabled()
+        semantic_cache = semantic_cache_enabled()
+        # 같은 입력의 실행이 하나의 요청으로 합쳐지거나 이전 결과를 재사용하지 않도록 함
+        enable_coalescing(False)
+        enable_node_cache(False)
+        enable_semantic_cache(False)
+        try:
+            for name in graphs:
+                get_workflow(name).invalidate()  # 가짜 제공자를 쓰는 모델로 다시 빌드
+            # 공유 비동기 httpx 클라이언트는 이벤트 루프에 묶이므로 하나의 루프에서 모두 실행
+            return asyncio.run(benchmark_graphs(graphs, concurrency, runs, alloc_runs))
+        finally:
+            enable_coalescing(coalescing)
+            enable_node_cache(node_cache)
+            enable_semantic_cache(semantic_cache)
+            for name in graphs:
+                get_workflow(name).invalidate()
+            reset_registry()
+
+
+def find_regressions(results: list, baseline: list, tolerance: float) -> list:
+    """
+    기준 결과보다 p95 지연이 늘었거나 처리량이 줄어든 항목을 찾습니다.
+
+    Returns:
+        list[str]: 회귀 설명 목록
+    """
+    expected = {
+        (result["graph"], level["concurrency"]): level
+        for result in baseline
+        for level in result["levels"]
+    }
+    regressions = []
+    for result in results:
+        for level in result["levels"]:
+            base = expected.get((result["graph"], level["concurrency"]))
+            if base is None:
+                continue
+            label = f"{result['graph']}@{level['concurrency']}"
+            if level["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{label}: p95 {base['p95_ms']:.1f} -> {level['p95_ms']:.1f} ms"
+                )
+            if level["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{label}: throughput {base['throughput_rps']:.1f} -> "
+                    f"{level['throughput_rps']:.1f} rps"
+                )
+    return regressions
+
+
+def main():
+    from agents.registry import GRAPHS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--graphs", nargs="+", default=list(GRAPHS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--runs", type=int, default=64)
+    parser.add_argument("--alloc-runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--distribution", default="fixed")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--save", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = ProviderConfig(
+        latency_ms=args.latency_ms,
+        distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=0,
+    )
+    results = run_benchmark(
+        args.graphs, args.concurrency, args.runs, args.alloc_runs, config
+    )
+
+    print(
+        f"{'graph':>12} {'conc':>5} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} "
+        f"{'rps':>8} {'errors':>6} {'alloc_kib':>10}"
+    )
+    for result in results:
+        for level in result["levels"]:
+            print(
+                f"{result['graph']:>12} {level['concurrency']:>5} "
+                f"{level['p50_ms']:>9.1f} {level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} "
+                f"{level['throughput_rps']:>8.1f} {level['errors']:>6} "
+                f"{result['alloc_kib_per_run']:>10.1f}"
+            )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+그래프 cold start 벤치마크
+
+langgraph.json의 그래프별로 새 Python 프로세스에서 Workflow 모듈 import와 그래프 빌드에 걸리는
+시간(ms)을 측정합니다. 서버리스 함수나 워커가 실제로 제공하는 그래프의 비용만 지불하는지 확인할 때 사용합니다.
+
+각 그래프마다 다음 값을 보고합니다. (repeat번 실행한 중앙값)
+- import_ms: agents.registry.get_workflow(name) 시간 (모듈 import)
+- build_ms: 첫 그래프 빌드 시간 (노드, 모델 클라이언트 생성 및 컴파일)
+- modules: 로드된 모듈 수
+- openai: langchain_openai가 로드되었는지 여부
+
+실행:
+```bash
+python -m benchmarks.import_benchmark
+python -m benchmarks.import_benchmark --graphs text image --repeat 5
+```
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from agents.registry import GRAPHS
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from agents.registry import get_workflow
+workflow = get_workflow({name!r})
+imported = time.perf_counter()
+workflow()
+built = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "build_ms": (built - imported) * 1000,
+    "modules": len(sys.modules),
+    "openai": "langchain_openai" in sys.modules,
+}}))
+"""
+
+
+def measure(name: str) -> dict:
+    """
+    새 프로세스에서 그래프 하나의 cold start 시간을 측정합니다.
+    """
+    env = {**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "benchmark")}
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(name=name)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--graphs", nargs="+", default=list(GRAPHS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'graph':>12} {'import_ms':>10} {'build_ms':>10} {'modules':>8} {'openai':>7}"
+    )
+    for name in args.graphs:
+        runs = [measure(name) for _ in range(args.repeat)]
+        import_ms = statistics.median(run["import_ms"] for run in runs)
+        build_ms = statistics.median(run["build_ms"] for run in runs)
+        print(
+            f"{name:>12} {import_ms:>10.1f} {build_ms:>10.1f} "
+            f"{runs[-1]['modules']:>8} {runs[-1]['openai']!s:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
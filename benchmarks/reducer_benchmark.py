@@ -0,0 +1,93 @@
+"""
+메시지 reducer 마이크로벤치마크
+
+LangGraph의 add_messages와 agents.reducers.add_indexed_messages의 병합 시간을
+대화 기록 길이(1k/10k/100k 메시지)별로 비교합니다.
+
+각 시나리오는 기록 길이가 N인 상태에서 병합을 반복하여 병합 1회당 평균 시간을 측정합니다.
+- append: 새 메시지 1개 추가 (일반적인 노드 응답)
+- replace: 기존 메시지 1개를 같은 ID로 교체
+- fan_in: 8개 브랜치가 한 단계에서 각각 메시지 1개씩 추가
+
+실행:
+```bash
+python -m benchmarks.reducer_benchmark
+python -m benchmarks.reducer_benchmark --sizes 1000 10000 --repeat 50
+```
+"""
+
+import argparse
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph.message import add_messages
+
+from agents.reducers import add_indexed_messages
+
+REDUCERS = {
+    "add_messages": add_messages,
+    "add_indexed_messages": add_indexed_messages,
+}
+FAN_IN_BRANCHES = 8
+
+
+def make_history(reducer, size: int) -> list:
+    """
+    reducer로 병합된 길이 size의 대화 기록을 만듭니다.
+    """
+    messages = [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content=f"message {i}", id=f"m{i}")
+        for i in range(size)
+    ]
+    return reducer([], messages)
+
+
+def run_scenario(reducer, history: list, scenario: str, repeat: int) -> float:
+    """
+    시나리오를 repeat번 반복하고 병합 1회당 평균 시간(ms)을 반환합니다.
+    """
+    state = history
+    start = time.perf_counter()
+    for i in range(repeat):
+        if scenario == "append":
+            state = reducer(state, [AIMessage(content="new", id=f"new-{i}")])
+        elif scenario == "replace":
+            target = state[i % len(state)].id
+            state = reducer(state, [AIMessage(content="edited", id=target)])
+        elif scenario == "fan_in":
+            for branch in range(FAN_IN_BRANCHES):
+                message = AIMessage(content="branch", id=f"fan-{i}-{branch}")
+                state = reducer(state, [message])
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>8} {'scenario':>8} "
+        + " ".join(f"{name:>22}" for name in REDUCERS)
+        + f" {'speedup':>8}"
+    )
+    for size in args.sizes:
+        histories = {
+            name: make_history(reducer, size) for name, reducer in REDUCERS.items()
+        }
+        for scenario in ("append", "replace", "fan_in"):
+            timings = {
+                name: run_scenario(reducer, histories[name], scenario, args.repeat)
+                for name, reducer in REDUCERS.items()
+            }
+            speedup = timings["add_messages"] / timings["add_indexed_messages"]
+            print(
+                f"{size:>8} {scenario:>8} "
+                + " ".join(f"{timings[name]:>19.3f} ms" for name in REDUCERS)
+                + f" {speedup:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
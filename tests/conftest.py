@@ -0,0 +1,21 @@
+"""
+pytest 공통 설정 모듈
+
+테스트 실행 중에는 기본 LLM 응답 캐시(agents.llm_cache)를 설치하지 않도록 하여,
+테스트 결과가 이전 실행의 캐시에 영향을 받거나 저장소에 캐시 파일이 생기지 않도록 합니다.
+
+단위 테스트는 실제 API를 호출하지 않으므로(카세트 재생, 가짜 제공자 등) 테스트마다 가짜 OPENAI_API_KEY를
+설정하여, 키가 없는 환경에서도 모델 클라이언트를 만들 수 있고 테스트 실행 순서에 영향을 받지 않도록 합니다.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
+
+@pytest.fixture(autouse=True)
+def fake_openai_api_key(monkeypatch):
+    """테스트마다 가짜 OPENAI_API_KEY를 설정합니다."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,102 @@
+"""
+단위 테스트 모듈 - BaseNode 테스트
+
+이 모듈은 BaseNode의 동기/비동기 실행 경로가 LangGraph에서 올바르게 선택되는지 확인합니다.
+LLM을 호출하지 않는 더미 노드를 사용하여 외부 의존성 없이 실행됩니다.
+"""
+
+import asyncio
+from typing import TypedDict
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph
+
+from agents.base_node import BaseNode
+
+
+class DummyState(TypedDict):
+    value: str
+
+
+class DummyNode(BaseNode):
+    """
+    실행 경로를 결과에 기록하는 더미 노드
+    """
+
+    def execute(self, state) -> dict:
+        return {"value": "sync"}
+
+    async def aexecute(self, state) -> dict:
+        return {"value": "async"}
+
+
+def upper(value: str) -> str:
+    if value == "fail":
+        raise ValueError(value)
+    return value.upper()
+
+
+class ChainNode(BaseNode):
+    """
+    체인 batch로 execute_many를 수행하는 더미 노드
+    """
+
+    chain = RunnableLambda(upper)
+
+    def get_chain_input(self, state) -> str:
+        return state["value"]
+
+    def build_update(self, state, output) -> dict:
+        return {"value": output}
+
+    def execute(self, state) -> dict:
+        return self.build_update(state, self.chain.invoke(self.get_chain_input(state)))
+
+
+def build_graph():
+    builder = StateGraph(DummyState)
+    builder.add_node("dummy", DummyNode())
+    builder.add_edge("__start__", "dummy")
+    builder.add_edge("dummy", "__end__")
+    return builder.compile()
+
+
+def test_node_sync_path() -> None:
+    """
+    그래프를 invoke로 실행하면 execute가 호출되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    assert build_graph().invoke({"value": ""})["value"] == "sync"
+
+
+def test_node_async_path() -> None:
+    """
+    그래프를 ainvoke로 실행하면 aexecute가 코루틴 노드로 호출되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    result = asyncio.run(build_graph().ainvoke({"value": ""}))
+    assert result["value"] == "async"
+
+
+def test_execute_many() -> None:
+    """
+    execute_many/aexecute_many가 입력 순서를 유지하고 항목별 예외를 결과에 담는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    node = ChainNode()
+    states = [{"value": "a"}, {"value": "fail"}, {}, {"value": "b"}]
+
+    for results in (
+        node.execute_many(states, max_concurrency=2),
+        asyncio.run(node.aexecute_many(states, max_concurrency=2)),
+    ):
+        assert results[0] == {"value": "A"}
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[2], KeyError)
+        assert results[3] == {"value": "B"}
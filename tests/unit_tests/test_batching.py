@@ -0,0 +1,147 @@
+"""
+단위 테스트 모듈 - 체인 호출 마이크로 배칭 테스트
+
+이 모듈은 동시에 들어온 체인 호출이 하나의 배치로 실행되어 각 호출에 결과가 돌아가고,
+호출이 드문 경우에는 기다림 없이 바로 실행되는지 확인합니다.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from agents import model_registry
+from agents.batching import BatchEndpointError, MicroBatchRunnable, endpoint_batch_fn
+from agents.model_registry import get_chat_model
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+
+def _batcher():
+    """입력을 대문자로 바꾸는 체인과, 배치 엔드포인트를 대신하는 batch_fn을 만듭니다."""
+    calls = []
+
+    async def batch_fn(inputs, configs):
+        calls.append(list(inputs))
+        await asyncio.sleep(0.01)
+        return [ValueError(text) if text == "fail" else text.upper() for text in inputs]
+
+    chain = RunnableLambda(lambda text: text.upper())
+    return MicroBatchRunnable(chain, batch_fn=batch_fn, max_wait=0.05), calls
+
+
+def test_concurrent_calls_are_batched() -> None:
+    """
+    동시에 들어온 호출이 배치로 묶이고 각 호출이 자신의 결과나 예외를 받는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    batcher, calls = _batcher()
+    texts = [f"topic{i}" for i in range(20)] + ["fail"]
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.ainvoke(text) for text in texts), return_exceptions=True
+        )
+
+    *results, failed = asyncio.run(run())
+    assert results == [text.upper() for text in texts[:-1]]
+    assert isinstance(failed, ValueError)
+    # 첫 호출은 바로 실행되고 나머지는 도착 간격에 맞춘 배치로 실행
+    assert len(calls) < 5
+    assert sum(len(batch) for batch in calls) == len(texts) - 1
+    assert batcher.stats()["mean_batch_size"] > 1
+
+
+def test_sparse_calls_run_immediately() -> None:
+    """
+    호출 간격이 시간 창보다 길면 배치를 기다리지 않고 바로 실행하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    batcher, calls = _batcher()
+
+    async def run():
+        latencies = []
+        for i in range(3):
+            start = time.perf_counter()
+            assert await batcher.ainvoke(f"topic{i}") == f"TOPIC{i}"
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.1)
+        return latencies
+
+    latencies = asyncio.run(run())
+    assert max(latencies) < 0.02
+    assert calls == []
+    assert batcher.target() == (1, 0.0)
+
+
+def test_endpoint_batch_combines_requests() -> None:
+    """
+    동시에 들어온 체인 호출이 배치 엔드포인트 요청으로 합쳐져 호출 수보다 적은 요청을 보내는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    config = ProviderConfig(latency_ms=20, completion_tokens=2)
+    with FakeProvider(config) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+        head = PromptTemplate.from_template("topic: {topic}")
+        parser = StrOutputParser()
+        batch_fn = endpoint_batch_fn(
+            head, model, parser, endpoint="/batch/chat/completions"
+        )
+        batcher = MicroBatchRunnable(head | model | parser, batch_fn, max_wait=0.05)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.ainvoke({"topic": f"topic{i}"}) for i in range(16))
+            )
+
+        results = asyncio.run(run())
+
+    assert results == ["token0 token1 "] * 16
+    assert provider.stats["batches"] >= 1
+    assert provider.stats["requests"] < len(results)
+
+
+def test_endpoint_batch_item_errors(monkeypatch) -> None:
+    """
+    배치 응답이 짧거나 파서가 실패하면 해당 호출에만 예외를 전달하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+
+    def handle(request):
+        assert len(json.loads(request.content)["requests"]) == 3
+        data = [
+            {"choices": [{"message": {"content": content}}]} for content in ("a", "bad")
+        ]
+        return httpx.Response(200, json={"data": data})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    monkeypatch.setattr(model_registry, "get_http_clients", lambda: (None, client))
+
+    def parse(message):
+        if message.content == "bad":
+            raise ValueError(message.content)
+        return message.content.upper()
+
+    batch_fn = endpoint_batch_fn(
+        PromptTemplate.from_template("topic: {topic}"),
+        get_chat_model(base_url="http://batch.test/v1"),
+        RunnableLambda(parse),
+        endpoint="/batch/chat/completions",
+    )
+    inputs = [{"topic": f"topic{i}"} for i in range(3)]
+    ok, bad, missing = asyncio.run(batch_fn(inputs, [{}] * 3))
+
+    assert ok == "A"
+    assert isinstance(bad, ValueError)
+    assert isinstance(missing, BatchEndpointError)
@@ -0,0 +1,64 @@
+"""
+단위 테스트 모듈 - LLM 호출 녹화/재생 테스트
+
+이 모듈은 카세트로 녹화한 LLM 응답이 네트워크 없이 그대로 재생되는지 확인합니다.
+"""
+
+import asyncio
+
+import openai
+import pytest
+
+from agents.cassette import use_cassette
+from agents.model_registry import get_chat_model, get_http_clients
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+
+def test_record_and_replay(tmp_path) -> None:
+    """
+    동기/비동기/스트리밍 호출을 녹화한 뒤 제공자 호출 없이 같은 결과로 재생하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    path = tmp_path / "cassette.jsonl.gz"
+    with FakeProvider(ProviderConfig(latency_ms=1, completion_tokens=3)) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+
+        with use_cassette(path, mode="record"):
+            recorded = model.invoke("hello")
+            recorded_chunks = [chunk.content for chunk in model.stream("stream")]
+            asyncio.run(model.ainvoke("async"))
+        assert provider.stats["requests"] == 3
+
+        with use_cassette(path, mode="replay") as cassette:
+            assert len(cassette) == 3
+            # 메시지 앞뒤 공백은 정규화되어 같은 요청으로 매칭됩니다.
+            assert model.invoke("  hello ").content == recorded.content
+            assert [
+                chunk.content for chunk in model.stream("stream")
+            ] == recorded_chunks
+            assert asyncio.run(model.ainvoke("async")).content == recorded.content
+            with pytest.raises(openai.NotFoundError, match="cassette"):
+                model.invoke("not recorded")
+        assert provider.stats["requests"] == 3
+
+
+def test_error_responses_not_recorded(tmp_path) -> None:
+    """
+    429/5xx 같은 오류 응답은 녹화하지 않아 다음 호출이 제공자에 다시 요청하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    path = tmp_path / "cassette.jsonl.gz"
+    config = ProviderConfig(latency_ms=1, error_rate=1.0, error_status=429)
+    request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]}
+    with FakeProvider(config) as provider:
+        client = get_http_clients()[0]
+        with use_cassette(path, mode="auto") as cassette:
+            for _ in range(2):
+                url = provider.base_url + "/chat/completions"
+                assert client.post(url, json=request).status_code == 429
+            assert len(cassette) == 0
+        assert provider.stats["requests"] == 2
@@ -0,0 +1,181 @@
+"""
+단위 테스트 모듈 - SQLite 체크포인터 테스트
+
+이 모듈은 체크포인터와 함께 빌드한 Workflow가 실패한 실행을 이미 끝난 노드를 다시 실행하지 않고
+이어서 실행하는지, 커지는 리스트 채널을 델타로 작게 저장하는지 확인합니다.
+"""
+
+import asyncio
+import operator
+import sqlite3
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.graph import StateGraph
+
+from agents.checkpointer import SqliteCheckpointer
+from agents.main_state import MainState
+from agents.management.modules.state import ManagementState
+from agents.management.workflow import ManagementWorkflow
+from agents.text.modules.state import TextState
+from agents.text.workflow import TextWorkflow
+from agents.workflow import MainWorkflow
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_resume_skips_completed_nodes(tmp_path, mode) -> None:
+    """
+    한 브랜치가 실패한 실행을 같은 thread_id로 다시 실행하면 끝난 브랜치는 다시 호출하지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    calls = {"text": 0, "management": 0}
+
+    def persona(_):
+        calls["text"] += 1
+        return "persona"
+
+    def plan(_):
+        calls["management"] += 1
+        if calls["management"] == 1:
+            raise RuntimeError("management crashed")
+        return "plan"
+
+    checkpointer = SqliteCheckpointer(str(tmp_path / "checkpoints.sqlite"))
+    graph = MainWorkflow(MainState)(checkpointer=checkpointer)
+    for domain, workflow, node_name, chain in (
+        ("text", TextWorkflow(TextState), "persona_extraction", persona),
+        (
+            "management",
+            ManagementWorkflow(ManagementState),
+            "resource_management",
+            plan,
+        ),
+    ):
+        workflow().builder.nodes[node_name].runnable.chain = RunnableLambda(chain)
+        graph.builder.nodes[domain].runnable.workflow = workflow
+
+    state = {
+        "query": "다음 달 촬영 준비",
+        "content_topic": "여름 휴가",
+        "content_type": "블로그 글",
+        "project_id": "PRJ-2023-001",
+        "request_type": "resource_allocation",
+        "response": [],
+    }
+    config = {"configurable": {"thread_id": f"run-{mode}"}}
+
+    def invoke(value):
+        if mode == "sync":
+            return graph.invoke(value, config)
+        return asyncio.run(graph.ainvoke(value, config))
+
+    with pytest.raises(RuntimeError):
+        invoke(state)
+    result = invoke(None)  # 마지막 체크포인트부터 이어서 실행
+
+    assert [message.content for message in result["response"]] == ["persona", "plan"]
+    assert calls == {"text": 1, "management": 2}
+
+
+class _HistoryState(TypedDict):
+    step: int
+    response: Annotated[list, operator.add]
+
+
+def test_list_channel_delta_writes(tmp_path) -> None:
+    """
+    superstep마다 항목이 덧붙는 리스트 채널은 덧붙인 항목만 저장하고, 읽을 때 전체 값으로 복원하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    message = "응답 " * 200
+
+    def append(state):
+        return {"step": state["step"] + 1, "response": [f"{state['step']} {message}"]}
+
+    builder = StateGraph(_HistoryState)
+    builder.add_node("append", append)
+    builder.add_edge("__start__", "append")
+    builder.add_conditional_edges(
+        "append", lambda state: "append" if state["step"] < 20 else "__end__"
+    )
+    checkpointer = SqliteCheckpointer(str(tmp_path / "checkpoints.sqlite"))
+    graph = builder.compile(checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "history"}}
+
+    result = graph.invoke({"step": 0, "response": []}, config)
+    assert len(result["response"]) == 20
+    assert graph.get_state(config).values["response"] == result["response"]
+
+    with checkpointer._lock:
+        rows = (
+            checkpointer._connect()
+            .execute(
+                "SELECT base_version FROM blobs WHERE channel = 'response' "
+                "AND type != 'empty'"
+            )
+            .fetchall()
+        )
+    # 입력의 빈 목록, 첫 항목, MAX_DELTA_DEPTH마다 다시 저장하는 전체 값을 제외하면 모두 델타
+    deltas = [base for (base,) in rows if base is not None]
+    assert len(rows) - len(deltas) == 3
+
+    checkpointer.delete_thread("history")
+    assert checkpointer.get_tuple(config) is None
+
+
+class _FailingConnection:
+    """블록 안에서 쓰기가 실패하는 SQLite 연결"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self.conn.__exit__(*exc_info)
+
+    def executemany(self, *args):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_list_tracking_after_commit(tmp_path, monkeypatch) -> None:
+    """
+    델타의 기준이 되는 리스트 값은 커밋에 성공한 뒤에만 복사본으로 기록되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    checkpointer = SqliteCheckpointer(str(tmp_path / "checkpoints.sqlite"))
+    config = {"configurable": {"thread_id": "history", "checkpoint_ns": ""}}
+    key = ("history", "", "response")
+
+    def put(values, version):
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"response": values}
+        checkpointer.put(config, checkpoint, {}, {"response": version})
+
+    history = ["a"]
+    put(history, 1)
+    history.append("b")  # 저장한 뒤 리스트를 변경해도 기록한 값은 그대로
+    assert checkpointer._last_lists[key] == ("1", ["a"], 0)
+
+    conn = checkpointer._connect()
+    monkeypatch.setattr(checkpointer, "_connect", lambda: _FailingConnection(conn))
+    with pytest.raises(sqlite3.OperationalError):
+        put(["a", "b"], 2)
+    assert checkpointer._last_lists[key] == ("1", ["a"], 0)
+
+    monkeypatch.delattr(checkpointer, "_connect")  # 클래스의 메서드로 되돌림
+    put(["a", "b"], 2)
+    assert checkpointer._last_lists[key] == ("2", ["a", "b"], 1)
+    row = conn.execute(
+        "SELECT base_version FROM blobs WHERE channel = 'response' AND version = '2'"
+    ).fetchone()
+    assert row == ("1",)
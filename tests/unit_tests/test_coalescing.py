@@ -0,0 +1,105 @@
+"""
+단위 테스트 모듈 - 동시 LLM 요청 합치기 테스트
+
+이 모듈은 같은 요청이 동시에 들어오면 실제 요청은 한 번만 보내고,
+모든 호출이 스트리밍 토큰을 포함한 같은 응답을 받으며, 마감 시각은 호출마다 따로 적용되는지 확인합니다.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+import pytest
+
+from agents.coalescing import (
+    coalescing_enabled,
+    enable_coalescing,
+    get_coalescing_stats,
+    reset_coalescing_stats,
+)
+from agents.deadline import deadline_scope
+from agents.model_registry import get_chat_model
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+
+@pytest.fixture
+def provider():
+    enabled = coalescing_enabled()
+    enable_coalescing()
+    reset_coalescing_stats()
+    config = ProviderConfig(latency_ms=200, completion_tokens=5)
+    try:
+        with FakeProvider(config) as provider:
+            yield provider
+    finally:
+        enable_coalescing(enabled)
+
+
+def test_coalesce_streams(provider) -> None:
+    """
+    같은 프롬프트의 동시 스트리밍 호출이 하나의 요청을 공유하고 모든 토큰을 받는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    model = get_chat_model(base_url=provider.base_url)
+
+    async def stream(text):
+        return [chunk.content async for chunk in model.astream(text)]
+
+    async def run():
+        return await asyncio.gather(
+            *(stream("여름 휴가 블로그 글") for _ in range(5)), stream("다른 주제")
+        )
+
+    *same, other = asyncio.run(run())
+    assert all(tokens == same[0] for tokens in same)
+    assert "".join(same[0]) == "".join(f"token{i} " for i in range(5))
+    assert other == same[0]  # 가짜 제공자는 항상 같은 토큰을 생성
+    assert provider.stats["requests"] == 2
+    assert get_coalescing_stats() == {"upstream": 2, "coalesced": 4}
+
+
+def test_coalesce_sync(provider) -> None:
+    """
+    동기 호출도 진행 중인 같은 요청에 합쳐지고, 끝난 뒤의 요청은 새로 보내는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    model = get_chat_model(base_url=provider.base_url)
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda _: model.invoke("hello").content, range(4)))
+    assert len(set(results)) == 1
+    assert provider.stats["requests"] == 1
+
+    model.invoke("hello")
+    assert provider.stats["requests"] == 2
+
+
+def test_coalesce_waiter_deadlines(provider) -> None:
+    """
+    먼저 요청한 호출의 마감 시각이 지나도 마감 시각이 없는 호출은 공유 요청의 응답을 받는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    model = get_chat_model(base_url=provider.base_url)
+
+    async def leader():
+        with deadline_scope(time.time() + 0.05):
+            return await model.ainvoke("hello")
+
+    async def run():
+        return await asyncio.gather(
+            leader(), model.ainvoke("hello"), return_exceptions=True
+        )
+
+    started = time.monotonic()
+    expired, result = asyncio.run(run())
+    assert isinstance(expired, openai.APITimeoutError)
+    assert result.content == "".join(f"token{i} " for i in range(5))
+    assert provider.stats["requests"] == 1
+    assert get_coalescing_stats() == {"upstream": 1, "coalesced": 1}
+    assert time.monotonic() - started < 5
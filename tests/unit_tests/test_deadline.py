@@ -0,0 +1,163 @@
+"""
+단위 테스트 모듈 - 마감 시각(deadline) 테스트
+
+이 모듈은 실행 설정의 마감 시각에 따라 노드가 LLM 호출을 취소하거나 건너뛰고,
+대체 응답과 degraded_nodes 기록으로 제한 시간 안에 응답하는지 확인합니다.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agents.deadline import with_deadline
+from agents.main_state import MainState
+from agents.management.modules.state import ManagementState
+from agents.management.workflow import ManagementWorkflow
+from agents.metrics import get_node_cache_usage, reset_usage
+from agents.node_cache import enable_node_cache, node_cache_enabled
+from agents.text.modules.nodes import PersonaExtractionNode
+from agents.text.modules.semantic_cache import (
+    enable_semantic_cache,
+    get_semantic_cache,
+    reset_semantic_cache,
+    semantic_cache_enabled,
+)
+from agents.text.modules.state import TextState
+from agents.text.workflow import TextWorkflow
+from agents.workflow import MainWorkflow
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+TEXT_STATE = {"content_topic": "여름 휴가", "content_type": "블로그 글", "response": []}
+
+
+@pytest.fixture
+def node_cache():
+    """노드 메모이제이션은 기본으로 꺼져 있으므로 테스트 동안만 켭니다."""
+    enabled = node_cache_enabled()
+    enable_node_cache()
+    try:
+        yield
+    finally:
+        enable_node_cache(enabled)
+
+
+def _reasons(result) -> dict:
+    return {record["node"]: record["reason"] for record in result["degraded_nodes"]}
+
+
+def test_main_workflow_deadline() -> None:
+    """
+    마감 시각이 지나면 진행 중인 체인을 취소하고, 대체 응답이 없는 노드와 도메인 브랜치는
+    응답 없이 병합하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+
+    async def hang(_):
+        await asyncio.sleep(10)
+
+    graph = MainWorkflow(MainState)()
+    for domain, workflow, node_name in (
+        ("text", TextWorkflow(TextState), "persona_extraction"),
+        ("management", ManagementWorkflow(ManagementState), "resource_management"),
+    ):
+        node = workflow().builder.nodes[node_name].runnable
+        node.chain = RunnableLambda(lambda _: None, afunc=hang)
+        node.min_budget = 0.0
+        graph.builder.nodes[domain].runnable.workflow = workflow
+
+    state = {
+        **TEXT_STATE,
+        "project_id": "PRJ-2023-001",
+        "request_type": "resource_allocation",
+        "query": "촬영 준비",
+    }
+
+    start = time.perf_counter()
+    result = asyncio.run(graph.ainvoke(state, with_deadline(0.3)))
+    assert time.perf_counter() - start < 1.0
+
+    # 캐시된 추출 결과가 없으면 페르소나 원문을 응답으로 쓰지 않고 건너뜀
+    assert result["response"] == []
+    reasons = _reasons(result)
+    assert reasons["PersonaExtractionNode"] == "timeout"
+    assert reasons["DomainWorkflowNode[management]"] == "timeout"
+    assert len(result["degraded_nodes"]) == len(reasons)
+    # 메인 상태의 기록은 서브그래프에 전달하지 않으므로 브랜치가 같은 기록을 다시 더하지 않음
+    text_node = graph.builder.nodes["text"].runnable
+    assert "degraded_nodes" not in text_node.get_chain_input(result)
+
+
+def test_sync_deadline_cancels_request(monkeypatch, node_cache) -> None:
+    """
+    동기 실행에서 LLM 요청을 마감 시각에 끊고, 예산이 부족하면 요청 없이 건너뛰는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    reset_usage()
+    with FakeProvider(ProviderConfig(latency_ms=3000)) as provider:
+        monkeypatch.setenv("OPENAI_BASE_URL", provider.base_url)
+        graph = TextWorkflow(TextState)()
+
+        start = time.perf_counter()
+        result = graph.invoke(TEXT_STATE, with_deadline(1.2))
+        assert time.perf_counter() - start < 2.0
+        assert _reasons(result) == {"PersonaExtractionNode": "timeout"}
+        assert provider.stats["requests"] == 1
+        # 대체 응답을 만들 때 노드 결과 캐시를 다시 조회해도 미스를 두 번 세지 않음
+        assert get_node_cache_usage("PersonaExtractionNode")["misses"] == 1
+
+        # 남은 시간이 min_budget보다 적으면 체인을 호출하지 않음
+        result = graph.invoke(TEXT_STATE, with_deadline(0.5))
+        assert _reasons(result) == {"PersonaExtractionNode": "skipped"}
+        assert "persona_extracted" not in result
+        assert provider.stats["requests"] == 1
+
+
+def test_fallback_prefers_cached_results(node_cache) -> None:
+    """
+    예산이 부족하면 키워드 페르소나 대신 의미 유사 캐시의 추출 결과를, 노드 결과 캐시가 있으면
+    그 결과를 성능 저하 기록 없이 사용하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    enabled = semantic_cache_enabled()
+    enable_semantic_cache()
+    reset_semantic_cache()
+    node = PersonaExtractionNode()
+    try:
+        get_semantic_cache().update("여름휴가", "블로그 글", "cached persona")
+        update = node.invoke(TEXT_STATE, with_deadline(0.5))
+        assert update["persona_extracted"] == "cached persona"
+        assert _reasons(update) == {"PersonaExtractionNode": "skipped"}
+
+        memoized = {"persona_extracted": "memoized", "response": "memoized"}
+        node.node_cache.update(node.node_cache.make_key(TEXT_STATE), memoized)
+        assert node.invoke(TEXT_STATE, with_deadline(0.5)) == memoized
+    finally:
+        enable_semantic_cache(enabled)
+        reset_semantic_cache()
+
+
+def test_deadline_keeps_unrelated_errors() -> None:
+    """
+    마감 시각이 지난 뒤에 발생한 예외라도 타임아웃이 아니면 대체 응답 없이 그대로 발생하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+
+    def fail_late(_):
+        time.sleep(0.1)
+        raise ValueError("bad input")
+
+    node = PersonaExtractionNode()
+    node.chain = RunnableLambda(fail_late)
+    node.min_budget = 0.0
+    with pytest.raises(ValueError):
+        node.invoke(TEXT_STATE, with_deadline(0.05))
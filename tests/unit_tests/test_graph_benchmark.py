@@ -0,0 +1,70 @@
+"""
+단위 테스트 모듈 - 오프라인 그래프 벤치마크 테스트
+
+이 모듈은 가짜 LLM 제공자와 그래프 벤치마크가 네트워크 없이 동작하는지 확인합니다.
+"""
+
+import os
+
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+from benchmarks.graph_benchmark import find_regressions, run_benchmark
+
+
+def test_fake_provider_streaming() -> None:
+    """
+    가짜 제공자가 일반 응답과 SSE 스트리밍 응답을 모두 돌려주는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    from agents.model_registry import get_chat_model
+
+    config = ProviderConfig(latency_ms=1, completion_tokens=3)
+    with FakeProvider(config) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+        assert model.invoke("hi").content == "token0 token1 token2 "
+        chunks = [chunk.content for chunk in model.stream("hi") if chunk.content]
+        assert chunks == ["token0 ", "token1 ", "token2 "]
+        assert provider.stats == {
+            "requests": 2,
+            "streams": 1,
+            "errors": 0,
+            "batches": 0,
+            "batched_requests": 0,
+        }
+
+
+def test_graph_benchmark_offline(monkeypatch) -> None:
+    """
+    모든 지표가 채워진 벤치마크 결과가 나오고, 주입된 오류가 집계되며,
+    벤치마크가 바꾼 환경변수가 끝난 뒤 되돌려지는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+
+    results = run_benchmark(
+        ["text", "image"],
+        [2],
+        runs=4,
+        alloc_runs=1,
+        config=ProviderConfig(latency_ms=1),
+    )
+    assert [result["graph"] for result in results] == ["text", "image"]
+    for result in results:
+        (level,) = result["levels"]
+        assert level["errors"] == 0
+        assert level["throughput_rps"] > 0
+        assert 0 < level["p50_ms"] <= level["p95_ms"] <= level["p99_ms"]
+        assert result["alloc_kib_per_run"] > 0
+
+    failing = ProviderConfig(latency_ms=1, error_rate=1.0, error_status=400)
+    (result,) = run_benchmark(["management"], [2], runs=4, alloc_runs=0, config=failing)
+    assert result["levels"][0]["errors"] == 4
+    assert os.environ["LLM_CACHE_ENABLED"] == "true"
+    assert "OPENAI_BASE_URL" not in os.environ
+
+    slower = [{**results[0], "levels": [{**results[0]["levels"][0], "p95_ms": 1e9}]}]
+    assert find_regressions(slower, results, tolerance=0.2)
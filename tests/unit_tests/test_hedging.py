@@ -0,0 +1,75 @@
+"""
+단위 테스트 모듈 - LLM 요청 헤징 테스트
+
+이 모듈은 첫 응답이 늦은 요청에 중복 요청을 보내 먼저 도착한 응답을 사용하고,
+헤징 결과가 노드별로 집계되는지 확인합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.hedging import configure_hedging, reset_hedging
+from agents.metrics import get_hedge_usage, reset_usage, track_node
+from agents.model_registry import get_chat_model
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+NODE = "PersonaExtractionNode"
+
+
+@pytest.fixture(autouse=True)
+def _reset_hedging():
+    reset_usage()
+    yield
+    reset_hedging()
+    reset_usage()
+
+
+def _stall_next_request(provider: FakeProvider):
+    """다음 요청 하나만 1.5초 지연되도록 설정합니다. (중복 요청은 바로 응답)"""
+    provider.config.latency_ms = 1500
+    timer = threading.Timer(0.25, setattr, (provider.config, "latency_ms", 1))
+    timer.start()
+    return timer
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_hedged_request(mode) -> None:
+    """
+    최근 지연의 백분위수 안에 응답하지 않은 요청에 중복 요청을 보내고 먼저 온 응답을 사용하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    configure_hedging(min_samples=3, min_delay=0.5, max_hedge_rate=1.0, nodes=[NODE])
+    with FakeProvider(ProviderConfig(latency_ms=1, completion_tokens=3)) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+
+        # 공유 비동기 클라이언트의 커넥션은 이벤트 루프에 묶이므로 하나의 루프를 계속 사용
+        loop = asyncio.new_event_loop()
+
+        def invoke(text):
+            with track_node(NODE):
+                if mode == "sync":
+                    return model.invoke(text)
+                return loop.run_until_complete(model.ainvoke(text))
+
+        for i in range(3):  # 첫 응답 지연 표본 수집
+            invoke(f"warmup {i}")
+        assert get_hedge_usage(NODE)["hedged"] == 0
+
+        timer = _stall_next_request(provider)
+        start = time.perf_counter()
+        assert invoke("stalled").content
+        assert time.perf_counter() - start < 1.0
+        timer.join()
+        loop.close()
+
+        usage = get_hedge_usage(NODE)
+        assert usage["requests"] == 4
+        assert usage["hedged"] == 1
+        assert usage["hedge_wins"] == 1
+        assert usage["extra_tokens"] > 0
+        assert provider.stats["requests"] == 5
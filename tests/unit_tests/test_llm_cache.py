@@ -0,0 +1,98 @@
+"""
+단위 테스트 모듈 - LLM 응답 캐시 테스트
+
+이 모듈은 TieredLLMCache의 적중/미스 집계, SQLite 영속성, LRU 제거 동작과
+기본 캐시가 켤 때만 모델 레지스트리의 모델에 연결되는지 확인합니다.
+실제 LLM 대신 LangChain의 가짜 채팅 모델을 사용합니다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.globals import get_llm_cache
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agents import llm_cache
+from agents.llm_cache import TieredLLMCache, get_cache_stats
+from agents.model_registry import get_chat_model, reset_registry
+
+
+def test_cache_hit_and_persistence(tmp_path) -> None:
+    """
+    같은 프롬프트의 두 번째 호출은 캐시에서 반환되고, 새 캐시 인스턴스에서도 유지되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    path = str(tmp_path / "cache.sqlite")
+    cache = TieredLLMCache(path=path)
+    model = FakeListChatModel(responses=["first", "second"], cache=cache)
+
+    assert model.invoke("hello").content == "first"
+    assert model.invoke("hello").content == "first"
+    assert cache.stats.misses == 1
+    assert cache.stats.memory_hits == 1
+
+    # 프로세스 재시작을 흉내내어 새 캐시 인스턴스로 조회
+    restarted = TieredLLMCache(path=path)
+    model = FakeListChatModel(responses=["first", "second"], cache=restarted)
+    model.i = 1  # 캐시가 없다면 "second"를 반환할 상태
+    assert model.invoke("hello").content == "first"
+    assert restarted.stats.disk_hits == 1
+
+
+def test_cache_eviction(tmp_path) -> None:
+    """
+    인메모리 LRU가 최대 항목 수를 넘으면 오래된 항목을 제거하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    cache = TieredLLMCache(path=str(tmp_path / "cache.sqlite"), max_entries=1)
+    cache.update("a", "llm", [])
+    cache.update("b", "llm", [])
+
+    assert cache.stats.evictions == 1
+    assert len(cache.memory) == 1
+
+
+def test_default_cache_opt_in(tmp_path, monkeypatch) -> None:
+    """
+    기본 캐시는 LLM_CACHE_ENABLED=true일 때만 레지스트리의 모델에 연결되고 전역 캐시는 바꾸지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    monkeypatch.setattr(llm_cache, "_default_cache", None)
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    reset_registry()
+    try:
+        assert get_chat_model().cache is None
+        assert get_cache_stats() == {}
+
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+        reset_registry()
+        assert isinstance(get_chat_model().cache, TieredLLMCache)
+        assert get_llm_cache() is None
+        assert get_cache_stats()["misses"] == 0
+    finally:
+        reset_registry()
+
+
+def test_cache_stats_thread_safe(tmp_path) -> None:
+    """
+    여러 스레드에서 동시에 조회/저장해도 적중 횟수와 LRU 제거 횟수가 빠짐없이 집계되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    cache = TieredLLMCache(path=str(tmp_path / "cache.sqlite"), max_entries=10)
+    cache.update("hit", "llm", [])
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda i: cache.lookup("hit", "llm"), range(2000)))
+        list(executor.map(lambda i: cache.memory.set(f"key-{i}", []), range(2000)))
+
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 2000
+    assert stats["evictions"] == 2000 + 1 - 10
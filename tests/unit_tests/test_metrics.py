@@ -0,0 +1,127 @@
+"""
+단위 테스트 모듈 - 노드 실행 지표 테스트
+
+이 모듈은 노드 실행 지표(실행 시간, TTFT, 토큰 수, 예외)가 (Workflow, 노드)별로 기록되고
+Prometheus/JSONL로 내보내지는지 확인합니다.
+"""
+
+import json
+from itertools import repeat
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+
+from agents import metrics
+from agents.base_node import BaseNode
+from agents.text.modules.state import TextState
+from agents.text.workflow import TextWorkflow
+
+
+class FailingNode(BaseNode):
+    def execute(self, state) -> dict:
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset_metrics()
+    metrics.enable_metrics()
+    yield
+    metrics.enable_metrics(False)
+    metrics.reset_metrics()
+
+
+def test_node_metrics_recorded(enabled_metrics) -> None:
+    """
+    스트리밍 실행에서 실행 시간, TTFT, 토큰 수가 Workflow/노드 이름으로 기록되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    model = GenericFakeChatModel(
+        messages=repeat(AIMessage(content="calm dream pop")),
+        callbacks=[metrics.USAGE_CALLBACK],
+    )
+    graph = TextWorkflow(TextState)()
+    node = graph.builder.nodes["persona_extraction"].runnable
+    node.chain = RunnableLambda(str) | model | StrOutputParser()
+
+    state = {"content_topic": "여름 휴가", "content_type": "블로그 글", "response": []}
+    list(graph.stream(state, stream_mode="messages"))
+    with metrics.track_node(node.name, node.workflow_name):
+        metrics.record_usage(node.name, {"input_tokens": 10, "output_tokens": 4})
+
+    (record,) = metrics.get_node_metrics()
+    assert (record["workflow"], record["node"]) == (
+        "TextWorkflow",
+        "PersonaExtractionNode",
+    )
+    assert record["calls"] == 2
+    assert record["latency_seconds"]["count"] == 2
+    assert record["ttft_seconds"]["count"] == 1
+    assert (record["prompt_tokens"], record["completion_tokens"]) == (10, 4)
+
+    line = json.loads(metrics.export_jsonl().splitlines()[0])
+    assert line["node"] == "PersonaExtractionNode"
+
+
+def test_node_errors_exported(enabled_metrics) -> None:
+    """
+    노드 예외가 예외 종류별로 기록되고 Prometheus 형식으로 내보내지는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    with pytest.raises(RuntimeError):
+        FailingNode()({})
+
+    text = metrics.export_prometheus()
+    assert (
+        'agent_node_errors_total{workflow="unknown",node="FailingNode",error="RuntimeError"} 1'
+        in text
+    )
+    assert (
+        'agent_node_latency_seconds_bucket{workflow="unknown",node="FailingNode",le="+Inf"} 1'
+        in text
+    )
+
+
+def test_disabled_metrics_not_recorded() -> None:
+    """
+    지표가 꺼져 있으면 아무것도 기록되지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    metrics.reset_metrics()
+    with pytest.raises(RuntimeError):
+        FailingNode()({})
+    assert metrics.get_node_metrics() == []
+
+
+def test_llm_cache_hits_not_counted() -> None:
+    """
+    LLM 응답 캐시에서 가져온 응답의 토큰은 노드 사용량에 더하지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    metrics.reset_usage()
+    usage = {"input_tokens": 10, "output_tokens": 4, "total_tokens": 14}
+    model = GenericFakeChatModel(
+        messages=repeat(AIMessage(content="calm dream pop", usage_metadata=usage)),
+        cache=InMemoryCache(),
+        callbacks=[metrics.USAGE_CALLBACK],
+    )
+
+    with metrics.track_node("CachedNode"):
+        model.invoke("hello")
+        model.invoke("hello")  # 캐시 적중
+
+    result = metrics.get_node_usage("CachedNode")
+    assert (result["calls"], result["input_tokens"]) == (1, 10)
+    metrics.reset_usage()
@@ -0,0 +1,45 @@
+"""
+단위 테스트 모듈 - 공유 모델 클라이언트 레지스트리 테스트
+
+이 모듈은 공유 비동기 클라이언트가 이벤트 루프마다 별도의 커넥션 풀을 사용하여,
+asyncio.run()을 여러 번 호출해도 닫힌 루프의 커넥션을 재사용하지 않는지 확인합니다.
+"""
+
+import asyncio
+
+from agents.model_registry import (
+    LoopLocalAsyncTransport,
+    get_chat_model,
+    get_http_clients,
+)
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+
+def _loop_local_transport() -> LoopLocalAsyncTransport:
+    transport = get_http_clients()[1]._transport
+    while not isinstance(transport, LoopLocalAsyncTransport):
+        transport = transport.transport
+    return transport
+
+
+def test_async_pool_per_event_loop() -> None:
+    """
+    이벤트 루프가 바뀌면 새 커넥션 풀을 사용하고, 같은 루프에서는 같은 풀을 재사용하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    transport = _loop_local_transport()
+
+    async def current_pools():
+        return transport.current(), transport.current()
+
+    first, same = asyncio.run(current_pools())
+    second, _ = asyncio.run(current_pools())
+    assert first is same
+    assert second is not first
+
+    with FakeProvider(ProviderConfig(latency_ms=1, completion_tokens=2)) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+        for _ in range(2):
+            assert asyncio.run(model.ainvoke("hello")).content
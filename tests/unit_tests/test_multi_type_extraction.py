@@ -0,0 +1,83 @@
+"""
+단위 테스트 모듈 - 여러 콘텐츠 유형 페르소나 추출 테스트
+
+이 모듈은 여러 콘텐츠 유형의 페르소나를 한 번의 LLM 호출로 추출하고,
+결과가 유형별로 나뉘어 상태 업데이트에 담기는지 확인합니다.
+"""
+
+import json
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from agents.text.modules import chains
+from agents.text.modules.chains import split_personas
+from agents.text.modules.nodes import PersonaExtractionNode
+
+TYPES = ["블로그 글", "인스타그램 캡션"]
+
+
+def test_multi_type_chain_single_call(monkeypatch) -> None:
+    """
+    콘텐츠 유형 목록을 한 번의 LLM 호출로 추출하고 유형별로 나누는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    response = json.dumps(
+        {"블로그 글": "긴 페르소나", "인스타그램캡션": "짧은 페르소나"}
+    )
+    # 응답을 모두 소진하면 i가 0으로 돌아가므로 두 번째 응답을 남겨 호출 횟수를 확인
+    model = FakeListChatModel(responses=[response, "unused"])
+    monkeypatch.setattr(chains, "get_openai_model", lambda: model)
+
+    chain = chains.set_extraction_chain(multi_type=True)
+    result = chain.invoke({"content_topic": "여름 휴가", "content_types": TYPES})
+
+    assert result == {"블로그 글": "긴 페르소나", "인스타그램 캡션": "짧은 페르소나"}
+    assert model.i == 1  # LLM 호출은 한 번
+
+
+def test_split_personas_missing_type() -> None:
+    """
+    요청한 유형이 결과에 없으면 OutputParserException이 발생하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    with pytest.raises(OutputParserException):
+        split_personas({"블로그 글": "페르소나"}, TYPES)
+    with pytest.raises(OutputParserException):
+        split_personas(["페르소나"], TYPES)
+
+
+def test_node_multi_type_update() -> None:
+    """
+    content_types가 있으면 노드가 여러 유형 체인을 한 번 호출하여 유형별 결과를 반환하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    calls = []
+
+    def extract(chain_input):
+        calls.append(chain_input)
+        return {t: f"persona for {t}" for t in chain_input["content_types"]}
+
+    node = PersonaExtractionNode()
+    node.multi_chain = RunnableLambda(extract)
+    state = {
+        "content_topic": "여름 휴가",
+        "content_type": "인스타그램 캡션",
+        "content_types": TYPES,
+        "response": [],
+    }
+
+    update = node.invoke(state)
+
+    assert calls == [{"content_topic": "여름 휴가", "content_types": TYPES}]
+    assert update["persona_by_type"] == {t: f"persona for {t}" for t in TYPES}
+    assert update["persona_extracted"] == "persona for 인스타그램 캡션"
+    assert update["response"] == [f"[{t}]\npersona for {t}" for t in TYPES]
@@ -0,0 +1,74 @@
+"""
+단위 테스트 모듈 - 노드 결과 메모이제이션 테스트
+
+이 모듈은 cache_keys를 선언한 노드가 해당 키의 값이 같으면 노드 실행을 건너뛰고
+이전 상태 업데이트를 재사용하며, 노드별 적중률이 기록되는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agents.metrics import get_node_cache_usage, reset_usage
+from agents.node_cache import canonical_hash, enable_node_cache, node_cache_enabled
+from agents.text.modules.nodes import PersonaExtractionNode
+
+NODE = "PersonaExtractionNode"
+
+
+@pytest.fixture(autouse=True)
+def node_cache():
+    """노드 메모이제이션은 기본으로 꺼져 있으므로 테스트 동안만 켭니다."""
+    enabled = node_cache_enabled()
+    enable_node_cache()
+    try:
+        yield
+    finally:
+        enable_node_cache(enabled)
+
+
+def test_node_memoized_on_state_slice() -> None:
+    """
+    선언한 키만 같으면 다른 상태 값과 관계없이 체인을 다시 호출하지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    reset_usage()
+    calls = []
+
+    def extract(chain_input):
+        calls.append(chain_input["content_topic"])
+        return f"persona for {chain_input['content_topic']}"
+
+    node = PersonaExtractionNode()
+    node.chain = RunnableLambda(extract)
+    state = {"content_topic": "여름 휴가", "content_type": "블로그 글", "response": []}
+
+    first = node.invoke(state)
+    assert node.invoke({**state, "response": ["이전 응답"]}) == first
+    assert asyncio.run(node.ainvoke(state)) == first
+    node.invoke({**state, "content_topic": "겨울 여행"})
+
+    assert calls == ["여름 휴가", "겨울 여행"]
+    usage = get_node_cache_usage(NODE)
+    assert (usage["hits"], usage["misses"]) == (2, 2)
+    assert usage["hit_ratio"] == 0.5
+
+    # 반환된 업데이트를 변경해도 저장된 결과는 그대로 유지
+    first["response"] = "changed"
+    assert node.invoke(state)["response"] == "persona for 여름 휴가"
+
+
+def test_canonical_hash() -> None:
+    """
+    키 순서가 달라도 내용이 같으면 같은 해시를 반환하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    a = {"team_members": ["김철수"], "resources_available": {"a": 1, "b": 2}}
+    b = {"resources_available": {"b": 2, "a": 1}, "team_members": ["김철수"]}
+    assert canonical_hash(a) == canonical_hash(b)
+    assert canonical_hash(a) != canonical_hash({**a, "team_members": ["이영희"]})
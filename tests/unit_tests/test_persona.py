@@ -0,0 +1,58 @@
+"""
+단위 테스트 모듈 - 페르소나 섹션 인덱스 테스트
+
+이 모듈은 PERSONA가 섹션 단위로 분해되고, 콘텐츠 유형/주제에 맞는 섹션만 선택되는지 확인합니다.
+"""
+
+from agents.text.modules.persona import (
+    BASE_SECTIONS,
+    PERSONA_SECTIONS,
+    SECTION_KEYWORDS,
+    select_persona,
+    select_persona_sections,
+)
+
+
+def test_persona_sections_indexed() -> None:
+    """
+    키워드 선택기가 사용하는 모든 섹션이 PERSONA에서 분해되었는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    for key in (*BASE_SECTIONS, *SECTION_KEYWORDS):
+        assert PERSONA_SECTIONS.get(key)
+
+
+def test_select_persona_subset() -> None:
+    """
+    콘텐츠 유형에 맞는 섹션만 선택되고, 일치하는 키워드가 없으면 전체가 선택되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    sections = select_persona_sections("가사", "이별")
+    assert "lyrics" in sections
+    assert "fashion" not in sections
+    assert set(BASE_SECTIONS) <= set(sections)
+
+    assert select_persona_sections("unknown", "") == tuple(PERSONA_SECTIONS)
+    assert PERSONA_SECTIONS["lyrics"] in select_persona("가사", "이별")
+
+
+def test_keywords_match_whole_words() -> None:
+    """
+    키워드가 다른 단어의 일부("singapore", "discover", "곡선", "postcard")와 일치하지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    assert "voice" not in select_persona_sections("블로그 글", "singapore 여행")
+    assert "voice" not in select_persona_sections("블로그 글", "using the app")
+    assert "voice" not in select_persona_sections("블로그 글", "discover")
+    assert "music" not in select_persona_sections("블로그 글", "곡선 디자인")
+    assert "writing" not in select_persona_sections("postcard", "여행")
+
+    assert "voice" in select_persona_sections("singer", "")
+    assert "music" in select_persona_sections("songs", "")
+    assert "music" in select_persona_sections("이별 곡을", "")
@@ -0,0 +1,114 @@
+"""
+단위 테스트 모듈 - 프롬프트 레지스트리 및 토큰 예산 테스트
+
+이 모듈은 프롬프트가 한 번만 컴파일되어 공유되고, 토큰 예산을 넘는 입력이
+우선순위 순서대로 줄어들어 렌더링된 프롬프트가 예산 안에 드는지 확인합니다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.management.modules.prompts import (
+    RESOURCE_PLANNING,
+    get_resource_planning_prompt,
+)
+from agents.prompt_registry import CompiledPrompt, PromptBudget, get_prompt
+from agents.text.modules.persona import select_persona_titles
+from agents.text.modules.prompts import PERSONA_EXTRACTION
+from agents.tokenizer import count_tokens
+
+VALUES = {
+    "project_id": "PRJ-001",
+    "request_type": "resource_allocation",
+    "query": "신곡 뮤직비디오 촬영 일정과 인력 배치를 계획해 주세요.",
+    "team_members": [f"member-{i}" for i in range(10)],
+    "resources_available": {"budget": "5000만원", "studio": "A동"},
+}
+
+
+def test_prompt_compiled_once() -> None:
+    """
+    같은 이름의 프롬프트는 한 번만 컴파일되고, 예산 안의 입력은 그대로 렌더링되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    prompt = get_prompt(RESOURCE_PLANNING)
+
+    assert get_prompt(RESOURCE_PLANNING) is prompt
+    assert 0 < prompt.static_tokens < count_tokens(prompt.template.template)
+    assert prompt.fit(VALUES) is VALUES
+    assert prompt.render(VALUES) == get_resource_planning_prompt().format(**VALUES)
+
+
+def test_budget_truncates_in_priority_order() -> None:
+    """
+    예산을 넘으면 우선순위가 높은 변수부터 줄이고, 우선순위에 없는 변수는 유지하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    values = {
+        **VALUES,
+        "team_members": [f"member-{i}" for i in range(200)],
+        "resources_available": {f"equipment-{i}": "available" for i in range(500)},
+    }
+    budget = PromptBudget(
+        max_tokens=800, priority=("resources_available", "team_members", "query")
+    )
+    prompt = CompiledPrompt("test", get_resource_planning_prompt(), budget)
+
+    fitted = prompt.fit(values)
+
+    assert count_tokens(prompt.template.format(**fitted)) <= budget.max_tokens
+    assert "more items omitted" in fitted["resources_available"]
+    assert fitted["query"] == values["query"]  # 앞선 변수를 줄여 예산 안에 들면 유지
+    assert fitted["project_id"] == values["project_id"]
+    assert prompt.stats.truncated == 1
+    assert "resources_available" in prompt.stats.truncated_fields
+
+
+def test_stats_thread_safe() -> None:
+    """
+    여러 스레드에서 동시에 렌더링해도 렌더링 횟수가 빠짐없이 집계되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    prompt = CompiledPrompt("test", get_resource_planning_prompt())
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: prompt.fit(VALUES), range(2000)))
+
+    assert prompt.get_stats()["renders"] == 2000
+    assert prompt.get_stats()["truncated"] == 0
+
+
+def test_persona_prompt_static_prefix() -> None:
+    """
+    콘텐츠 유형/주제가 달라도 페르소나 추출 프롬프트의 앞 1024 토큰 이상이 같은지 테스트합니다.
+
+    접두부 캐시는 1024 토큰 이상 같은 접두부부터 적중합니다.
+
+    Returns:
+        None
+    """
+    prompt = get_prompt(PERSONA_EXTRACTION)
+    first, second = (
+        prompt.render(
+            {
+                "content_type": content_type,
+                "content_topic": content_topic,
+                "persona_sections": select_persona_titles(content_type, content_topic),
+            }
+        )
+        for content_type, content_topic in (
+            ("블로그 글", "여름 휴가"),
+            ("노래 가사", "이별"),
+        )
+    )
+
+    common = next(
+        (i for i, (a, b) in enumerate(zip(first, second)) if a != b),
+        min(len(first), len(second)),
+    )
+    assert count_tokens(first[:common]) >= 1024
@@ -0,0 +1,118 @@
+"""
+단위 테스트 모듈 - LLM 호출 속도 제한 테스트
+
+이 모듈은 토큰 버킷 예산과 AIMD 동시성 제어가 공유 클라이언트의 모든 요청에 적용되는지 확인합니다.
+"""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from agents.model_registry import get_chat_model
+from agents.rate_limiter import (
+    AIMDController,
+    RateLimiter,
+    TokenBucket,
+    configure_rate_limiter,
+    reset_rate_limiter,
+)
+from agents.tokenizer import count_message_tokens
+from benchmarks.fake_provider import FakeProvider, ProviderConfig
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiter():
+    yield
+    reset_rate_limiter()
+
+
+def test_token_bucket_and_controller() -> None:
+    """
+    토큰 버킷 대기 시간과 AIMD 한도 증가/감소를 테스트합니다.
+
+    Returns:
+        None
+    """
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)  # 초당 1개 보충
+
+    controller = AIMDController(initial_limit=4, max_limit=8)
+    for _ in range(4):
+        controller.acquire()
+        controller.release(latency=0.01)
+    assert controller.limit == pytest.approx(5.0, abs=0.1)  # 한도만큼 성공하면 +1
+
+    controller.acquire()
+    controller.release(latency=0.01, throttled=True)
+    assert int(controller.limit) == 2
+    assert controller.throttled == 1
+
+    assert count_message_tokens([{"role": "user", "content": "hello"}]) > 4
+
+
+def test_rate_limited_requests() -> None:
+    """
+    스트리밍을 포함한 모든 요청이 슬롯을 반납하고, 429 응답이 동시성 한도를 줄이는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    limiter = configure_rate_limiter(
+        requests_per_minute=6000, tokens_per_minute=1_000_000, initial_limit=4
+    )
+    with FakeProvider(ProviderConfig(latency_ms=1, completion_tokens=3)) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+        model.invoke("hello")
+        assert [chunk.content for chunk in model.stream("stream")]
+
+        async def run_concurrently():
+            await asyncio.gather(*(model.ainvoke(f"async {i}") for i in range(8)))
+
+        asyncio.run(run_concurrently())
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["limit"] >= 4
+
+    config = ProviderConfig(latency_ms=1, error_rate=1.0, error_status=429)
+    with FakeProvider(config) as provider:
+        model = get_chat_model(base_url=provider.base_url)
+        with pytest.raises(openai.RateLimitError):
+            model.invoke("throttled")
+    stats = limiter.stats()
+    assert stats["in_flight"] == 0
+    assert stats["throttled"] >= 1
+    assert stats["limit"] < 4
+
+
+def test_latency_samples_and_refund() -> None:
+    """
+    스트리밍이 아닌 정상 응답의 헤더 지연(생성 시간 포함)으로는 한도를 줄이지 않고,
+    대기 중 취소된 요청은 예약한 토큰을 돌려주는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    limiter = RateLimiter(controller=AIMDController(initial_limit=4))
+    for latency, streaming in ((0.01, True), (0.01, True), (5.0, False)):
+        limiter.controller.acquire()
+        limiter.release(latency, httpx.Response(200), streaming=streaming)
+    assert int(limiter.controller.limit) >= 4
+
+    limiter.controller.acquire()
+    limiter.release(5.0, httpx.Response(200), streaming=True)
+    assert int(limiter.controller.limit) < 4
+
+    limiter = RateLimiter(tokens_per_minute=60)
+
+    async def cancel_waiting():
+        await limiter.aacquire(60)
+        task = asyncio.create_task(limiter.aacquire(30))  # 30초를 기다려야 함
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_waiting())
+    assert limiter.tokens.tokens == pytest.approx(0.0, abs=0.5)
@@ -0,0 +1,84 @@
+"""
+단위 테스트 모듈 - 메시지 reducer 테스트
+
+이 모듈은 add_indexed_messages가 LangGraph의 add_messages와 같은 병합 결과를 내는지 확인합니다.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
+
+from agents.reducers import add_indexed_messages
+
+
+def contents(messages) -> list:
+    return [(message.id, message.content) for message in messages]
+
+
+def test_matches_add_messages() -> None:
+    """
+    추가, ID 교체, 삭제를 거친 결과가 add_messages와 같은지 테스트합니다.
+
+    Returns:
+        None
+    """
+    updates = [
+        [HumanMessage("hi", id="1"), AIMessage("hello", id="2")],
+        AIMessage("bye", id="3"),
+        [AIMessage("hello again", id="2"), HumanMessage("more", id="4")],
+        [RemoveMessage(id="1"), AIMessage("last", id="5")],
+    ]
+
+    expected, merged = [], []
+    for update in updates:
+        expected = add_messages(expected, update)
+        merged = add_indexed_messages(merged, update)
+        assert contents(merged) == contents(expected)
+
+    with pytest.raises(ValueError):
+        add_indexed_messages(merged, RemoveMessage(id="missing"))
+
+    cleared = add_indexed_messages(
+        merged, [RemoveMessage(id=REMOVE_ALL_MESSAGES), HumanMessage("new", id="6")]
+    )
+    assert contents(cleared) == [("6", "new")]
+
+
+def test_previous_snapshots_unchanged() -> None:
+    """
+    병합 후에도 이전 상태가 바뀌지 않고, 이전 상태에서 분기해도 올바르게 병합되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    base = add_indexed_messages([], [HumanMessage("a", id="1")])
+    first = add_indexed_messages(base, [AIMessage("b", id="2")])
+    branch = add_indexed_messages(
+        base, [AIMessage("c", id="3"), AIMessage("a2", id="1")]
+    )
+
+    assert contents(base) == [("1", "a")]
+    assert contents(first) == [("1", "a"), ("2", "b")]
+    assert contents(branch) == [("1", "a2"), ("3", "c")]
+    assert contents(add_indexed_messages(first, AIMessage("b2", id="2"))) == [
+        ("1", "a"),
+        ("2", "b2"),
+    ]
+
+
+def test_checkpoint_roundtrip() -> None:
+    """
+    체크포인트 직렬화 후 복원된 일반 list에도 계속 병합할 수 있는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    serde = JsonPlusSerializer()
+    merged = add_indexed_messages([], [HumanMessage("hi", id="1")])
+
+    restored = serde.loads_typed(serde.dumps_typed(merged))
+    assert contents(restored) == contents(merged)
+    assert contents(add_indexed_messages(restored, AIMessage("hey", id="1"))) == [
+        ("1", "hey")
+    ]
@@ -0,0 +1,52 @@
+"""
+단위 테스트 모듈 - 그래프 레지스트리 테스트
+
+이 모듈은 레지스트리가 langgraph.json과 같은 진입점을 제공하고,
+패키지 import가 Workflow 모듈을 즉시 로드하지 않는지 확인합니다.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from agents.registry import GRAPHS, get_workflow
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_registry_matches_langgraph_json() -> None:
+    """
+    레지스트리의 그래프 목록이 langgraph.json과 일치하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    graphs = json.loads((ROOT / "langgraph.json").read_text())["graphs"]
+    expected = {
+        name: path.removeprefix("./").replace(".py", "").replace("/", ".")
+        for name, path in graphs.items()
+    }
+    assert GRAPHS == expected
+    assert get_workflow("image").name == "ImageWorkflow"
+
+
+def test_package_import_is_lazy() -> None:
+    """
+    agents 패키지와 도메인 패키지를 import해도 Workflow 모듈이 로드되지 않는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    code = (
+        "import sys, agents, agents.text, agents.management; "
+        "print(any(m.endswith('workflow') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,77 @@
+"""
+단위 테스트 모듈 - 로컬 라우터 테스트
+
+이 모듈은 메인 Workflow의 로컬 라우터가 규칙과 문자 n-gram 분류기로 도메인을 고르고,
+확신하지 못할 때만 LLM 대체를 사용하며, 결정 방식별 횟수를 기록하는지 확인합니다.
+"""
+
+from agents.conditions import LocalRouter, route_domains
+from agents.metrics import get_route_usage, reset_usage
+
+
+def test_router_rules_classifier_and_fallback() -> None:
+    """
+    규칙 → 분류기 → LLM 대체 순서로 도메인을 결정하고 결정 방식을 기록하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    reset_usage()
+    fallback_calls = []
+
+    def fallback(query):
+        fallback_calls.append(query)
+        return ["music", "video"]  # 알 수 없는 도메인은 무시
+
+    router = LocalRouter(llm_fallback=fallback)
+
+    assert router.route("앨범 커버 이미지와 신곡 가사") == ["image", "music"]
+    assert router.route("후렴구 훅 아이디어 줘") == ["music"]
+    assert router.route("hello there") == ["music"]
+    assert router.route("hello there", allow_fallback=False) == []
+
+    assert fallback_calls == ["hello there"]
+    usage = get_route_usage()
+    assert usage["rule"]["domains"] == {"image": 1, "music": 1}
+    assert usage["classifier"] == {"decisions": 1, "domains": {"music": 1}}
+    assert usage["llm"]["decisions"] == 1
+    assert usage["unsure"]["decisions"] == 1
+
+
+def test_route_domains_adds_routed_domains() -> None:
+    """
+    입력값으로 도메인이 정해지지 않았을 때만 쿼리로 고른 도메인을 선택하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    text_inputs = {"content_topic": "여름 휴가", "content_type": "블로그 글"}
+    management_inputs = {"project_id": "PRJ-001", "request_type": "resource_planning"}
+
+    assert route_domains({"query": "여름 앨범 커버 이미지"}) == ["image"]
+    assert route_domains({**text_inputs, "query": "포스터 이미지도"}) == ["text"]
+    # 관리 요청의 쿼리에 음악/이미지 키워드가 있어도 다른 도메인을 추가하지 않음
+    for query in (
+        "신곡 뮤직비디오 촬영을 위한 인력 배정",
+        "앨범 발매 일정에 맞춰 포스터 촬영 리소스 계획",
+    ):
+        assert route_domains({**management_inputs, "query": query}) == ["management"]
+    # 필수 입력을 쿼리로 만들 수 없는 management도 선택하고, 노드가 필요한 입력을 안내함
+    assert route_domains({"query": "다음 달 촬영 일정"}) == ["management"]
+    assert route_domains({"query": "hello"}) == ["join"]
+
+
+def test_route_domains_text_only_query() -> None:
+    """
+    쿼리만으로 text를 고르면 쿼리로 만든 콘텐츠 주제/유형을 더해 text 브랜치로 보내는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    [send] = route_domains({"query": "여름 블로그 글 써줘"})
+
+    assert send.node == "text"
+    assert send.arg["content_topic"] == "여름 블로그 글 써줘"
+    assert send.arg["content_type"] == "블로그 글"
+    [send] = route_domains({"query": "신제품 인스타 캡션 부탁해"})
+    assert send.arg["content_type"] == "인스타그램 캡션"
@@ -0,0 +1,138 @@
+"""
+단위 테스트 모듈 - 페르소나 추출 의미 유사 캐시 테스트
+
+이 모듈은 표기만 다른 주제/유형의 추출 요청이 이전 추출 결과를 재사용하고,
+다른 주제나 다른 페르소나 섹션이 필요한 요청은 체인을 다시 호출하는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from agents.text.modules.semantic_cache import (
+    SemanticCache,
+    SemanticCachedRunnable,
+    configure_semantic_cache,
+    enable_semantic_cache,
+    normalize_text,
+    reset_semantic_cache,
+    semantic_cache_enabled,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_semantic_cache():
+    # 의미 유사 캐시는 기본으로 꺼져 있으므로 테스트 동안만 켬
+    enabled = semantic_cache_enabled()
+    enable_semantic_cache()
+    try:
+        yield
+    finally:
+        enable_semantic_cache(enabled)
+        reset_semantic_cache()
+
+
+def test_normalize_text() -> None:
+    """
+    NFC 정규화, 공백/문장 부호 정리, 조사 제거가 적용되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    decomposed = "휴가"  # 자모로 분해된 "휴가"
+    assert normalize_text(f"  여름 {decomposed}를!! ") == "여름 휴가"
+    assert normalize_text("여름휴가에서는") == "여름휴가"
+    assert normalize_text("제주도") == "제주도"  # 명사 끝 글자와 겹치는 조사는 유지
+    assert normalize_text("Summer Vacation", {"summer vacation": "여름 휴가"}) == (
+        "여름 휴가"
+    )
+
+
+def test_near_duplicate_topics_reuse_extraction() -> None:
+    """
+    표기만 다른 주제는 체인을 호출하지 않고, 다른 주제와 다른 유형은 새로 추출하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    configure_semantic_cache(threshold=0.85)
+    calls = []
+
+    def extract(chain_input):
+        calls.append(chain_input["content_topic"])
+        return f"persona for {chain_input['content_topic']}"
+
+    chain = SemanticCachedRunnable(RunnableLambda(extract))
+    blog = "블로그 글"
+
+    assert chain.invoke({"content_topic": "여름 휴가", "content_type": blog})
+    for topic in ("여름휴가", "여름 휴가를", " 여름  휴가! "):
+        result = chain.invoke({"content_topic": topic, "content_type": blog})
+        assert result == "persona for 여름 휴가"
+    result = asyncio.run(
+        chain.ainvoke({"content_topic": "여름휴가", "content_type": blog})
+    )
+    assert result == "persona for 여름 휴가"
+
+    chain.invoke({"content_topic": "겨울 여행", "content_type": blog})
+    # 유형이 다르면 페르소나 섹션과 프롬프트가 달라지므로 재사용하지 않음
+    chain.invoke({"content_topic": "여름 휴가", "content_type": "노래 가사"})
+    assert calls == ["여름 휴가", "겨울 여행", "여름 휴가"]
+
+
+def test_eviction_removes_index_entries() -> None:
+    """
+    최대 항목 수를 넘으면 오래된 항목이 인덱스에서도 제거되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    cache = SemanticCache(max_entries=2)
+    for topic in ("여름 휴가", "겨울 여행", "가을 캠핑"):
+        cache.update(topic, "블로그 글", topic)
+    assert cache.lookup("여름 휴가", "블로그 글") is None
+    assert cache.lookup("가을캠핑", "블로그 글") == "가을 캠핑"
+    assert cache.stats()["entries"] == 2
+
+
+class _BatchRecorder(Runnable):
+    """batch/abatch로 받은 주제 목록을 기록하는 추출 체인"""
+
+    def __init__(self):
+        self.batches = []
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.batch([input])[0]
+
+    def batch(self, inputs, config=None, **kwargs):
+        self.batches.append([i["content_topic"] for i in inputs])
+        return [f"persona for {i['content_topic']}" for i in inputs]
+
+    async def abatch(self, inputs, config=None, **kwargs):
+        return self.batch(inputs)
+
+
+def test_batch_checks_cache_per_item() -> None:
+    """
+    batch/abatch는 캐시에 있는 입력을 재사용하고, 없는 입력만 감싼 체인의 batch로 한 번에 실행하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    configure_semantic_cache(threshold=0.85)
+    bound = _BatchRecorder()
+    chain = SemanticCachedRunnable(bound)
+
+    def inputs(*topics):
+        return [{"content_topic": t, "content_type": "블로그 글"} for t in topics]
+
+    chain.invoke(inputs("여름 휴가")[0])
+    assert chain.batch(inputs("여름휴가", "겨울 여행", "가을 캠핑")) == [
+        "persona for 여름 휴가",
+        "persona for 겨울 여행",
+        "persona for 가을 캠핑",
+    ]
+    results = asyncio.run(chain.abatch(inputs("겨울여행", "봄 소풍")))
+    assert results == ["persona for 겨울 여행", "persona for 봄 소풍"]
+    assert bound.batches == [["여름 휴가"], ["겨울 여행", "가을 캠핑"], ["봄 소풍"]]
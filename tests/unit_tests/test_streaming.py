@@ -0,0 +1,74 @@
+"""
+단위 테스트 모듈 - 노드 토큰 스트리밍 테스트
+
+이 모듈은 LLM 노드가 stream_mode="messages"에서 토큰을 즉시 스트리밍하고,
+완성된 텍스트가 상태(persona_extracted, resource_plan)에 담기는지 확인합니다.
+실제 LLM 대신 LangChain의 가짜 채팅 모델을 사용합니다.
+"""
+
+import asyncio
+from itertools import repeat
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+
+from agents.management.modules.state import ManagementState
+from agents.management.workflow import ManagementWorkflow
+from agents.text.modules.state import TextState
+from agents.text.workflow import TextWorkflow
+
+
+def fake_chain(text: str):
+    model = GenericFakeChatModel(messages=repeat(AIMessage(content=text)))
+    return RunnableLambda(str) | model | StrOutputParser()
+
+
+def build_graph(workflow, node_name: str, text: str):
+    graph = workflow()
+    graph.builder.nodes[node_name].runnable.chain = fake_chain(text)
+    return graph
+
+
+def test_text_streaming() -> None:
+    """
+    페르소나 추출 노드의 토큰이 스트리밍되고 persona_extracted에 전체 텍스트가 담기는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    graph = build_graph(TextWorkflow(TextState), "persona_extraction", "calm dream pop")
+    state = {"content_topic": "여름 휴가", "content_type": "블로그 글", "response": []}
+
+    tokens = [chunk.content for chunk, _ in graph.stream(state, stream_mode="messages")]
+    assert len(tokens) > 1
+    assert "".join(tokens) == "calm dream pop"
+    assert graph.invoke(state)["persona_extracted"] == "calm dream pop"
+
+
+def test_management_streaming() -> None:
+    """
+    리소스 관리 노드의 토큰이 비동기 실행에서도 스트리밍되고 resource_plan에 담기는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    graph = build_graph(
+        ManagementWorkflow(ManagementState), "resource_management", "plan step one"
+    )
+    state = {
+        "project_id": "PRJ-1",
+        "request_type": "resource_allocation",
+        "query": "팀 리소스 계획",
+        "response": [],
+    }
+
+    async def collect():
+        return [
+            chunk.content
+            async for chunk, _ in graph.astream(state, stream_mode="messages")
+        ]
+
+    assert "".join(asyncio.run(collect())) == "plan step one"
+    assert asyncio.run(graph.ainvoke(state))["resource_plan"] == "plan step one"
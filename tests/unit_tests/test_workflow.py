@@ -0,0 +1,130 @@
+"""
+단위 테스트 모듈 - Workflow 테스트
+
+이 모듈은 BaseWorkflow의 컴파일 그래프 캐시 동작과 메인 Workflow의 병렬 분기를 확인합니다.
+"""
+
+import threading
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agents.conditions import route_domains
+from agents.image.modules.state import ImageState
+from agents.image.workflow import ImageWorkflow
+from agents.main_state import MainState
+from agents.management.modules.state import ManagementState
+from agents.management.workflow import ManagementWorkflow
+from agents.text.modules.state import TextState
+from agents.text.workflow import TextWorkflow
+from agents.workflow import MainWorkflow
+
+
+def test_workflow_memoized() -> None:
+    """
+    같은 설정으로 호출하면 캐시된 그래프를, invalidate 이후에는 새 그래프를 반환하는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    workflow = ImageWorkflow(ImageState)
+
+    graph = workflow()
+    assert workflow() is graph
+
+    workflow.invalidate()
+    assert workflow() is not graph
+
+
+def test_main_workflow_parallel_branches() -> None:
+    """
+    메인 Workflow가 text, management 브랜치를 병렬로 실행하고 응답을 도메인 순서대로 병합하는지 테스트합니다.
+
+    두 브랜치가 같은 Barrier를 기다리므로 순차 실행이면 타임아웃으로 실패합니다.
+
+    Returns:
+        None
+    """
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other_branch(value):
+        barrier.wait()
+        return value
+
+    def fake_workflow(workflow, node_name, text):
+        graph = workflow()
+        graph.builder.nodes[node_name].runnable.chain = RunnableLambda(
+            wait_for_other_branch
+        ) | RunnableLambda(lambda _: text)
+        return workflow
+
+    graph = MainWorkflow(MainState)()
+    graph.builder.nodes["text"].runnable.workflow = fake_workflow(
+        TextWorkflow(TextState), "persona_extraction", "persona"
+    )
+    graph.builder.nodes["management"].runnable.workflow = fake_workflow(
+        ManagementWorkflow(ManagementState), "resource_management", "plan"
+    )
+
+    result = graph.invoke(
+        {
+            "query": "다음 달 촬영 준비",
+            "content_topic": "여름 휴가",
+            "content_type": "블로그 글",
+            "project_id": "PRJ-2023-001",
+            "request_type": "resource_allocation",
+            "response": [],
+        }
+    )
+
+    assert set(result["domain_responses"]) == {"text", "management"}
+    assert [message.content for message in result["response"]] == ["persona", "plan"]
+
+
+def test_route_domains() -> None:
+    """
+    명시된 domains 또는 입력값으로 실행할 도메인이 결정되는지 테스트합니다.
+
+    Returns:
+        None
+    """
+    assert route_domains({"domains": ["music", "text"]}) == ["text", "music"]
+    assert route_domains({"content_topic": "여름", "content_type": "블로그"}) == [
+        "text"
+    ]
+    assert route_domains({"response": []}) == ["join"]
+    with pytest.raises(ValueError):
+        route_domains({"domains": ["video"]})
+
+
+def test_main_workflow_query_only() -> None:
+    """
+    쿼리만 주어진 요청도 라우터가 고른 도메인의 응답을 반환하는지 테스트합니다.
+
+    text는 쿼리로 만든 주제/유형으로 실행하고, 필수 입력이 없는 management는 필요한 입력을 안내합니다.
+
+    Returns:
+        None
+    """
+    inputs = []
+
+    def record_input(value):
+        inputs.append(value)
+        return "persona"
+
+    graph = MainWorkflow(MainState)()
+    text_workflow = TextWorkflow(TextState)
+    text_workflow().builder.nodes["persona_extraction"].runnable.chain = RunnableLambda(
+        record_input
+    )
+    graph.builder.nodes["text"].runnable.workflow = text_workflow
+
+    result = graph.invoke({"query": "여름 블로그 글 써줘", "response": []})
+    assert [message.content for message in result["response"]] == ["persona"]
+    assert inputs[0]["content_topic"] == "여름 블로그 글 써줘"
+    assert inputs[0]["content_type"] == "블로그 글"
+
+    result = graph.invoke({"query": "이번 주 촬영 일정 잡아줘", "response": []})
+    [message] = result["response"]
+    assert "project_id" in message.content
+    assert "request_type" in message.content